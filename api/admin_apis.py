@@ -4,8 +4,12 @@
 from fastapi import Depends, HTTPException
 from pydantic import BaseModel
 from admin_auth import verify_admin
+from bulk_delete import delete_auth_users, delete_profile_rows, start_delete_job, get_delete_job
+from cache import SWRCache
+from metrics import span
+from resilience import CircuitBreaker, call_with_timeout, retry_call
 import os
-from supabase import create_client, Client
+from supabase import create_client, Client, ClientOptions
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -15,15 +19,33 @@ supabase_url = os.getenv("NEXT_PUBLIC_SUPABASE_URL")
 supabase_key = os.getenv("NEXT_PUBLIC_SUPABASE_ANON_KEY")
 service_role_key = os.getenv("SUPABASE_SERVICE_ROLE_KEY")
 
+# Supabase 호출 제한 시간(초) / 조회·멱등 쓰기 재시도 횟수 / AI 사용 로그 기록 제한 시간
+SUPABASE_TIMEOUT = float(os.getenv("SUPABASE_TIMEOUT", "8"))
+SUPABASE_RETRIES = int(os.getenv("SUPABASE_RETRIES", "2"))
+AI_LOG_TIMEOUT = float(os.getenv("AI_LOG_TIMEOUT", "2"))
+# 연속 실패 시 Supabase 호출을 잠시 멈추고 바로 실패 (공개 조회는 SWR 캐시의 이전 값으로 응답)
+supabase_breaker = CircuitBreaker(
+    "supabase",
+    failure_threshold=int(os.getenv("SUPABASE_BREAKER_FAILURES", "5")),
+    reset_timeout=float(os.getenv("SUPABASE_BREAKER_RESET", "30")),
+)
+# AI 사용 로그는 짧은 제한 시간으로 자주 실패하므로 차단기 / 스레드 풀을 따로 둠 (로그 실패가 조회·저장을 막지 않도록)
+ai_log_breaker = CircuitBreaker(
+    "supabase_ai_log",
+    failure_threshold=int(os.getenv("SUPABASE_BREAKER_FAILURES", "5")),
+    reset_timeout=float(os.getenv("SUPABASE_BREAKER_RESET", "30")),
+)
+
 supabase: Client = None
 admin_client: Client = None
 
 try:
     if supabase_url and supabase_key:
-        supabase = create_client(supabase_url, supabase_key)
+        options = ClientOptions(postgrest_client_timeout=SUPABASE_TIMEOUT)
+        supabase = create_client(supabase_url, supabase_key, options)
         # 관리자 클라이언트 (삭제 등 권한 필요 작업용)
         # service_role_key가 있으면 그것을 사용, 없으면 anon_key 사용 (권한 부족할 수 있음)
-        admin_client = create_client(supabase_url, service_role_key) if service_role_key else supabase
+        admin_client = create_client(supabase_url, service_role_key, ClientOptions(postgrest_client_timeout=SUPABASE_TIMEOUT)) if service_role_key else supabase
     else:
         print("⚠️ Supabase credentials missing during init in admin_apis.py")
 except Exception as e:
@@ -39,18 +61,43 @@ def get_admin_client():
         raise HTTPException(status_code=500, detail="Supabase admin client not initialized")
     return admin_client
 
+def call_supabase(fn, *args, timeout=SUPABASE_TIMEOUT, breaker=supabase_breaker, upstream="supabase"):
+    """Supabase 호출 1회 (쿼리 execute, auth.admin.* 등) - 제한 시간 + 회로 차단기"""
+    with span("supabase"):
+        return breaker.call(call_with_timeout, fn, timeout, *args, upstream=upstream)
+
+
+def run(query, retry=True, timeout=SUPABASE_TIMEOUT, breaker=supabase_breaker, upstream="supabase"):
+    """
+    Supabase 쿼리 실행 - 제한 시간 + 회로 차단기
+    retry=True(조회 / 멱등 쓰기)면 일시적 오류를 지터 백오프로 재시도, insert처럼 중복되면 안 되는 쓰기는 retry=False
+    """
+    def attempt():
+        return call_supabase(query.execute, timeout=timeout, breaker=breaker, upstream=upstream)
+    if not retry:
+        return attempt()
+    return retry_call(attempt, attempts=SUPABASE_RETRIES + 1, deadline=timeout * 2, name="supabase")
+
+
+# 매 페이지 로드마다 호출되는 공개 조회(공지/템플릿 설정) 캐시
+# 관리자 수정 시 이 인스턴스의 캐시는 즉시 무효화, 다른 인스턴스는 TTL 후 반영
+PUBLIC_CONFIG_CACHE_TTL = int(os.getenv("PUBLIC_CONFIG_CACHE_TTL", "30"))
+PUBLIC_CONFIG_STALE_TTL = int(os.getenv("PUBLIC_CONFIG_STALE_TTL", "300"))
+PUBLIC_CONFIG_CACHE_CONTROL = f"public, max-age={PUBLIC_CONFIG_CACHE_TTL}, stale-while-revalidate={PUBLIC_CONFIG_STALE_TTL}"
+public_cache = SWRCache(ttl=PUBLIC_CONFIG_CACHE_TTL, stale_ttl=PUBLIC_CONFIG_STALE_TTL)
+
 
 def get_admin_stats(admin_email: str = Depends(verify_admin)):
     """관리자 대시보드 통계 데이터"""
     try:
         # 전체 사용자 수
         client = get_admin_client()
-        user_response = client.table('user_profiles').select('id', count='exact').execute()
+        user_response = run(client.table('user_profiles').select('id', count='exact'))
         total_users = user_response.count or 0
         
         # 전체 포트폴리오 수
         client = get_admin_client()
-        pf_response = client.table('portfolios').select('id', count='exact').execute()
+        pf_response = run(client.table('portfolios').select('id', count='exact'))
         total_portfolios = pf_response.count or 0
         
         # 오늘 생성된 포트폴리오
@@ -77,14 +124,14 @@ def get_all_users(skip: int = 0, limit: int = 50, search: str = None, admin_emai
             query = query.or_(f"email.ilike.%{search}%,name.ilike.%{search}%")
         
         # 페이지네이션
-        response = query.range(skip, skip + limit - 1).execute()
+        response = run(query.range(skip, skip + limit - 1))
         users = response.data
         
         # 각 사용자의 포트폴리오 수 조회
         users_with_count = []
         for user in users:
             client = get_admin_client()
-            pf_count = client.table('portfolios').select('id', count='exact').eq('user_id', user['id']).execute()
+            pf_count = run(client.table('portfolios').select('id', count='exact').eq('user_id', user['id']))
             users_with_count.append({
                 **user,
                 "portfolio_count": pf_count.count or 0
@@ -103,12 +150,12 @@ def delete_user(user_id: str, admin_email: str = Depends(verify_admin)):
         
         # 1. 사용자의 포트폴리오 먼저 삭제 (Admin Client 사용)
         client = get_admin_client()
-        client.table('portfolios').delete().eq('user_id', user_id).execute()
+        run(client.table('portfolios').delete().eq('user_id', user_id))
         print(f"✅ Deleted portfolios for user {user_id}")
         
         # 2. 사용자 프로필 삭제 (Admin Client 사용)
         client = get_admin_client()
-        response = client.table('user_profiles').delete().eq('id', user_id).execute()
+        response = run(client.table('user_profiles').delete().eq('id', user_id))
         print(f"✅ Deleted user profile for user {user_id}")
         
         # 3. Supabase Auth에서 사용자 삭제 (Service Role Key 필요)
@@ -116,7 +163,8 @@ def delete_user(user_id: str, admin_email: str = Depends(verify_admin)):
             try:
                 # Supabase Admin API를 사용하여 auth.users에서 삭제
                 client = get_admin_client()
-                client.auth.admin.delete_user(user_id)
+                retry_call(lambda: call_supabase(client.auth.admin.delete_user, user_id),
+                           attempts=SUPABASE_RETRIES + 1, deadline=SUPABASE_TIMEOUT * 2, name="supabase")
                 print(f"✅ Deleted auth user {user_id}")
             except Exception as auth_error:
                 print(f"⚠️ Auth user deletion failed (may not exist): {auth_error}")
@@ -138,60 +186,69 @@ def delete_user(user_id: str, admin_email: str = Depends(verify_admin)):
         raise HTTPException(status_code=500, detail=f"사용자 삭제 실패: {str(e)}")
 
 
-def batch_delete_users(user_ids: list[str], admin_email: str = Depends(verify_admin)):
-    """사용자 일괄 삭제 (프로필 + Auth 계정)"""
-    print(f"🗑️ REQUEST: Batch delete users: {user_ids}")
+def batch_delete_users(user_ids: list[str], admin_email: str = Depends(verify_admin), background: bool = False):
+    """
+    사용자 일괄 삭제 (프로필 + Auth 계정)
+    background=True이면 Auth 계정 삭제를 백그라운드 작업으로 넘기고 job_id를 즉시 반환
+    """
+    print(f"🗑️ REQUEST: Batch delete users: {len(user_ids)} users (background={background})")
     try:
         if not user_ids:
             return {"message": "삭제할 사용자가 없습니다", "deleted_count": 0}
 
         print(f"🔑 Using {'Service Role Key' if service_role_key else 'Anon Key'} for deletion")
 
-        # 1. 사용자의 포트폴리오 일괄 삭제 (Admin Client 사용)
-        client = get_admin_client()
-        pf_response = client.table('portfolios').delete().in_('user_id', user_ids).execute()
-        print(f"🗑️ Portfolios deleted: {len(pf_response.data) if pf_response.data else 0}")
-        
-        # 2. 사용자 프로필 일괄 삭제 (Admin Client 사용)
-        client = get_admin_client()
-        response = client.table('user_profiles').delete().in_('id', user_ids).execute()
-        print(f"🗑️ User profiles deleted: {len(user_ids)}")
+        # 1~2. 포트폴리오 → 프로필 일괄 삭제 (Admin Client 사용, chunk 단위)
+        portfolios_deleted, profiles_deleted = delete_profile_rows(get_admin_client(), user_ids)
+        print(f"🗑️ Portfolios deleted: {portfolios_deleted}, User profiles deleted: {profiles_deleted}")
         
         # 3. Supabase Auth에서 사용자 일괄 삭제 (Service Role Key 필요)
-        auth_deleted_count = 0
-        auth_failed_count = 0
-        
-        if service_role_key:
-            for user_id in user_ids:
-                try:
-                    client = get_admin_client()
-                    client.auth.admin.delete_user(user_id)
-                    auth_deleted_count += 1
-                    print(f"✅ Deleted auth user {user_id}")
-                except Exception as auth_error:
-                    auth_failed_count += 1
-                    print(f"⚠️ Auth user deletion failed for {user_id}: {auth_error}")
-        else:
+        if not service_role_key:
             print(f"⚠️ Service Role Key not available - cannot delete auth users")
             return {
                 "message": "사용자 프로필은 삭제되었으나 Auth 계정 삭제 실패 (Service Role Key 필요)",
-                "deleted_portfolios": len(pf_response.data) if pf_response.data else 0,
-                "deleted_profiles": len(user_ids),
+                "deleted_portfolios": portfolios_deleted,
+                "deleted_profiles": profiles_deleted,
                 "deleted_auth_users": 0,
                 "warning": "Auth users still exist"
             }
+
+        if background:
+            job_id = start_delete_job(get_admin_client(), user_ids, call=call_supabase)
+            print(f"🚀 Auth deletion job started: {job_id}")
+            return {
+                "message": f"프로필 삭제 완료, Auth 계정 삭제 작업 시작 ({len(user_ids)}명)",
+                "job_id": job_id,
+                "status": "running",
+                "deleted_portfolios": portfolios_deleted,
+                "deleted_profiles": profiles_deleted
+            }
+
+        report = delete_auth_users(get_admin_client(), user_ids, call=call_supabase)
+        for result in report["results"]:
+            if result["status"] == "failed":
+                print(f"⚠️ Auth user deletion failed for {result['user_id']}: {result.get('error')}")
         
         return {
-            "message": f"일괄 삭제 완료 (프로필: {len(user_ids)}, Auth: {auth_deleted_count})",
-            "deleted_portfolios": len(pf_response.data) if pf_response.data else 0,
-            "deleted_profiles": len(user_ids),
-            "deleted_auth_users": auth_deleted_count,
-            "auth_deletion_failed": auth_failed_count
+            "message": f"일괄 삭제 완료 (프로필: {profiles_deleted}, Auth: {report['deleted']})",
+            "deleted_portfolios": portfolios_deleted,
+            "deleted_profiles": profiles_deleted,
+            "deleted_auth_users": report["deleted"],
+            "auth_deletion_failed": report["failed"],
+            "results": report["results"]
         }
     except Exception as e:
         print(f"❌ Batch delete failed: {e}")
         raise HTTPException(status_code=500, detail=f"일괄 삭제 실패: {str(e)}")
 
+
+def get_batch_delete_job(job_id: str, admin_email: str = Depends(verify_admin)):
+    """일괄 삭제 백그라운드 작업 진행 상황 조회"""
+    job = get_delete_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="삭제 작업을 찾을 수 없습니다")
+    return job
+
 # --- 공지사항 관리 (Notices) ---
 
 class NoticeCreate(BaseModel):
@@ -208,30 +265,34 @@ def get_notices(skip: int = 0, limit: int = 20, admin_email: str = Depends(verif
     """공지사항 목록 조회 (관리자용)"""
     try:
         client = get_admin_client()
-        response = client.table('notices').select('*').order('created_at', desc=True).range(skip, skip + limit - 1).execute()
+        response = run(client.table('notices').select('*').order('created_at', desc=True).range(skip, skip + limit - 1))
         return response.data
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"공지사항 조회 실패: {str(e)}")
 
+def _fetch_active_notices():
+    client = get_supabase()
+    response = run(client.table('notices').select('*').eq('is_active', True).order('created_at', desc=True))
+    return response.data
+
 def get_active_notices():
-    """활성 공지사항 조회 (공개)"""
+    """활성 공지사항 조회 (공개, 캐시) → (공지 목록, ETag) / 조회 실패 시 ETag는 None"""
     try:
-        client = get_supabase()
-        response = client.table('notices').select('*').eq('is_active', True).order('created_at', desc=True).execute()
-        return response.data
+        return public_cache.get('notices:active', _fetch_active_notices)
     except Exception as e:
         print(f"❌ Active notices error: {e}")
-        return []
+        return [], None
 
 def create_notice(notice: NoticeCreate, admin_email: str = Depends(verify_admin)):
     """공지사항 생성"""
     try:
         client = get_admin_client()
-        response = client.table('notices').insert({
+        response = run(client.table('notices').insert({
             "title": notice.title,
             "content": notice.content,
             "is_active": notice.is_active
-        }).execute()
+        }), retry=False)
+        public_cache.invalidate('notices:active')
         return response.data[0]
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"공지사항 생성 실패: {str(e)}")
@@ -246,7 +307,8 @@ def update_notice(notice_id: str, notice: NoticeUpdate, admin_email: str = Depen
         update_data['updated_at'] = 'now()'
         
         client = get_admin_client()
-        response = client.table('notices').update(update_data).eq('id', notice_id).execute()
+        response = run(client.table('notices').update(update_data).eq('id', notice_id))
+        public_cache.invalidate('notices:active')
         return response.data
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"공지사항 수정 실패: {str(e)}")
@@ -255,7 +317,8 @@ def delete_notice(notice_id: str, admin_email: str = Depends(verify_admin)):
     """공지사항 삭제"""
     try:
         client = get_admin_client()
-        client.table('notices').delete().eq('id', notice_id).execute()
+        run(client.table('notices').delete().eq('id', notice_id))
+        public_cache.invalidate('notices:active')
         return {"message": "공지사항이 삭제되었습니다"}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"공지사항 삭제 실패: {str(e)}")
@@ -272,7 +335,7 @@ def get_ai_stats(period: str = 'daily', admin_email: str = Depends(verify_admin)
         
         # 최근 30일 로그 조회
         client = get_admin_client()
-        response = client.table('ai_logs').select('*').order('created_at', desc=True).limit(1000).execute()
+        response = run(client.table('ai_logs').select('*').order('created_at', desc=True).limit(1000))
         logs = response.data
         
         stats = {
@@ -299,28 +362,39 @@ def get_ai_stats(period: str = 'daily', admin_email: str = Depends(verify_admin)
 class TemplateConfigUpdate(BaseModel):
     is_active: bool
 
+def _fetch_template_configs(client):
+    response = run(client.table('template_config').select('*'))
+    # 딕셔너리 형태로 변환하여 반환 { 'key': boolean }
+    return {item['key']: item['is_active'] for item in response.data}
+
 def get_template_configs(admin_email: str = None):
-    """템플릿 설정 조회 (공개 접근 가능)"""
+    """템플릿 설정 조회 (관리자용, 캐시 없이 최신 값)"""
     try:
-        client = get_admin_client()
-        response = client.table('template_config').select('*').execute()
-        # 딕셔너리 형태로 변환하여 반환 { 'key': boolean }
-        config_map = {item['key']: item['is_active'] for item in response.data}
-        return config_map
+        return _fetch_template_configs(get_admin_client())
     except Exception as e:
         print(f"❌ Template config error: {e}")
         return {} # 실패 시 빈 설정 반환 (모두 활성 간주)
 
+def get_public_template_configs():
+    """템플릿 설정 조회 (공개, 캐시) → (설정 dict, ETag)
+    template_config는 RLS로 누구나 읽을 수 있으므로 anon 클라이언트 사용"""
+    try:
+        return public_cache.get('templates:config', lambda: _fetch_template_configs(get_supabase()))
+    except Exception as e:
+        print(f"❌ Template config error: {e}")
+        return {}, None
+
 def update_template_config(key: str, config: TemplateConfigUpdate, admin_email: str = Depends(verify_admin)):
     """템플릿 설정 업데이트 (Upsert)"""
     try:
         # upsert: 있으면 업데이트, 없으면 생성
         client = get_admin_client()
-        response = client.table('template_config').upsert({
+        response = run(client.table('template_config').upsert({
             "key": key,
             "is_active": config.is_active,
             "updated_at": 'now()'
-        }).execute()
+        }))
+        public_cache.invalidate('templates:config')
         return response.data
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"템플릿 설정 저장 실패: {str(e)}")
@@ -338,7 +412,9 @@ def log_ai_usage(prompt_type: str, model_name: str = "gemini-flash", status: str
             data['user_id'] = user_id
             
         client = get_supabase()
-        client.table('ai_logs').insert(data).execute()
+        # 요청 경로에서 호출되므로 짧은 제한 시간, 회로가 열려 있으면 바로 건너뜀
+        run(client.table('ai_logs').insert(data), retry=False, timeout=AI_LOG_TIMEOUT,
+            breaker=ai_log_breaker, upstream="supabase_ai_log")
     except Exception as e:
         print(f"⚠️ AI Logging failed: {e}")
 
@@ -352,7 +428,7 @@ def get_all_portfolios(skip: int = 0, limit: int = 50, search: str = None, admin
             query = query.ilike('title', f'%{search}%')
         
         # 페이지네이션
-        response = query.range(skip, skip + limit - 1).execute()
+        response = run(query.range(skip, skip + limit - 1))
         portfolios = response.data
         
         portfolios_data = []
@@ -370,7 +446,7 @@ def get_all_portfolios(skip: int = 0, limit: int = 50, search: str = None, admin
         
         # 전체 개수
         client = get_admin_client()
-        total_response = client.table('portfolios').select('id', count='exact').execute()
+        total_response = run(client.table('portfolios').select('id', count='exact'))
         total = total_response.count or 0
         
         return {"portfolios": portfolios_data, "total": total, "skip": skip, "limit": limit}
@@ -9,6 +9,8 @@ import os
 from datetime import datetime, timedelta
 from dotenv import load_dotenv
 
+from metrics import logger
+
 # Load environment variables
 load_dotenv()
 
@@ -20,17 +22,13 @@ def verify_admin(authorization: Optional[str] = Header(None)):
     관리자 권한 확인 미들웨어
     Authorization 헤더에서 이메일을 추출하여 관리자 목록과 비교
     """
-    print(f"🔍 Authorization header: {authorization}")
-    print(f"🔍 ADMIN_EMAILS list: {ADMIN_EMAILS}")
     if not authorization:
         raise HTTPException(status_code=401, detail="인증이 필요합니다")
     
     # Bearer 토큰에서 이메일 추출 (간단한 구현)
     email = authorization.replace("Bearer ", "")
-    print(f"🔍 Extracted email: '{email}'")
-    print(f"🔍 Email in list? {email in ADMIN_EMAILS}")
-    
     if email not in ADMIN_EMAILS:
+        logger.debug("🔍 Admin check failed for '%s'", email)
         raise HTTPException(status_code=403, detail="관리자 권한이 필요합니다")
     
     return email
@@ -0,0 +1,575 @@
+"""
+API 벤치마크 (로컬 대역 사용)
+api/main.py의 FastAPI 앱을 프로세스 안에서 구동하고, Gemini / Supabase / 소셜 로그인(구글·카카오·네이버)은
+지연 시간을 조절할 수 있는 결정적(deterministic) 가짜 구현으로 대체합니다.
+DB는 임시 디렉터리의 SQLite를 사용하며, bcrypt / JSON 직렬화 / PDF·DOCX 파싱은 실제 코드가 그대로 실행됩니다.
+시나리오별 처리량(req/s)과 p50/p95/p99 지연 시간을 출력하고, 저장된 기준값(JSON)과 비교할 수 있습니다.
+
+사용법:
+    python benchmark_api.py                                   # 전체 시나리오
+    python benchmark_api.py -s login -s save_portfolio -n 200 -c 8
+    python benchmark_api.py --save-baseline benchmarks/baseline.json
+    python benchmark_api.py --compare benchmarks/baseline.json --max-regression 0.2
+    python benchmark_api.py --compare benchmarks/baseline.json --save-baseline benchmarks/baseline.json   # 비교 후 기준값 갱신
+    python benchmark_api.py --target http://localhost:8000 -s get_portfolio   # 실행 중인 서버에 부하 (httpx)
+    python benchmark_api.py -s chat_answers_single -s chat_answers_parallel --llm-ms-per-kchar 2000 --llm-malformed-rate 0.1
+
+--llm-ms-per-kchar 는 가짜 LLM 응답 길이에 비례하는 생성 시간, --llm-malformed-rate 는 깨진 JSON 응답 비율입니다.
+
+benchmarks/baseline.json 은 기본 옵션으로 측정한 기준값입니다 (meta에 측정 환경 포함).
+다른 환경(CPU 수, Python 버전)과 비교하면 절대값 차이가 크므로, 같은 환경에서 기준값을 다시 저장한 뒤 비교하세요.
+
+--target 모드에서는 가짜 구현을 주입할 수 없으므로 LLM / 관리자 시나리오는 실제 서비스를 호출합니다.
+"""
+import argparse
+import io
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+API_DIR = os.path.dirname(os.path.abspath(__file__))
+ADMIN_EMAIL = "bench-admin@example.com"
+GOOGLE_AUDIENCE = "bench-client-id"
+
+Scenario = namedtuple("Scenario", "name setup run")
+
+
+# --- 가짜 외부 서비스 ---
+
+class FakeLatency:
+    def __init__(self, llm_ms, supabase_ms, social_ms, llm_ms_per_kchar=0.0, malformed_rate=0.0):
+        self.llm = llm_ms / 1000
+        self.supabase = supabase_ms / 1000
+        self.social = social_ms / 1000
+        # 응답 1000자당 생성 시간 (초) / 깨진 JSON 응답 비율
+        self.llm_per_kchar = llm_ms_per_kchar / 1000
+        self.malformed_rate = malformed_rate
+
+
+class FakeMessage:
+    def __init__(self, content):
+        self.content = content
+
+
+# 이력서 분석 / 포트폴리오 생성 / 챗봇 응답 파서를 모두 통과하는 고정 응답
+FAKE_LLM_CONTENT = "```json\n" + json.dumps({
+    "name": "홍길동", "phone": "010-1234-5678", "email": "hong@example.com", "link": "https://github.com/hong",
+    "intro": "사용자 경험을 고민하는 프론트엔드 개발자", "career_summary": "총 3년차, 주요 경력: ABC사",
+    "skills": ["React", "TypeScript", "FastAPI"],
+    "projects": [{"title": f"프로젝트 {i}", "desc": "설명 " * 20, "duration": "2024.01 ~ 2024.06"} for i in range(4)],
+    "theme": {"color": "#336699", "font": "sans", "mood_emoji": "🚀", "layout": "gallery_grid"},
+    "hero": {"title": "안녕하세요", "subtitle": "개발자입니다", "tags": ["React"]},
+}, ensure_ascii=False) + "\n```"
+
+# /submit 설문 답변 (개발자, 프로젝트 3개)
+SUBMIT_ANSWERS = {
+    "name": "홍길동", "job": "developer", "strength": "problem", "moods": ["#신뢰감있는"], "email": "hong@example.com",
+    "career_summary": "총 3년차 프론트엔드 개발자. React와 TypeScript로 커머스 서비스를 개발했습니다.",
+    **{f"project{i}_{key}": value for i in range(1, 4) for key, value in (
+        ("title", f"프로젝트 {i}"), ("desc", "React와 FastAPI로 주문 화면 성능을 개선했습니다. " * 3), ("link", f"https://github.com/hong/p{i}"))},
+}
+
+# /generate-chat-answers 답변 키 (요청한 키만 골라 응답)
+CHAT_ANSWER_KEYS = (
+    "core_skills", "main_stack", "tech_depth", "documentation", "role_contribution", "collaboration",
+    "cycle", "artifacts", "best_project", "troubleshooting", "decision_making", "quantitative_performance",
+)
+
+
+def fake_llm_content(prompt):
+    """프롬프트에 답변 키가 있으면 해당 키만 담은 답변 JSON, 아니면 고정 응답"""
+    keys = [key for key in CHAT_ANSWER_KEYS if f'"{key}"' in prompt]
+    if not keys:
+        return FAKE_LLM_CONTENT
+    answers = {key: "저는 React와 FastAPI로 서비스를 만들며 성능 개선을 주도했습니다. " * 4 for key in keys}
+    return "```json\n" + json.dumps(answers, ensure_ascii=False) + "\n```"
+
+
+def _prompt_text(runnable, payload):
+    """체인(prompt | llm)이면 프롬프트 템플릿까지 포함한 입력 텍스트"""
+    parts = [str(payload)]
+    if hasattr(runnable, "first"):
+        parts.append(str(runnable.first))
+    return "\n".join(parts)
+
+
+class FakeQuery:
+    """supabase-py 쿼리 빌더 흉내 (필터는 무시하고 range만 적용)"""
+
+    def __init__(self, rows, latency):
+        self.rows = rows
+        self.latency = latency
+
+    def range(self, start, end):
+        self.rows = self.rows[start:end + 1]
+        return self
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: self
+
+    def execute(self):
+        time.sleep(self.latency)
+        response = FakeMessage(None)
+        response.data = list(self.rows)
+        response.count = len(self.rows)
+        return response
+
+
+class FakeSupabase:
+    def __init__(self, tables, latency):
+        self.tables = tables
+        self.latency = latency
+
+    def table(self, name):
+        return FakeQuery(self.tables.get(name, []), self.latency)
+
+
+def fake_tables(users=200):
+    profiles = [{"id": f"user-{i}", "email": f"user{i}@example.com", "name": f"사용자{i}", "created_at": "2026-01-01T00:00:00"} for i in range(users)]
+    portfolios = [{"id": f"pf-{i}", "user_id": f"user-{i}", "title": f"포트폴리오 {i}", "user_profiles": {"email": p["email"], "name": p["name"]}} for i, p in enumerate(profiles)]
+    return {
+        "user_profiles": profiles,
+        "portfolios": portfolios,
+        "notices": [{"id": "n1", "title": "점검 안내", "content": "내용", "is_active": True}],
+        "template_config": [{"key": "developer_tech_typeA", "is_active": True}],
+        "ai_logs": [{"prompt_type": "popo", "model_name": "gemini-flash"} for _ in range(100)],
+    }
+
+
+def make_google_signer():
+    """로컬 RSA 키로 구글 ID 토큰 서명기와 인증서 fetch 함수 생성"""
+    from cryptography import x509
+    from cryptography.hazmat.primitives import hashes, serialization
+    from cryptography.hazmat.primitives.asymmetric import rsa
+    from cryptography.x509.oid import NameOID
+    from google.auth import crypt, jwt
+
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, "bench")])
+    cert = (
+        x509.CertificateBuilder().subject_name(name).issuer_name(name).public_key(key.public_key())
+        .serial_number(1).not_valid_before(datetime(2020, 1, 1)).not_valid_after(datetime(2100, 1, 1))
+        .sign(key, hashes.SHA256())
+    )
+    cert_pem = cert.public_bytes(serialization.Encoding.PEM).decode()
+    key_pem = key.private_bytes(serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption())
+    signer = crypt.RSASigner.from_string(key_pem, "bench-kid")
+
+    def sign(email):
+        now = int(time.time())
+        claims = {"iss": "accounts.google.com", "aud": GOOGLE_AUDIENCE, "email": email, "name": "Bench", "iat": now, "exp": now + 3600}
+        return jwt.encode(signer, claims).decode()
+
+    return sign, lambda: ({"bench-kid": cert_pem}, 3600)
+
+
+def install_fakes(main, latency):
+    """main 모듈의 외부 호출 지점을 가짜 구현으로 교체"""
+    import admin_apis
+    from google_verifier import GoogleCertCache
+    from metrics import span
+
+    rng = random.Random(0)
+
+    def fake_invoke_llm(runnable, payload, hedge_after=None):
+        with span("llm"):
+            content = fake_llm_content(_prompt_text(runnable, payload))
+            time.sleep(latency.llm + len(content) / 1000 * latency.llm_per_kchar)
+            if latency.malformed_rate and rng.random() < latency.malformed_rate:
+                content = content[: len(content) // 2]  # 생성 도중 끊긴 응답
+            return FakeMessage(content)
+
+    def fake_get_json(url, headers=None, timeout=None):
+        time.sleep(latency.social)
+        token = (headers or {}).get("Authorization", "").replace("Bearer ", "")
+        if "kakao" in url:
+            return {"id": token, "kakao_account": {"email": f"{token}@kakao.example.com", "profile": {"nickname": "카카오"}}}
+        return {"resultcode": "00", "response": {"email": f"{token}@naver.example.com", "name": "네이버"}}
+
+    main.invoke_llm = fake_invoke_llm
+    main.get_json = fake_get_json
+    client = FakeSupabase(fake_tables(), latency.supabase)
+    admin_apis.supabase = admin_apis.admin_client = client
+
+    sign, fetch_certs = make_google_signer()
+    main.google_verifier.cert_cache = GoogleCertCache(fetch=fetch_certs)
+    main.google_verifier.audience = GOOGLE_AUDIENCE
+    return sign
+
+
+# --- 테스트 문서 생성 ---
+
+def make_portfolio(size_kb):
+    """약 size_kb 크기의 포트폴리오 JSON"""
+    projects = []
+    while len(json.dumps(projects, ensure_ascii=False).encode()) < size_kb * 1024:
+        i = len(projects)
+        projects.append({"title": f"프로젝트 {i}", "desc": "사용자 경험 개선을 위한 리팩터링 " * 10, "tags": ["React", "FastAPI"], "image": f"https://example.com/{i}.png"})
+    return {
+        "theme": {"color": "#336699", "font": "sans", "layout": "gallery_grid"},
+        "hero": {"title": "안녕하세요", "subtitle": "개발자 홍길동입니다"},
+        "about": {"intro": "소개", "description": "자기소개 " * 50},
+        "projects": projects,
+        "contact": {"email": "hong@example.com"},
+    }
+
+
+def make_pdf(pages=3, lines=40):
+    """외부 라이브러리 없이 텍스트 PDF 생성 (Helvetica, ASCII)"""
+    objects = ["<< /Type /Catalog /Pages 2 0 R >>", None, "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    page_ids = []
+    for p in range(pages):
+        text = "".join(f"({f'Page {p + 1} line {n}: React TypeScript FastAPI project experience'}) Tj T* " for n in range(lines))
+        stream = f"BT /F1 10 Tf 12 TL 50 780 Td {text}ET"
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream")
+        objects.append(f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] /Resources << /Font << /F1 3 0 R >> >> /Contents {len(objects)} 0 R >>")
+        page_ids.append(len(objects))
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(f'{i} 0 R' for i in page_ids)}] /Count {pages} >>"
+
+    out = io.BytesIO()
+    out.write(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(out.tell())
+        out.write(f"{number} 0 obj\n{body}\nendobj\n".encode("latin-1"))
+    xref = out.tell()
+    out.write(f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode())
+    for offset in offsets:
+        out.write(f"{offset:010d} 00000 n \n".encode())
+    out.write(f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode())
+    return out.getvalue()
+
+
+def make_docx(paragraphs=60):
+    import docx
+
+    document = docx.Document()
+    document.add_heading("홍길동 이력서", 0)
+    for i in range(paragraphs):
+        document.add_paragraph(f"{i}. React / TypeScript 기반 서비스 개발 및 성능 개선 경험")
+    table = document.add_table(rows=3, cols=2)
+    for row in range(3):
+        table.cell(row, 0).text = f"기술 {row}"
+        table.cell(row, 1).text = "상"
+    out = io.BytesIO()
+    document.save(out)
+    return out.getvalue()
+
+
+# --- 시나리오 ---
+
+def build_scenarios(args, run_id, sign_google):
+    admin_headers = {"Authorization": f"Bearer {ADMIN_EMAIL}"}
+    portfolio = make_portfolio(args.portfolio_kb)
+    user = {"email": f"bench-{run_id}@example.com", "password": "bench-password", "name": "벤치"}
+    state = {}
+
+    def ensure_user(client):
+        if not state.get("user"):
+            client.post("/signup", json=user)
+            client.post("/save-portfolio", json={"email": user["email"], "portfolio_data": portfolio})
+            state["user"] = True
+
+    def setup_writers(client):
+        # 같은 사용자에 대한 동시 저장은 409(버전 충돌)가 되므로 동시성의 2배만큼 사용자를 나눠 사용
+        state["writers"] = [f"bench-{run_id}-writer{n}@example.com" for n in range(args.concurrency * 2)]
+        with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+            list(executor.map(lambda email: client.post("/signup", json={**user, "email": email}), state["writers"]))
+
+    def setup_etag(client):
+        ensure_user(client)
+        state["etag"] = client.get(f"/get-portfolio/{user['email']}").headers.get("etag", "")
+
+    def setup_google(client):
+        # 토큰 서명 비용은 측정에서 제외
+        state["google_tokens"] = [sign_google(f"google-{run_id}-{i}@example.com") for i in range(50)]
+
+    def save_portfolio(client, i):
+        data = dict(portfolio, about={**portfolio["about"], "intro": f"소개 v{i}"})
+        email = state["writers"][i % len(state["writers"])]
+        return client.post("/save-portfolio", json={"email": email, "portfolio_data": data})
+
+    def upload(name, content_type, key):
+        def run(client, i):
+            return client.post("/api/parse-resume", files={"file": (name, state[key], content_type)})
+        return run
+
+    def setup_documents(client):
+        state["pdf"] = make_pdf(pages=args.pdf_pages)
+        try:
+            state["docx"] = make_docx()
+        except ImportError:
+            state["docx"] = None
+
+    def chat_answers_mode(mode):
+        def setup(client):
+            if not args.target:
+                sys.modules["main"].CHAT_ANSWERS_MODE = mode
+        return setup
+
+    def submit_mode(mode):
+        def setup(client):
+            if not args.target:
+                sys.modules["main"].SUBMIT_FALLBACK_MODE = mode
+                # TestClient는 백그라운드 작업(LLM 업그레이드)까지 끝낸 뒤 응답하므로 기본값(끔)대로 생성 시간만 측정
+                sys.modules["main"].SUBMIT_UPGRADE = False
+        return setup
+
+    def setup_resume_text(client):
+        with open(os.path.join(API_DIR, "benchmarks", "resumes", "frontend_bullets.txt"), encoding="utf-8") as f:
+            state["resume_text"] = f.read()
+        # 분할 분석(map-reduce) 기준을 넘는 긴 이력서 - 프로젝트 섹션을 반복
+        projects = "\n".join(f"프로젝트 {i}: 커머스 기능 개발 2023.01 ~ 2023.06\n- " + "React와 TypeScript로 화면 개발 " * 8 for i in range(80))
+        state["long_resume_text"] = state["resume_text"] + "\n■ 프로젝트\n" + projects
+
+    scenarios = [
+        Scenario("signup", None, lambda c, i: c.post("/signup", json={**user, "email": f"bench-{run_id}-{i}@example.com"})),
+        Scenario("login", ensure_user, lambda c, i: c.post("/login", json={"email": user["email"], "password": user["password"]})),
+        Scenario("google_login", setup_google, lambda c, i: c.post("/google-login", json={"token": state["google_tokens"][i % 50]})),
+        Scenario("kakao_login", None, lambda c, i: c.post("/kakao-login", json={"token": f"kakao-{run_id}-{i % 50}"})),
+        Scenario("naver_login", None, lambda c, i: c.post("/naver-login", json={"token": f"naver-{run_id}-{i % 50}"})),
+        Scenario("save_portfolio", setup_writers, save_portfolio),
+        Scenario("get_portfolio", ensure_user, lambda c, i: c.get(f"/get-portfolio/{user['email']}")),
+        Scenario("get_portfolio_304", setup_etag, lambda c, i: c.get(f"/get-portfolio/{user['email']}", headers={"If-None-Match": state["etag"]})),
+        Scenario("parse_resume_pdf", setup_documents, upload("resume.pdf", "application/pdf", "pdf")),
+        Scenario("parse_resume_docx", setup_documents, upload("resume.docx", "application/vnd.openxmlformats-officedocument.wordprocessingml.document", "docx")),
+        Scenario("analyze_resume", None, lambda c, i: c.post("/api/analyze-resume", json={"resumeText": "React 3년차 개발자 " * 100, "mode": "full"})),
+        Scenario("analyze_resume_hybrid", setup_resume_text, lambda c, i: c.post("/api/analyze-resume", json={"resumeText": state["resume_text"], "mode": "hybrid"})),
+        Scenario("analyze_resume_long", setup_resume_text, lambda c, i: c.post("/api/analyze-resume", json={"resumeText": state["long_resume_text"], "mode": "full"})),
+        Scenario("analyze_resume_fast", setup_resume_text, lambda c, i: c.post("/api/analyze-resume", json={"resumeText": state["resume_text"], "mode": "fast"})),
+        Scenario("chat_answers_single", chat_answers_mode("single"), lambda c, i: c.post("/generate-chat-answers", json={"portfolio_context": "프로젝트 " * 200})),
+        Scenario("chat_answers_parallel", chat_answers_mode("parallel"), lambda c, i: c.post("/generate-chat-answers", json={"portfolio_context": "프로젝트 " * 200})),
+        Scenario("chat", None, lambda c, i: c.post("/chat", json={"message": "가장 자신 있는 프로젝트는?", "portfolio_context": "프로젝트 " * 200, "is_shared": bool(i % 2)})),
+        # 세션 10개에 요청을 나눠 여러 턴 대화 (대화 기록 + 요약이 붙은 프롬프트)
+        Scenario("chat_session", None, lambda c, i: c.post("/chat", json={"message": f"{i}번째 질문: 프로젝트 설명해줘", "portfolio_context": "프로젝트 " * 200, "session_id": f"bench-{i % 10:04d}"})),
+        Scenario("submit", submit_mode("llm"), lambda c, i: c.post("/submit", json={"answers": SUBMIT_ANSWERS})),
+        # LLM 없이 로컬 생성기만 사용 (Gemini 장애 / 과부하 시 대체 응답 경로)
+        Scenario("submit_local", submit_mode("local"), lambda c, i: c.post("/submit", json={"answers": SUBMIT_ANSWERS})),
+        Scenario("notices_active", None, lambda c, i: c.get("/api/notices/active")),
+        Scenario("admin_stats", None, lambda c, i: c.get("/api/admin/stats", headers=admin_headers)),
+        Scenario("admin_users", None, lambda c, i: c.get("/api/admin/users?limit=50", headers=admin_headers)),
+        Scenario("admin_portfolios", None, lambda c, i: c.get("/api/admin/portfolios?limit=50", headers=admin_headers)),
+    ]
+    return {scenario.name: scenario for scenario in scenarios}
+
+
+# --- 실행 / 집계 ---
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(pct / 100 * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+def _error_body(response):
+    """200이어도 {"error": ...} / {"status": "error"}를 반환하는 LLM 엔드포인트는 실패로 집계"""
+    if not response.headers.get("content-type", "").startswith("application/json"):
+        return False
+    try:
+        body = response.json()
+    except ValueError:
+        return False
+    return isinstance(body, dict) and ("error" in body or body.get("status") == "error")
+
+
+def run_scenario(client, scenario, iterations, concurrency, warmup):
+    if scenario.setup:
+        scenario.setup(client)
+    for i in range(warmup):
+        scenario.run(client, -1 - i)
+
+    def one(i):
+        started = time.perf_counter()
+        response = scenario.run(client, i)
+        elapsed = time.perf_counter() - started
+        return elapsed, response.status_code >= 400 or _error_body(response)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(one, range(iterations)))
+    wall = time.perf_counter() - started
+
+    latencies = sorted(elapsed * 1000 for elapsed, _ in results)
+    errors = sum(1 for _, failed in results if failed)
+    return {
+        "iterations": iterations,
+        "concurrency": concurrency,
+        "errors": errors,
+        "throughput_rps": round(iterations / wall, 2) if wall else 0.0,
+        "mean_ms": round(sum(latencies) / len(latencies), 3),
+        "p50_ms": round(percentile(latencies, 50), 3),
+        "p95_ms": round(percentile(latencies, 95), 3),
+        "p99_ms": round(percentile(latencies, 99), 3),
+        "max_ms": round(latencies[-1], 3),
+    }
+
+
+def print_results(results):
+    print(f"\n{'scenario':<20}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}{'errors':>8}")
+    print("-" * 78)
+    for name, r in results.items():
+        print(f"{name:<20}{r['throughput_rps']:>10}{r['p50_ms']:>10}{r['p95_ms']:>10}{r['p99_ms']:>10}{r['max_ms']:>10}{r['errors']:>8}")
+
+
+def compare(results, baseline, max_regression):
+    """기준값 대비 p95 / 처리량 변화 출력, 허용치를 넘는 회귀가 있으면 True"""
+    regressed = False
+    meta = baseline["meta"]
+    print(f"\n📊 Baseline: {meta.get('timestamp')} ({meta.get('python')}, {meta.get('cpu_count')} CPU, {meta.get('git_commit') or '-'})")
+    current = environment_info()
+    differs = [key for key in ("python", "platform", "cpu_count") if meta.get(key) != current[key]]
+    if differs:
+        print(f"⚠️ 측정 환경이 기준값과 다릅니다 ({', '.join(differs)}) - 절대값 비교는 참고용")
+    print(f"{'scenario':<20}{'p95 before':>12}{'p95 now':>10}{'change':>9}{'rps change':>12}")
+    for name, r in results.items():
+        before = baseline["results"].get(name)
+        if not before:
+            print(f"{name:<20}{'-':>12}{r['p95_ms']:>10}{'new':>9}")
+            continue
+        p95_change = (r["p95_ms"] - before["p95_ms"]) / before["p95_ms"] if before["p95_ms"] else 0.0
+        rps_change = (r["throughput_rps"] - before["throughput_rps"]) / before["throughput_rps"] if before["throughput_rps"] else 0.0
+        flag = ""
+        if p95_change > max_regression:
+            flag = "  ❌ REGRESSION"
+            regressed = True
+        print(f"{name:<20}{before['p95_ms']:>12}{r['p95_ms']:>10}{p95_change:>+9.1%}{rps_change:>+12.1%}{flag}")
+    return regressed
+
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=API_DIR, capture_output=True,
+                              text=True, timeout=5).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def environment_info():
+    """기준값에 함께 저장하는 측정 환경 (Python / OS / CPU / 주요 패키지 버전 / 커밋)"""
+    from importlib import metadata
+
+    packages = {}
+    for name in ("fastapi", "starlette", "pydantic", "sqlalchemy", "orjson", "zstandard", "passlib", "bcrypt", "pypdf", "python-docx"):
+        try:
+            packages[name] = metadata.version(name)
+        except metadata.PackageNotFoundError:
+            packages[name] = None
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "packages": packages,
+        "git_commit": _git_commit(),
+    }
+
+
+def prepare_environment():
+    """main 임포트 전에 환경 구성 - 임시 SQLite, 로컬 대역, 관리자 계정"""
+    os.environ["NEXT_PUBLIC_SUPABASE_URL"] = ""
+    os.environ["SUPABASE_DB_PASSWORD"] = ""
+    os.environ["NEXT_PUBLIC_SUPABASE_ANON_KEY"] = ""
+    os.environ.setdefault("GOOGLE_API_KEY", "bench-fake-key")
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+    # 모든 요청이 같은 IP(testclient)라 사용자별 요청 제한은 끔 (스케줄러 자체는 benchmark_llm_scheduler.py)
+    os.environ.setdefault("LLM_RATE_LIMITS", "")
+    os.environ["ADMIN_EMAILS"] = ADMIN_EMAIL
+    workdir = tempfile.mkdtemp(prefix="moodfolio-bench-")
+    os.chdir(workdir)
+    sys.path.insert(0, API_DIR)
+    return workdir
+
+
+def main():
+    parser = argparse.ArgumentParser(description="moodfolio API 벤치마크")
+    parser.add_argument("-s", "--scenario", action="append", help="실행할 시나리오 (여러 번 지정 가능, 기본: 전체)")
+    parser.add_argument("-n", "--iterations", type=int, default=100)
+    parser.add_argument("-c", "--concurrency", type=int, default=4)
+    parser.add_argument("--warmup", type=int, default=5)
+    parser.add_argument("--portfolio-kb", type=int, default=64, help="저장/조회 시나리오의 포트폴리오 크기")
+    parser.add_argument("--pdf-pages", type=int, default=3)
+    parser.add_argument("--llm-latency-ms", type=float, default=float(os.getenv("BENCH_LLM_LATENCY_MS", "200")))
+    parser.add_argument("--supabase-latency-ms", type=float, default=float(os.getenv("BENCH_SUPABASE_LATENCY_MS", "20")))
+    parser.add_argument("--llm-ms-per-kchar", type=float, default=float(os.getenv("BENCH_LLM_MS_PER_KCHAR", "0")), help="가짜 LLM 응답 1000자당 생성 시간")
+    parser.add_argument("--llm-malformed-rate", type=float, default=0.0, help="가짜 LLM이 깨진 JSON을 반환하는 비율 (0~1)")
+    parser.add_argument("--social-latency-ms", type=float, default=float(os.getenv("BENCH_SOCIAL_LATENCY_MS", "50")))
+    parser.add_argument("--target", help="실행 중인 서버 URL (지정 시 in-process 대신 httpx로 요청)")
+    parser.add_argument("--save-baseline", metavar="PATH", help="결과를 기준값 JSON으로 저장")
+    parser.add_argument("--compare", metavar="PATH", help="기준값 JSON과 비교")
+    parser.add_argument("--max-regression", type=float, default=0.2, help="허용 p95 증가율 (기본 20%%)")
+    parser.add_argument("--list", action="store_true", help="시나리오 목록 출력")
+    args = parser.parse_args()
+
+    save_path = os.path.abspath(args.save_baseline) if args.save_baseline else None
+    compare_path = os.path.abspath(args.compare) if args.compare else None
+    run_id = datetime.now().strftime("%H%M%S%f")
+
+    if args.target:
+        import httpx
+
+        sign_google, _ = make_google_signer()
+        client_context = httpx.Client(base_url=args.target, timeout=60)
+    else:
+        prepare_environment()
+        import main as app_main
+        from fastapi.testclient import TestClient
+
+        latency = FakeLatency(args.llm_latency_ms, args.supabase_latency_ms, args.social_latency_ms,
+                              args.llm_ms_per_kchar, args.llm_malformed_rate)
+        sign_google = install_fakes(app_main, latency)
+        client_context = TestClient(app_main.app)
+
+    scenarios = build_scenarios(args, run_id, sign_google)
+    if args.list:
+        print("\n".join(scenarios))
+        return
+    selected = args.scenario or list(scenarios)
+    unknown = [name for name in selected if name not in scenarios]
+    if unknown:
+        parser.error(f"unknown scenario(s): {', '.join(unknown)}")
+
+    results = {}
+    with client_context as client:
+        for name in selected:
+            print(f"⏱️ {name} ({args.iterations} requests, concurrency {args.concurrency})...", flush=True)
+            try:
+                results[name] = run_scenario(client, scenarios[name], args.iterations, args.concurrency, args.warmup)
+            except Exception as e:
+                print(f"❌ {name} 실패: {e}")
+    print_results(results)
+
+    meta = {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        **environment_info(),
+        "target": args.target or "in-process",
+        "iterations": args.iterations,
+        "concurrency": args.concurrency,
+        "latency_ms": {"llm": args.llm_latency_ms, "supabase": args.supabase_latency_ms, "social": args.social_latency_ms,
+                       "llm_per_kchar": args.llm_ms_per_kchar},
+        "llm_malformed_rate": args.llm_malformed_rate,
+        "portfolio_kb": args.portfolio_kb,
+    }
+    if save_path:
+        os.makedirs(os.path.dirname(save_path), exist_ok=True)
+        with open(save_path, "w", encoding="utf-8") as f:
+            json.dump({"meta": meta, "results": results}, f, ensure_ascii=False, indent=2)
+        print(f"\n💾 Baseline saved to {save_path}")
+    if compare_path:
+        with open(compare_path, encoding="utf-8") as f:
+            baseline = json.load(f)
+        if compare(results, baseline, args.max_regression):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+무무 로컬 답변 라우터(chat_router) 적중률 / 지연 시간 벤치마크
+benchmarks/chat_questions.json 의 질문(정답 키, 대표 질문이 아니면 null)으로 측정합니다.
+
+- 적중률(hit rate): 대표 질문 변형 중 LLM 없이 올바른 답변으로 라우팅된 비율
+- 오답(wrong): 다른 질문의 답변으로 라우팅된 경우 / 오탐(false positive): 새 질문인데 라우팅된 경우
+- 지연 시간: route() 한 번의 p50 / p95
+
+사용법:
+    python benchmark_chat_router.py
+    python benchmark_chat_router.py --threshold 0.45 --margin 0.1 -v
+    python benchmark_chat_router.py --sweep        # threshold / margin 조합별 적중률과 오탐 수
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+API_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def evaluate(router, cases, answers):
+    hit = wrong = false_positive = 0
+    details = []
+    for case in cases:
+        routed = router.route(case["q"], answers)
+        key = routed[0] if routed else None
+        if case["key"] is None:
+            false_positive += key is not None
+        elif key == case["key"]:
+            hit += 1
+        elif key is not None:
+            wrong += 1
+        details.append((case, routed))
+    answerable = sum(1 for case in cases if case["key"])
+    return {
+        "hit_rate": hit / answerable if answerable else 0.0,
+        "wrong": wrong,
+        "false_positive": false_positive,
+        "answerable": answerable,
+        "novel": len(cases) - answerable,
+    }, details
+
+
+def main():
+    parser = argparse.ArgumentParser(description="chat_router 적중률 / 지연 시간 벤치마크")
+    parser.add_argument("--cases", default=os.path.join(API_DIR, "benchmarks", "chat_questions.json"))
+    parser.add_argument("--threshold", type=float, default=float(os.getenv("CHAT_ROUTER_THRESHOLD", "0.5")))
+    parser.add_argument("--margin", type=float, default=float(os.getenv("CHAT_ROUTER_MARGIN", "0.1")))
+    parser.add_argument("-n", "--iterations", type=int, default=200, help="지연 시간 측정 반복 횟수")
+    parser.add_argument("--sweep", action="store_true")
+    parser.add_argument("-v", "--verbose", action="store_true", help="질문별 라우팅 결과 출력")
+    args = parser.parse_args()
+
+    sys.path.insert(0, API_DIR)
+    from chat_router import AnswerRouter, CHAT_QUESTIONS
+
+    with open(args.cases, encoding="utf-8") as f:
+        cases = json.load(f)
+    # 모든 질문에 검수된 답변이 있다고 가정
+    answers = {key: f"{key} 답변" for key, _ in CHAT_QUESTIONS}
+
+    if args.sweep:
+        print(f"{'threshold':>9} {'margin':>7} {'hit rate':>9} {'wrong':>6} {'false +':>8}")
+        for threshold in (0.3, 0.35, 0.4, 0.45, 0.5, 0.55, 0.6):
+            for margin in (0.0, 0.05, 0.1, 0.15, 0.2):
+                result, _ = evaluate(AnswerRouter(threshold=threshold, margin=margin), cases, answers)
+                print(f"{threshold:>9} {margin:>7} {result['hit_rate']:>9.2f} {result['wrong']:>6} {result['false_positive']:>8}")
+        return
+
+    router = AnswerRouter(threshold=args.threshold, margin=args.margin)
+    result, details = evaluate(router, cases, answers)
+    if args.verbose:
+        for case, routed in details:
+            top_key, top_score = router.scores(case["q"])[0]
+            mark = "✅" if (routed[0] if routed else None) == case["key"] else "❌"
+            print(f"{mark} {str(case['key']):<25} → {str(routed[0] if routed else None):<25} (top {top_key} {top_score:.2f}) {case['q']}")
+        print()
+
+    timings = []
+    for _ in range(args.iterations):
+        for case in cases:
+            started = time.perf_counter()
+            router.route(case["q"], answers)
+            timings.append((time.perf_counter() - started) * 1000)
+    timings.sort()
+
+    print(f"threshold {args.threshold} / margin {args.margin}")
+    print(f"적중률: {result['hit_rate']:.2%} ({result['answerable']}개 대표 질문 변형)")
+    print(f"오답: {result['wrong']}건, 오탐: {result['false_positive']}건 / 새 질문 {result['novel']}개")
+    print(f"route() 지연 시간: p50 {timings[len(timings) // 2]:.3f} ms, p95 {timings[int(len(timings) * 0.95)]:.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+"""
+http_client(공유 커넥션 풀 세션) 검증 / 벤치마크 - 로컬 스텁 HTTP 서버 사용
+실제 카카오/네이버/구글 서버 없이 127.0.0.1 스텁 서버로 어댑터 설정(재시도, 타임아웃, 커넥션 재사용)을 확인합니다.
+
+- retry: 503을 몇 번 돌려준 뒤 200 → 재시도 후 성공, 재시도 횟수를 넘으면 마지막 503 응답 반환
+- timeout: 읽기 제한 시간보다 늦게 응답 → GET은 MAX_RETRIES만큼 재시도 후 ReadTimeout / ConnectionError(재시도 소진)
+- pool: 공유 세션 vs 매번 requests.get 의 요청당 지연 시간 / 새 TCP 연결 수
+
+사용법:
+    python benchmark_http_client.py
+    python benchmark_http_client.py -s pool -n 500
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+API_DIR = os.path.dirname(os.path.abspath(__file__))
+MODES = ("retry", "timeout", "pool")
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """
+    /flaky/<n>/<key>: key별로 처음 n번은 503, 이후 200
+    /slow/<초>      : 지정 시간 뒤 200
+    /ok             : 바로 200
+    """
+    protocol_version = "HTTP/1.1"  # keep-alive (커넥션 재사용 확인용)
+    # 헤더 / 본문을 따로 쓰면 keep-alive 연결에서 Nagle + delayed ACK로 요청마다 ~40ms 지연
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.hits[self.path] = server.hits.get(self.path, 0) + 1
+            hits = server.hits[self.path]
+        parts = self.path.strip("/").split("/")
+        if parts[0] == "flaky" and hits <= int(parts[1]):
+            return self._reply(503, {"error": "unavailable", "hit": hits})
+        if parts[0] == "slow":
+            time.sleep(float(parts[1]))
+        self._reply(200, {"ok": True, "hit": hits})
+
+    def _reply(self, status, body):
+        payload = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+class StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), StubHandler)
+        self.lock = threading.Lock()
+        self.hits = {}
+        self.connections = 0
+
+    def handle_error(self, request, client_address):
+        # timeout 확인 시 클라이언트가 먼저 끊은 연결 (BrokenPipe) - 예상된 동작
+        pass
+
+    def process_request(self, request, client_address):
+        with self.lock:
+            self.connections += 1  # 새 TCP 연결마다 호출됨
+        super().process_request(request, client_address)
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+
+def run_retry(server):
+    import http_client
+
+    retries = http_client.MAX_RETRIES
+    recovered = http_client.get_json(f"{server.url}/flaky/{retries}/recover")
+    exhausted = http_client.get_json(f"{server.url}/flaky/{retries + 5}/exhaust")
+    checks = [
+        ("recovers after 503s", recovered.get("ok") is True),
+        ("attempts until success", server.hits[f"/flaky/{retries}/recover"] == retries + 1),
+        ("gives up after MAX_RETRIES", server.hits[f"/flaky/{retries + 5}/exhaust"] == retries + 1),
+        ("returns last 503 body", exhausted.get("error") == "unavailable"),
+    ]
+    return report("retry", checks)
+
+
+def run_timeout(server):
+    import requests
+    import http_client
+
+    read_timeout = 0.2
+    started = time.perf_counter()
+    try:
+        http_client.get_json(f"{server.url}/slow/1", timeout=(1, read_timeout))
+        raised = None
+    except requests.exceptions.RequestException as e:
+        raised = e
+    elapsed = time.perf_counter() - started
+    attempts = server.hits.get("/slow/1", 0)
+    checks = [
+        ("raises timeout", isinstance(raised, (requests.exceptions.ReadTimeout, requests.exceptions.ConnectionError))),
+        ("retries read timeouts", attempts == http_client.MAX_RETRIES + 1),
+        ("bounded by timeout x attempts", elapsed < (read_timeout + 0.5) * attempts),
+    ]
+    print(f"   timeout: {type(raised).__name__} after {attempts} attempts, {elapsed:.2f}s")
+    return report("timeout", checks)
+
+
+def run_pool(server, requests_count):
+    import requests
+    import http_client
+
+    url = f"{server.url}/ok"
+    results = {}
+    for name, call in (
+        ("requests.get", lambda: requests.get(url, timeout=http_client.DEFAULT_TIMEOUT).json()),
+        ("shared_session", lambda: http_client.get_json(url)),
+    ):
+        call()  # 워밍업 (공유 세션은 여기서 연결 생성)
+        before = server.connections
+        started = time.perf_counter()
+        for _ in range(requests_count):
+            call()
+        elapsed = time.perf_counter() - started
+        results[name] = (elapsed / requests_count * 1000, server.connections - before)
+
+    print(f"{'client':<16} {'ms/req':>8} {'new conns':>10}")
+    for name, (per_request, connections) in results.items():
+        print(f"{name:<16} {per_request:>8.3f} {connections:>10}")
+    return report("pool", [("shared session reuses its connection", results["shared_session"][1] == 0)])
+
+
+def report(mode, checks):
+    failed = [name for name, ok in checks if not ok]
+    for name in failed:
+        print(f"❌ {mode}: {name}")
+    if not failed:
+        print(f"✅ {mode}: {', '.join(name for name, _ in checks)}")
+    return not failed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="http_client 재시도 / 타임아웃 / 커넥션 재사용 확인 (로컬 스텁 서버)")
+    parser.add_argument("-s", "--mode", action="append", choices=MODES, help="반복 지정 가능 (기본: 전부)")
+    parser.add_argument("-n", "--requests", type=int, default=200, help="pool 모드 요청 수")
+    args = parser.parse_args()
+
+    os.environ.setdefault("LOG_LEVEL", "ERROR")
+    sys.path.insert(0, API_DIR)
+
+    server = StubServer()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    ok = True
+    try:
+        modes = args.mode or MODES
+        if "retry" in modes:
+            ok = run_retry(server) and ok
+        if "timeout" in modes:
+            ok = run_timeout(server) and ok
+        if "pool" in modes:
+            ok = run_pool(server, args.requests) and ok
+    finally:
+        import http_client
+        http_client.close_session()
+        server.shutdown()
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
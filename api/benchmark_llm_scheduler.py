@@ -0,0 +1,104 @@
+"""
+LLM 스케줄러(llm_scheduler) 시뮬레이션 벤치마크 - 느린 가짜 모델로 fifo / fair 정책 비교
+실제 LLM / 서버 없이 LLMScheduler.slot() 안에서 sleep 하는 스레드로 부하를 재현합니다.
+
+기본 시나리오:
+- 대량 사용자 1명: 시작하자마자 bulk 요청 --bulk개를 한꺼번에 (/submit 연타)
+- 채팅 사용자 --chat-users명: --chat-interval초마다 interactive 요청
+- 분석 사용자 --analysis-users명: --analysis-interval초마다 analysis 요청
+모델 처리 시간은 --model-ms (±30% 무작위), 동시 호출은 --concurrency개
+
+결과: 정책별 / 우선순위별 대기 시간 p50 / p95 / max, 모든 요청이 끝난 시각
+
+사용법:
+    python benchmark_llm_scheduler.py
+    python benchmark_llm_scheduler.py --bulk 120 --model-ms 300 --concurrency 4
+    python benchmark_llm_scheduler.py --policy fair --max-chat-p95 1.0   # interactive p95(초) 초과 시 exit 1
+"""
+import argparse
+import os
+import random
+import sys
+import threading
+import time
+
+API_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def percentile(values, ratio):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * ratio))]
+
+
+def simulate(policy, args):
+    from llm_scheduler import LLMScheduler, PRIORITIES
+
+    scheduler = LLMScheduler(max_concurrent=args.concurrency, aging=args.aging, queue_timeout=600,
+                             service_estimate=args.model_ms / 1000, policy=policy)
+    rng = random.Random(args.seed)
+    waits = {priority: [] for priority in PRIORITIES}
+    lock = threading.Lock()
+    started = time.perf_counter()
+
+    def call(priority, client, delay):
+        time.sleep(delay)
+        requested = time.perf_counter()
+        with scheduler.slot(priority, client):
+            wait = time.perf_counter() - requested
+            with lock:
+                waits[priority].append(wait)
+                latency = args.model_ms / 1000 * rng.uniform(0.7, 1.3)
+            time.sleep(latency)
+
+    threads = [threading.Thread(target=call, args=("bulk", "heavy-user", 0.0)) for _ in range(args.bulk)]
+    for user in range(args.chat_users):
+        for turn in range(args.turns):
+            threads.append(threading.Thread(target=call, args=("interactive", f"chat-{user}", 0.05 + turn * args.chat_interval + user * 0.01)))
+    for user in range(args.analysis_users):
+        for turn in range(args.turns // 2 or 1):
+            threads.append(threading.Thread(target=call, args=("analysis", f"analysis-{user}", 0.1 + turn * args.analysis_interval + user * 0.02)))
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return waits, time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description="LLM 스케줄러 fifo / fair 비교 (느린 가짜 모델)")
+    parser.add_argument("--policy", action="append", choices=["fifo", "fair"], help="반복 지정 가능 (기본: 둘 다)")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--model-ms", type=float, default=200)
+    parser.add_argument("--bulk", type=int, default=60, help="대량 사용자의 bulk 요청 수")
+    parser.add_argument("--chat-users", type=int, default=5)
+    parser.add_argument("--analysis-users", type=int, default=2)
+    parser.add_argument("--turns", type=int, default=6, help="채팅 사용자별 요청 수 (분석 사용자는 절반)")
+    parser.add_argument("--chat-interval", type=float, default=0.4)
+    parser.add_argument("--analysis-interval", type=float, default=0.8)
+    parser.add_argument("--aging", type=float, default=15.0)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--max-chat-p95", type=float, help="fair 정책의 interactive p95 대기 시간(초)이 이보다 크면 exit 1")
+    args = parser.parse_args()
+
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+    sys.path.insert(0, API_DIR)
+
+    print(f"{'policy':<7} {'priority':<12} {'calls':>6} {'p50 s':>8} {'p95 s':>8} {'max s':>8}")
+    failed = False
+    for policy in args.policy or ["fifo", "fair"]:
+        waits, total = simulate(policy, args)
+        for priority, values in waits.items():
+            p95 = percentile(values, 0.95)
+            print(f"{policy:<7} {priority:<12} {len(values):>6} {percentile(values, 0.5):>8.3f} {p95:>8.3f} {max(values, default=0):>8.3f}")
+            if policy == "fair" and priority == "interactive" and args.max_chat_p95 is not None and p95 > args.max_chat_p95:
+                failed = True
+        print(f"{policy:<7} 전체 완료 {total:.2f}s\n")
+    if failed:
+        print(f"❌ interactive p95 대기 시간이 {args.max_chat_p95}s를 넘었습니다")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
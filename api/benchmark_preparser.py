@@ -0,0 +1,127 @@
+"""
+이력서 로컬 사전 분석(resume_preparser) 정확도 / 지연 시간 벤치마크
+benchmarks/resumes/*.txt 이력서와 같은 이름의 .json 정답을 비교합니다.
+
+정답 JSON 형식:
+    {"name": "...", "phone": "010-...", "email": "...", "link": "...",
+     "skills": [...], "projects": ["프로젝트 제목", ...], "career": ["회사명", ...]}
+
+- 연락처/이름: 정확히 일치하면 1점 (링크는 http(s)://, www. 제외 후 비교)
+- 기술: precision / recall
+- 프로젝트 제목 / 경력 회사명: recall (difflib 유사도 0.8 이상이면 일치)
+
+사용법:
+    python benchmark_preparser.py
+    python benchmark_preparser.py -n 500 --fixtures benchmarks/resumes --min-accuracy 0.9 -v
+
+LLM 분석과의 종단 간 지연 비교는 benchmark_api.py의 analyze_resume / analyze_resume_hybrid / analyze_resume_fast 시나리오를 사용합니다.
+"""
+import argparse
+import difflib
+import glob
+import json
+import os
+import sys
+import time
+
+API_DIR = os.path.dirname(os.path.abspath(__file__))
+EXACT_FIELDS = ("name", "phone", "email", "link")
+MATCH_RATIO = 0.8
+
+
+def _normalize_link(url):
+    url = url.lower().rstrip("/")
+    for prefix in ("https://", "http://", "www."):
+        if url.startswith(prefix):
+            url = url[len(prefix):]
+    return url
+
+
+def _fuzzy_recall(expected, found):
+    if not expected:
+        return None
+    hits = sum(1 for item in expected if any(difflib.SequenceMatcher(None, item, other).ratio() >= MATCH_RATIO for other in found))
+    return hits / len(expected)
+
+
+def score(expected, result):
+    """필드별 점수 dict (정답이 없는 항목은 None)"""
+    scores = {}
+    for field in EXACT_FIELDS:
+        if field not in expected:
+            continue
+        want, got = expected[field], result.get(field, "")
+        if field == "link":
+            want, got = _normalize_link(want), _normalize_link(got)
+        scores[field] = float(want == got)
+
+    want_skills, got_skills = set(expected.get("skills", [])), set(result.get("skills", []))
+    if want_skills:
+        scores["skills_recall"] = len(want_skills & got_skills) / len(want_skills)
+        scores["skills_precision"] = len(want_skills & got_skills) / len(got_skills) if got_skills else 0.0
+    scores["projects"] = _fuzzy_recall(expected.get("projects", []), [p["title"] for p in result.get("projects", [])])
+    career = result.get("career_summary", "")
+    companies = career.split("주요 경력:", 1)[1].split(", ") if "주요 경력:" in career else []
+    scores["career"] = _fuzzy_recall(expected.get("career", []), [c.strip() for c in companies])
+    return {key: value for key, value in scores.items() if value is not None}
+
+
+def load_fixtures(directory):
+    fixtures = []
+    for path in sorted(glob.glob(os.path.join(directory, "*.txt"))):
+        answer = os.path.splitext(path)[0] + ".json"
+        if not os.path.exists(answer):
+            print(f"⚠️ 정답 파일 없음, 건너뜀: {os.path.basename(path)}")
+            continue
+        with open(path, encoding="utf-8") as f, open(answer, encoding="utf-8") as g:
+            fixtures.append((os.path.basename(path), f.read(), json.load(g)))
+    return fixtures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="resume_preparser 정확도 / 지연 시간 벤치마크")
+    parser.add_argument("--fixtures", default=os.path.join(API_DIR, "benchmarks", "resumes"))
+    parser.add_argument("-n", "--iterations", type=int, default=200, help="이력서별 반복 횟수 (지연 시간 측정)")
+    parser.add_argument("--min-accuracy", type=float, help="전체 평균 점수가 이보다 낮으면 exit 1")
+    parser.add_argument("-v", "--verbose", action="store_true", help="이력서별 추출 결과 출력")
+    args = parser.parse_args()
+
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+    sys.path.insert(0, API_DIR)
+    from resume_preparser import preparse
+
+    fixtures = load_fixtures(args.fixtures)
+    if not fixtures:
+        parser.error(f"no fixtures in {args.fixtures}")
+
+    totals = {}
+    print(f"{'fixture':<34} {'p50 ms':>8} {'p95 ms':>8}  score  misses")
+    for name, text, expected in fixtures:
+        timings = []
+        for _ in range(args.iterations):
+            started = time.perf_counter()
+            result = preparse(text)
+            timings.append((time.perf_counter() - started) * 1000)
+        timings.sort()
+        scores = score(expected, result)
+        for key, value in scores.items():
+            totals.setdefault(key, []).append(value)
+        misses = [key for key, value in scores.items() if value < 1]
+        average = sum(scores.values()) / len(scores)
+        p50, p95 = timings[len(timings) // 2], timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+        print(f"{name:<34} {p50:>8.3f} {p95:>8.3f}  {average:.2f}   {', '.join(misses) or '-'}")
+        if args.verbose:
+            print(json.dumps(result, ensure_ascii=False, indent=2))
+
+    print("\n필드별 평균")
+    for key, values in totals.items():
+        print(f"  {key:<18} {sum(values) / len(values):.2f}  ({len(values)}건)")
+    overall = sum(sum(values) / len(values) for values in totals.values()) / len(totals)
+    print(f"\n전체 평균 점수: {overall:.3f}")
+    if args.min_accuracy is not None and overall < args.min_accuracy:
+        print(f"❌ 최소 정확도 {args.min_accuracy} 미달")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
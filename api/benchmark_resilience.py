@@ -0,0 +1,145 @@
+"""
+외부 호출 보호(resilience) 벤치마크 - 장애를 주입하는 가짜 업스트림으로 전략별 지연 / 실패율 비교
+실제 Gemini / Supabase 없이 FaultyUpstream(느린 꼬리 지연, 일시적 오류, 장애 구간)을 호출합니다.
+
+전략:
+- plain: 보호 없음 (기존 동작)
+- deadline_retry: 호출당 제한 시간 + 일시적 오류 지터 백오프 재시도 (invoke_llm / admin_apis.run 과 같은 구성)
+- hedged: deadline_retry + hedge_after 후 두 번째 요청
+- breaker: deadline_retry + 회로 차단기 (--outage 구간 동안 업스트림 호출 수와 빠른 실패 비율 확인)
+
+요청은 --rate(초당)에 맞춰 일정한 간격으로 보냅니다 (빠른 실패가 장애 구간을 앞당기지 않도록).
+
+사용법:
+    python benchmark_resilience.py
+    python benchmark_resilience.py -n 400 --tail-rate 0.1 --tail-ms 3000 --error-rate 0.05 --timeout 1.0 --hedge-after 0.3
+    python benchmark_resilience.py -s deadline_retry -s breaker --outage 1:3   # 시작 후 1~3초 동안 업스트림 다운
+"""
+import argparse
+import os
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+API_DIR = os.path.dirname(os.path.abspath(__file__))
+STRATEGIES = ("plain", "deadline_retry", "hedged", "breaker")
+
+
+class UpstreamError(Exception):
+    """가짜 업스트림의 일시적 오류 (503)"""
+    code = 503
+
+
+class FaultyUpstream:
+    """latency_ms(±30%) 응답, tail_rate 확률로 tail_ms 지연, error_rate 확률로 503, 장애 구간 동안은 항상 503"""
+
+    def __init__(self, latency_ms, tail_rate, tail_ms, error_rate, seed=42):
+        self.latency = latency_ms / 1000
+        self.tail_rate = tail_rate
+        self.tail = tail_ms / 1000
+        self.error_rate = error_rate
+        self.down_between = None  # (시작 초, 끝 초) - 처음 호출 시각 기준
+        self.started = None
+        self.calls = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def __call__(self):
+        with self._lock:
+            self.calls += 1
+            roll, jitter = self._rng.random(), self._rng.uniform(0.7, 1.3)
+            now = time.perf_counter()
+            self.started = self.started or now
+        if self.down_between and self.down_between[0] <= now - self.started < self.down_between[1]:
+            time.sleep(self.latency * 0.2)
+            raise UpstreamError("503 UNAVAILABLE (outage)")
+        if roll < self.error_rate:
+            time.sleep(self.latency * 0.2)
+            raise UpstreamError("503 UNAVAILABLE")
+        time.sleep(self.tail if roll > 1 - self.tail_rate else self.latency * jitter)
+        return "ok"
+
+
+def build_call(strategy, upstream, args):
+    from resilience import CircuitBreaker, call_with_timeout, retry_call, hedged
+
+    def once():
+        return call_with_timeout(upstream, args.timeout, upstream="bench")
+
+    if strategy == "plain":
+        return upstream
+    if strategy == "deadline_retry":
+        return lambda: retry_call(once, attempts=args.attempts, deadline=args.deadline, name="bench")
+    if strategy == "hedged":
+        return lambda: retry_call(lambda: hedged(once, args.hedge_after, name="bench"), attempts=args.attempts, deadline=args.deadline, name="bench")
+    breaker = CircuitBreaker("bench", failure_threshold=args.breaker_failures, reset_timeout=args.breaker_reset)
+    return lambda: retry_call(lambda: breaker.call(once), attempts=args.attempts, deadline=args.deadline, name="bench")
+
+
+def run(strategy, args):
+    upstream = FaultyUpstream(args.latency_ms, args.tail_rate, args.tail_ms, args.error_rate, args.seed)
+    call = build_call(strategy, upstream, args)
+    outage = [float(x) for x in args.outage.split(":")] if args.outage else None
+    upstream.down_between = outage
+    timings, errors, lock = [], 0, threading.Lock()
+    started = time.perf_counter()
+
+    def one(index):
+        nonlocal errors
+        delay = started + index / args.rate - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        begin = time.perf_counter()
+        try:
+            call()
+            failed = False
+        except Exception:
+            failed = True
+        elapsed = time.perf_counter() - begin
+        with lock:
+            timings.append(elapsed)
+            errors += failed
+
+    with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+        list(executor.map(one, range(args.requests)))
+    timings.sort()
+    pick = lambda ratio: timings[min(len(timings) - 1, int(len(timings) * ratio))] * 1000
+    return {
+        "p50": pick(0.5), "p95": pick(0.95), "p99": pick(0.99), "max": timings[-1] * 1000,
+        "errors": errors / len(timings), "upstream_calls": upstream.calls, "total": time.perf_counter() - started,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="resilience 전략별 지연 / 실패율 비교 (장애 주입 가짜 업스트림)")
+    parser.add_argument("-s", "--strategy", action="append", choices=STRATEGIES, help="반복 지정 가능 (기본: 전부)")
+    parser.add_argument("-n", "--requests", type=int, default=200)
+    parser.add_argument("-c", "--concurrency", type=int, default=64)
+    parser.add_argument("--rate", type=float, default=50, help="초당 요청 수")
+    parser.add_argument("--latency-ms", type=float, default=100)
+    parser.add_argument("--tail-rate", type=float, default=0.05, help="느린 응답 비율")
+    parser.add_argument("--tail-ms", type=float, default=2000)
+    parser.add_argument("--error-rate", type=float, default=0.05, help="일시적 503 비율")
+    parser.add_argument("--outage", default="", help="업스트림 다운 구간 (첫 호출 후 초, 예: 1:3)")
+    parser.add_argument("--timeout", type=float, default=0.5, help="호출당 제한 시간(초)")
+    parser.add_argument("--deadline", type=float, default=2.0, help="재시도 포함 전체 허용 시간(초)")
+    parser.add_argument("--attempts", type=int, default=3)
+    parser.add_argument("--hedge-after", type=float, default=0.25)
+    parser.add_argument("--breaker-failures", type=int, default=5)
+    parser.add_argument("--breaker-reset", type=float, default=0.5)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    os.environ.setdefault("LOG_LEVEL", "ERROR")
+    sys.path.insert(0, API_DIR)
+
+    print(f"{'strategy':<16} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8} {'errors':>7} {'upstream':>9} {'total s':>8}")
+    for strategy in args.strategy or STRATEGIES:
+        r = run(strategy, args)
+        print(f"{strategy:<16} {r['p50']:>8.1f} {r['p95']:>8.1f} {r['p99']:>8.1f} {r['max']:>8.1f} {r['errors']:>7.1%} {r['upstream_calls']:>9} {r['total']:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
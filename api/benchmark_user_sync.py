@@ -0,0 +1,253 @@
+"""
+user_sync(Auth ↔ user_profiles 정합성 검사) 검증 / 벤치마크 - 가짜 Supabase 클라이언트 사용
+실제 Supabase 없이 FakeSupabase(Auth Admin API 페이지 조회 + user_profiles PostgREST 쿼리 흉내)로 실행합니다.
+
+- check: 작은 데이터로 결과 검증 (여러 페이지 Auth 조회, user_profiles keyset 페이지네이션,
+         Auth에만 / 프로필에만 / 양쪽에 있는 사용자, email이 None인 행, apply_cleanup 후 재검사)
+- scale: -n 명 규모에서 reconcile 시간 / 추가 메모리(tracemalloc peak) / 페이지 요청 수 측정
+
+사용법:
+    python benchmark_user_sync.py
+    python benchmark_user_sync.py -s scale -n 200000 --orphan-rate 0.02
+"""
+import argparse
+import bisect
+import os
+import random
+import sys
+import time
+import tracemalloc
+import uuid
+
+API_DIR = os.path.dirname(os.path.abspath(__file__))
+MODES = ("check", "scale")
+
+
+class FakeUser:
+    def __init__(self, user_id, email):
+        self.id = user_id
+        self.email = email
+
+
+class FakeResponse:
+    def __init__(self, data):
+        self.data = data
+
+
+class FakeAuthAdmin:
+    """GoTrue Admin API 흉내 - 생성 순서(id 순 아님)로 page / per_page 조회"""
+
+    def __init__(self, users):
+        self.users = list(users)
+        self.list_calls = 0
+        self.deleted = []
+
+    def list_users(self, page=1, per_page=50):
+        self.list_calls += 1
+        start = (page - 1) * per_page
+        return self.users[start:start + per_page]
+
+    def delete_user(self, user_id):
+        self.users = [user for user in self.users if user.id != user_id]
+        self.deleted.append(user_id)
+
+
+class FakeQuery:
+    """PostgREST 쿼리 빌더 흉내 (select / order / limit / gt / delete / in_ 만 지원)"""
+
+    def __init__(self, table):
+        self.table = table
+        self.filters = []
+        self.order_by = None
+        self.row_limit = None
+        self.is_delete = False
+
+    def select(self, columns):
+        self.columns = [column.strip() for column in columns.split(",")]
+        return self
+
+    def order(self, column):
+        self.order_by = column
+        return self
+
+    def limit(self, count):
+        self.row_limit = count
+        return self
+
+    def gt(self, column, value):
+        self.filters.append(lambda row: row[column] > value)
+        return self
+
+    def in_(self, column, values):
+        values = set(values)
+        self.filters.append(lambda row: row[column] in values)
+        return self
+
+    def delete(self):
+        self.is_delete = True
+        return self
+
+    def execute(self):
+        self.table.queries += 1
+        matched = [row for row in self.table.rows if all(check(row) for check in self.filters)]
+        if self.is_delete:
+            self.table.rows = [row for row in self.table.rows if row not in matched]
+            return FakeResponse(matched)
+        if self.order_by:
+            matched.sort(key=lambda row: row[self.order_by])
+        if self.row_limit is not None:
+            matched = matched[:self.row_limit]
+        return FakeResponse([{column: row.get(column) for column in self.columns} for row in matched])
+
+
+class FakeTable:
+    def __init__(self, rows):
+        self.rows = list(rows)
+        self.queries = 0
+
+
+class FakeSupabase:
+    def __init__(self, auth_users, profiles, portfolios=()):
+        self.auth = type("FakeAuth", (), {})()
+        self.auth.admin = FakeAuthAdmin(auth_users)
+        self.tables = {"user_profiles": FakeTable(profiles), "portfolios": FakeTable(portfolios)}
+
+    def table(self, name):
+        return FakeQuery(self.tables[name])
+
+
+def _uuid(rng):
+    return str(uuid.UUID(int=rng.getrandbits(128), version=4))
+
+
+def run_check():
+    from user_sync import apply_cleanup, reconcile
+
+    rng = random.Random(7)
+    both = [_uuid(rng) for _ in range(7)]
+    auth_only = [_uuid(rng) for _ in range(4)]
+    profile_only = [_uuid(rng) for _ in range(3)]
+    no_email_auth, no_email_profile = auth_only[0], profile_only[0]
+
+    auth_users = [FakeUser(user_id, None if user_id == no_email_auth else f"{user_id[:8]}@example.com") for user_id in both + auth_only]
+    rng.shuffle(auth_users)  # Auth API는 id 순이 아님
+    profiles = [{"id": user_id, "email": None if user_id in (no_email_profile, both[0]) else f"{user_id[:8]}@example.com"} for user_id in both + profile_only]
+    portfolios = [{"user_id": user_id} for user_id in profile_only[:2]]
+    client = FakeSupabase(auth_users, profiles, portfolios)
+
+    failures = []
+
+    def expect(name, actual, expected):
+        if actual != expected:
+            failures.append(f"{name}: expected {expected!r}, got {actual!r}")
+
+    # 페이지 크기를 작게 해서 여러 페이지 / 마지막 부분 페이지 / 빈 페이지 경계를 모두 거치게 함
+    report = reconcile(client, auth_page_size=3, profile_page_size=2)
+    expect("auth_total", report["auth_total"], len(both) + len(auth_only))
+    expect("profile_total", report["profile_total"], len(both) + len(profile_only))
+    expect("orphan_auth_users", set(report["orphan_auth_users"]), set(auth_only))
+    expect("orphan_profiles", set(report["orphan_profiles"]), set(profile_only))
+    expect("no-email auth orphan", report["orphan_auth_users"].get(no_email_auth, "missing"), None)
+    expect("no-email profile orphan", report["orphan_profiles"].get(no_email_profile, "missing"), None)
+    expect("auth pages", client.auth.admin.list_calls, 4)
+    expect("profile pages", client.tables["user_profiles"].queries, 6)
+
+    # 페이지 크기가 전체 수로 나누어떨어지는 경우 (마지막에 빈 페이지 조회)
+    exact = reconcile(FakeSupabase(auth_users, profiles), auth_page_size=len(auth_users), profile_page_size=len(profiles))
+    expect("exact-page orphans", (set(exact["orphan_auth_users"]), set(exact["orphan_profiles"])), (set(auth_only), set(profile_only)))
+
+    result = apply_cleanup(client, report, delete_auth=True, delete_profiles=True)
+    expect("auth deleted", result["auth"]["deleted"], len(auth_only))
+    expect("profiles deleted", result["profiles"], {"deleted_portfolios": 2, "deleted_profiles": len(profile_only)})
+    after = reconcile(client, auth_page_size=3, profile_page_size=2)
+    expect("clean after apply", (after["orphan_auth_users"], after["orphan_profiles"]), ({}, {}))
+    expect("remaining users", (after["auth_total"], after["profile_total"]), (len(both), len(both)))
+
+    for failure in failures:
+        print(f"❌ {failure}")
+    if failures:
+        return False
+    print("✅ check: pagination, sorted merge, None emails, apply_cleanup")
+    return True
+
+
+class SortedProfileQuery(FakeQuery):
+    """id 순으로 정렬된 user_profiles에 대한 keyset 조회 (order('id') + gt('id') 전용, bisect로 시작 위치 탐색)"""
+
+    def __init__(self, table, ids):
+        super().__init__(table)
+        self.ids = ids
+        self.after = None
+
+    def gt(self, column, value):
+        self.after = value
+        return self
+
+    def execute(self):
+        self.table.queries += 1
+        start = 0 if self.after is None else bisect.bisect_right(self.ids, self.after)
+        return FakeResponse(self.table.rows[start:start + self.row_limit])
+
+
+def run_scale(args):
+    from user_sync import reconcile
+
+    rng = random.Random(args.seed)
+    auth_users, profiles, expected_auth, expected_profiles = [], [], 0, 0
+    for _ in range(args.users):
+        user_id = _uuid(rng)
+        roll = rng.random()
+        if roll < args.orphan_rate:
+            auth_users.append(FakeUser(user_id, f"{user_id[:8]}@example.com"))
+            expected_auth += 1
+        elif roll < args.orphan_rate * 2:
+            profiles.append({"id": user_id, "email": f"{user_id[:8]}@example.com"})
+            expected_profiles += 1
+        else:
+            auth_users.append(FakeUser(user_id, f"{user_id[:8]}@example.com"))
+            profiles.append({"id": user_id, "email": f"{user_id[:8]}@example.com"})
+    profiles.sort(key=lambda row: row["id"])
+    client = FakeSupabase(auth_users, profiles)
+    # 가짜 테이블의 정렬/필터 비용은 제외하도록 keyset 조회를 bisect로 대체
+    profile_table, profile_ids = client.tables["user_profiles"], [row["id"] for row in profiles]
+    client.table = lambda name: SortedProfileQuery(profile_table, profile_ids)
+
+    tracemalloc.start()
+    started = time.perf_counter()
+    report = reconcile(client, args.auth_page_size, args.profile_page_size)
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    ok = len(report["orphan_auth_users"]) == expected_auth and len(report["orphan_profiles"]) == expected_profiles
+    print(f"{'users':>9} {'auth':>9} {'profiles':>9} {'orphans':>9} {'time s':>8} {'peak MB':>8} {'pages':>7}")
+    print(f"{args.users:>9} {report['auth_total']:>9} {report['profile_total']:>9} "
+          f"{len(report['orphan_auth_users']) + len(report['orphan_profiles']):>9} {elapsed:>8.2f} {peak / 1e6:>8.1f} "
+          f"{client.auth.admin.list_calls + profile_table.queries:>7}")
+    if not ok:
+        print(f"❌ expected {expected_auth} auth / {expected_profiles} profile orphans")
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description="user_sync 검증 / 규모별 시간·메모리 측정 (가짜 Supabase)")
+    parser.add_argument("-s", "--mode", action="append", choices=MODES, help="반복 지정 가능 (기본: 전부)")
+    parser.add_argument("-n", "--users", type=int, default=100000)
+    parser.add_argument("--orphan-rate", type=float, default=0.01, help="Auth에만 / 프로필에만 있는 사용자 비율 (각각)")
+    parser.add_argument("--auth-page-size", type=int, default=1000)
+    parser.add_argument("--profile-page-size", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    sys.path.insert(0, API_DIR)
+    modes = args.mode or MODES
+    ok = True
+    if "check" in modes:
+        ok = run_check() and ok
+    if "scale" in modes:
+        ok = run_scale(args) and ok
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+"""
+Supabase Auth 계정 일괄 삭제 실행기
+auth.admin.delete_user를 동시 실행 수가 제한된 스레드 풀에서 호출하고,
+호출마다 제한 시간을 두며 일시적 오류는 지터 백오프로 재시도합니다.
+관리자 API는 call=admin_apis.call_supabase 를 넘겨 다른 Supabase 호출과 같은 회로 차단기를 사용합니다.
+"""
+import os
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+
+from resilience import CircuitOpen, call_with_timeout, retry_call
+
+# 동시에 진행할 삭제 요청 수 (Supabase Admin API rate limit 고려)
+MAX_WORKERS = int(os.getenv("AUTH_DELETE_CONCURRENCY", "8"))
+# 일시적 오류(429, 5xx, 네트워크)에 대한 최대 재시도 횟수
+MAX_RETRIES = int(os.getenv("AUTH_DELETE_MAX_RETRIES", "3"))
+# 백오프 기본 대기 시간(초) - random(0, 0.5), random(0, 1), random(0, 2) ...
+BACKOFF_BASE = float(os.getenv("AUTH_DELETE_BACKOFF", "0.5"))
+# 삭제 요청 1회 제한 시간(초) - 응답 없는 GoTrue 호출이 워커를 계속 붙잡지 않도록
+AUTH_DELETE_TIMEOUT = float(os.getenv("AUTH_DELETE_TIMEOUT", os.getenv("SUPABASE_TIMEOUT", "8")))
+# 메모리에 보관할 백그라운드 작업 수
+MAX_TRACKED_JOBS = 100
+
+_TRANSIENT_MARKERS = ("timeout", "timed out", "connection", "temporarily", "too many requests", "502", "503", "504")
+
+
+def is_transient_error(error):
+    """재시도할 가치가 있는 일시적 오류인지 판별"""
+    if isinstance(error, CircuitOpen):
+        return False
+    if isinstance(error, (TimeoutError, ConnectionError)):
+        return True
+    status = getattr(error, "status", None) or getattr(error, "status_code", None)
+    if isinstance(status, int):
+        return status == 429 or status >= 500
+    message = str(error).lower()
+    return any(marker in message for marker in _TRANSIENT_MARKERS)
+
+
+def _call_with_deadline(fn, *args):
+    return call_with_timeout(fn, AUTH_DELETE_TIMEOUT, *args, upstream="supabase")
+
+
+def _delete_one(client, user_id, max_retries, backoff_base, call=None):
+    """사용자 1명 삭제 (재시도 포함) - 결과 딕셔너리 반환"""
+    call = call or _call_with_deadline
+    attempts = 0
+
+    def attempt():
+        nonlocal attempts
+        attempts += 1
+        return call(client.auth.admin.delete_user, user_id)
+
+    try:
+        retry_call(attempt, attempts=max_retries + 1, base_delay=backoff_base, max_delay=backoff_base * 2 ** max_retries,
+                   retry_if=is_transient_error, name="supabase_auth_delete")
+        return {"user_id": user_id, "status": "deleted", "attempts": attempts}
+    except Exception as e:
+        return {"user_id": user_id, "status": "failed", "attempts": attempts, "error": str(e)}
+
+
+def delete_auth_users(client, user_ids, max_workers=None, max_retries=None, backoff_base=None, on_progress=None, call=None):
+    """
+    Auth 계정 병렬 삭제
+    on_progress(done, total, result)는 사용자 1명 처리가 끝날 때마다 호출됩니다.
+    call(fn, *args): 삭제 요청 1회 실행기 (기본: AUTH_DELETE_TIMEOUT 제한 시간만 적용)
+    반환값: {"total", "deleted", "failed", "results": [사용자별 결과]}
+    """
+    max_workers = max_workers or MAX_WORKERS
+    max_retries = MAX_RETRIES if max_retries is None else max_retries
+    backoff_base = BACKOFF_BASE if backoff_base is None else backoff_base
+
+    user_ids = list(dict.fromkeys(user_ids))  # 중복 제거 (순서 유지)
+    total = len(user_ids)
+    results = {}
+
+    if total:
+        with ThreadPoolExecutor(max_workers=min(max_workers, total)) as executor:
+            futures = [
+                executor.submit(_delete_one, client, user_id, max_retries, backoff_base, call)
+                for user_id in user_ids
+            ]
+            for done, future in enumerate(as_completed(futures), start=1):
+                result = future.result()
+                results[result["user_id"]] = result
+                if on_progress:
+                    try:
+                        on_progress(done, total, result)
+                    except Exception as e:
+                        print(f"⚠️ Progress callback failed: {e}")
+
+    ordered = [results[user_id] for user_id in user_ids]
+    deleted = sum(1 for r in ordered if r["status"] == "deleted")
+    return {
+        "total": total,
+        "deleted": deleted,
+        "failed": total - deleted,
+        "results": ordered,
+    }
+
+
+def delete_profile_rows(client, user_ids, chunk_size=200):
+    """
+    포트폴리오 → 프로필 순으로 일괄 삭제
+    in_ 필터가 URL 길이 제한에 걸리지 않도록 chunk 단위로 나눠 요청합니다.
+    반환값: (삭제된 포트폴리오 수, 삭제된 프로필 수)
+    """
+    portfolios_deleted = 0
+    profiles_deleted = 0
+    for start in range(0, len(user_ids), chunk_size):
+        chunk = user_ids[start:start + chunk_size]
+        pf_response = client.table('portfolios').delete().in_('user_id', chunk).execute()
+        portfolios_deleted += len(pf_response.data) if pf_response.data else 0
+        profile_response = client.table('user_profiles').delete().in_('id', chunk).execute()
+        profiles_deleted += len(profile_response.data) if profile_response.data else 0
+    return portfolios_deleted, profiles_deleted
+
+
+# --- 백그라운드 작업 (Job) ---
+# 주의: 서버리스 환경에서는 응답 이후 인스턴스가 정지될 수 있으므로
+# 대량 삭제는 장기 실행 서버에서 사용하는 것을 권장합니다.
+
+_jobs = {}
+_jobs_lock = threading.Lock()
+
+
+def _prune_jobs():
+    """완료된 오래된 작업부터 정리 (lock 보유 상태에서 호출)"""
+    if len(_jobs) <= MAX_TRACKED_JOBS:
+        return
+    finished = sorted(
+        (job for job in _jobs.values() if job["status"] != "running"),
+        key=lambda job: job["created_at"],
+    )
+    for job in finished[: len(_jobs) - MAX_TRACKED_JOBS]:
+        _jobs.pop(job["job_id"], None)
+
+
+def start_delete_job(client, user_ids, **kwargs):
+    """삭제 작업을 백그라운드 스레드로 시작하고 job_id를 즉시 반환"""
+    user_ids = list(dict.fromkeys(user_ids))
+    job_id = uuid.uuid4().hex
+    job = {
+        "job_id": job_id,
+        "status": "running",
+        "total": len(user_ids),
+        "done": 0,
+        "deleted": 0,
+        "failed": 0,
+        "results": [],
+        "created_at": datetime.utcnow().isoformat(),
+        "finished_at": None,
+    }
+    with _jobs_lock:
+        _jobs[job_id] = job
+        _prune_jobs()
+
+    def on_progress(done, total, result):
+        with _jobs_lock:
+            job["done"] = done
+            job["results"].append(result)
+            if result["status"] == "deleted":
+                job["deleted"] += 1
+            else:
+                job["failed"] += 1
+
+    def run():
+        try:
+            delete_auth_users(client, user_ids, on_progress=on_progress, **kwargs)
+            status = "completed"
+        except Exception as e:
+            print(f"❌ Auth delete job {job_id} failed: {e}")
+            status = "error"
+        with _jobs_lock:
+            job["status"] = status
+            job["finished_at"] = datetime.utcnow().isoformat()
+
+    threading.Thread(target=run, name=f"auth-delete-{job_id[:8]}", daemon=True).start()
+    return job_id
+
+
+def get_delete_job(job_id):
+    """작업 진행 상황 스냅샷 반환 (없으면 None)"""
+    with _jobs_lock:
+        job = _jobs.get(job_id)
+        if not job:
+            return None
+        return {**job, "results": list(job["results"])}
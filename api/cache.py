@@ -0,0 +1,150 @@
+"""
+프로세스 내 캐시 (LRU + TTL)
+서버리스 인스턴스마다 따로 존재하므로, 다른 인스턴스에서 일어난 변경은 TTL이 지나야 반영됩니다.
+"""
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+from fastapi import Response
+
+import fast_json
+from fast_json import FastJSONResponse
+
+
+class TTLCache:
+    """스레드 안전한 LRU 캐시 (ttl=None이면 만료 없음)"""
+
+    def __init__(self, maxsize=256, ttl=None, clock=time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        """값 반환 (없거나 만료되었으면 None)"""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or (entry[1] is not None and self._clock() >= entry[1]):
+                if entry is not None:
+                    del self._data[key]
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def set(self, key, value, ttl=None):
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = self._clock() + ttl if ttl is not None else None
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def invalidate(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self):
+        with self._lock:
+            return {"size": len(self._data), "hits": self.hits, "misses": self.misses}
+
+
+def etag_matches(if_none_match, etag):
+    """If-None-Match 헤더가 ETag와 일치하는지 (약한 비교, '*' 지원)"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    bare = etag[2:] if etag.startswith("W/") else etag
+    return any((tag[2:] if tag.startswith("W/") else tag) == bare for tag in candidates)
+
+
+class SWRCache:
+    """
+    stale-while-revalidate 캐시
+    - ttl 이내: 캐시 값 반환
+    - ttl ~ ttl+stale_ttl: 캐시 값을 바로 반환하고 백그라운드에서 갱신
+    - 그 이후 / 없음: 동기 조회
+    조회 실패 시 남아 있는 (오래된) 값이 있으면 그것을 반환합니다.
+    값마다 내용 기반 ETag를 함께 보관합니다.
+    """
+
+    def __init__(self, ttl=30, stale_ttl=300, clock=time.monotonic):
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self._clock = clock
+        self._data = {}  # key → (value, etag, fetched_at)
+        self._refreshing = set()
+        # invalidate 이전에 시작된 갱신 결과가 덮어쓰지 않도록 세대 번호 사용
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def get(self, key, loader):
+        """(value, etag) 반환 - loader는 예외로 실패를 알림"""
+        now = self._clock()
+        with self._lock:
+            entry = self._data.get(key)
+            generation = self._generation
+            if entry is not None:
+                age = now - entry[2]
+                if age < self.ttl:
+                    return entry[0], entry[1]
+                if age < self.ttl + self.stale_ttl:
+                    if key not in self._refreshing:
+                        self._refreshing.add(key)
+                        threading.Thread(target=self._refresh, args=(key, loader, generation), daemon=True).start()
+                    return entry[0], entry[1]
+        try:
+            return self._store(key, loader(), generation)
+        except Exception:
+            if entry is not None:
+                print(f"⚠️ Cache refresh failed for {key}, serving stale value")
+                return entry[0], entry[1]
+            raise
+
+    def _store(self, key, value, generation):
+        etag = f'"{hashlib.sha256(fast_json.dumps_canonical(value)).hexdigest()[:32]}"'
+        with self._lock:
+            if generation == self._generation:
+                self._data[key] = (value, etag, self._clock())
+        return value, etag
+
+    def _refresh(self, key, loader, generation):
+        try:
+            self._store(key, loader(), generation)
+        except Exception as e:
+            print(f"⚠️ Background cache refresh failed for {key}: {e}")
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+    def invalidate(self, key=None):
+        """key 삭제 (None이면 전체)"""
+        with self._lock:
+            self._generation += 1
+            if key is None:
+                self._data.clear()
+            else:
+                self._data.pop(key, None)
+
+
+def conditional_response(content, etag, cache_control, if_none_match=None):
+    """If-None-Match가 일치하면 304, 아니면 ETag/Cache-Control이 붙은 JSON 응답 (etag=None이면 캐시 금지)"""
+    if etag is None:
+        return FastJSONResponse(content, headers={"Cache-Control": "no-store"})
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+    return FastJSONResponse(content, headers=headers)
@@ -0,0 +1,142 @@
+"""
+무무(공유 모드) 챗봇 로컬 답변 라우터
+채용 담당자 질문이 12개 대표 질문(generate-chat-answers) 중 하나와 충분히 비슷하고
+지원자가 검수한 답변이 있으면 LLM 호출 없이 그 답변을 바로 반환합니다.
+
+- 색인: 대표 질문 + QUESTION_KEYWORDS 표현을 글자 2~3-gram / 단어 TF-IDF 벡터로 (한국어 조사·어미 변형에 강함)
+- 판정: 최고 점수 >= threshold 이고 2위 질문과의 차이 >= margin 일 때만 매칭 (애매하면 LLM으로)
+- 검수된 답변: 요청의 portfolio_context 안 '[질문: ...] 답변: ...' 줄 (lib/portfolioRAG.js 형식)
+"""
+import math
+import re
+from collections import Counter
+
+# (그룹 이름, 제목, [(답변 키, 질문), ...]) - 단일 호출 프롬프트의 질문 목록과 같은 순서
+CHAT_ANSWER_GROUPS = (
+    ("역량", "1. 핵심 역량 및 기술 요약", [
+        ("core_skills", "1-1. 지원자의 핵심 역량 3가지를 요약한다면?"),
+        ("main_stack", "1-2. 이 포트폴리오에서 가장 주력으로 사용한 '기술 스택(Main Skill)'은 무엇인가요?"),
+        ("tech_depth", "1-3. 기술적으로 가장 깊이 있게 파고들거나 연구해 본 분야는 어디인가요?"),
+        ("documentation", "1-4. 코드 작성 외에 설계 문서(API 명세, 기획서 등)도 작성할 줄 아나요?"),
+    ]),
+    ("역할", "2. 역할 및 기여도 검증", [
+        ("role_contribution", "2-1. 각 프로젝트에서의 지원자의 구체적인 역할과 기여도는 어땠나요?"),
+        ("collaboration", "2-2. 팀 프로젝트에서 동료들과의 협업(코드 리뷰, 일정 관리)은 어떻게 진행했나요?"),
+        ("cycle", "2-3. 기획부터 배포/운영까지 '전체 사이클'을 경험해 본 프로젝트가 있나요?"),
+        ("artifacts", "2-4. 실제 작성한 소스 코드나 디자인 원본 파일(Figma 등)을 볼 수 있나요?"),
+    ]),
+    ("문제해결", "3. 문제 해결 및 성과", [
+        ("best_project", "3-1. 포트폴리오 중 가장 자신 있는 프로젝트 하나를 소개한다면?"),
+        ("troubleshooting", "3-2. 개발(또는 진행) 중 발생한 가장 치명적인 문제와 해결 과정은 무엇인가요?"),
+        ("decision_making", "3-3. 해당 기술(또는 디자인 컨셉)을 선정하게 된 특별한 이유나 논리가 있나요?"),
+        ("quantitative_performance", "3-4. 프로젝트를 통해 얻은 구체적인 수치 성과(사용자 수, 성능 개선율 등)가 있나요?"),
+    ]),
+)
+# [(답변 키, 번호를 뺀 질문 문구)] - lib/portfolioRAG.js / ChatWidget.js 의 질문 문구와 동일
+CHAT_QUESTIONS = [(key, question.split(". ", 1)[1]) for _, _, questions in CHAT_ANSWER_GROUPS for key, question in questions]
+
+# 질문별 추가 표현 (ChatWidget.js 키워드 + 자주 들어오는 바꿔 말하기)
+QUESTION_KEYWORDS = {
+    "core_skills": ["핵심 요약", "핵심 역량", "강점이 뭔가요", "가장 잘하는 것", "역량 요약"],
+    "main_stack": ["메인 스택", "주력 기술", "주로 사용한 기술 스택", "메인 스킬", "어떤 기술을 주로 쓰나요"],
+    "tech_depth": ["기술 깊이", "깊이 공부한 기술", "가장 깊게 연구한 분야", "전문 분야"],
+    "documentation": ["문서화", "설계 문서", "API 명세 작성", "기획서 작성 경험"],
+    "role_contribution": ["기여도", "맡은 역할", "프로젝트에서 역할", "본인 역할과 기여"],
+    "collaboration": ["협업 방식", "팀 협업", "코드 리뷰", "일정 관리", "동료와 협업"],
+    "cycle": ["범위 확인", "전체 사이클", "기획부터 배포까지", "운영 경험", "배포 경험"],
+    "artifacts": ["산출물", "소스 코드 볼 수 있나요", "깃허브 링크", "디자인 원본 파일", "피그마 파일"],
+    "best_project": ["대표작", "가장 자신 있는 프로젝트", "대표 프로젝트 소개", "제일 잘한 프로젝트"],
+    "troubleshooting": ["트러블슈팅", "문제 해결 경험", "가장 어려웠던 문제", "치명적인 문제 해결"],
+    "decision_making": ["의사결정", "기술 선정 이유", "왜 그 기술을 선택했나요", "디자인 컨셉 선정 이유"],
+    "quantitative_performance": ["정량 성과", "수치 성과", "성능 개선율", "사용자 수", "숫자로 보여줄 성과"],
+}
+
+VERIFIED_LINE_RE = re.compile(r"^\[질문: (.+?)\] 답변: ?(.*)$")
+# 어떤 질문에나 붙는 말 - 색인/질의에서 제외해 '있나요', '어떻게' 같은 표현만으로 매칭되지 않게 함
+FILLER_WORDS = {
+    "있나요", "있어요", "있을까요", "있는지", "인가요", "뭔가요", "뭐예요", "뭐였나요", "무엇인가요", "무엇", "어떻게", "어땠나요",
+    "알려주세요", "알려", "주세요", "궁금합니다", "궁금해요", "가능한가요", "하나", "하나만", "혹시", "이분", "본인", "지원자의", "지원자",
+    "한다면", "볼", "수", "같은", "되나요", "했나요", "하나요",
+}
+# 단어 끝의 의문형 어미 (긴 것부터)
+QUESTION_ENDINGS = ("습니까", "을까요", "인가요", "나요", "가요", "세요", "예요", "어요", "까요", "은요", "는요", "요")
+
+
+def _words(text):
+    for word in re.sub(r"[^\w]+", " ", text.lower()).split():
+        if word in FILLER_WORDS:
+            continue
+        for ending in QUESTION_ENDINGS:
+            if word.endswith(ending) and len(word) > len(ending) + 1:
+                word = word[: -len(ending)]
+                break
+        yield word
+
+
+def _features(text):
+    """단어 + 단어 내부 글자 2~3-gram 빈도"""
+    features = Counter()
+    for word in _words(text):
+        features["w:" + word] += 1
+        for n in (2, 3):
+            for i in range(len(word) - n + 1):
+                features[word[i:i + n]] += 1
+    return features
+
+
+class AnswerRouter:
+    def __init__(self, questions=CHAT_QUESTIONS, keywords=QUESTION_KEYWORDS, threshold=0.5, margin=0.08):
+        """questions: [(답변 키, 대표 질문), ...]"""
+        self.threshold = threshold
+        self.margin = margin
+        self.labels = {text: key for key, text in questions}
+        phrases = [(key, text) for key, text in questions]
+        phrases += [(key, phrase) for key, _ in questions for phrase in keywords.get(key, ())]
+
+        documents = [_features(text) for _, text in phrases]
+        document_frequency = Counter(feature for features in documents for feature in features)
+        total = len(documents)
+        self.idf = {feature: math.log((1 + total) / (1 + count)) + 1 for feature, count in document_frequency.items()}
+        self.index = [(key, self._vector(features)) for (key, _), features in zip(phrases, documents)]
+
+    def _vector(self, features):
+        vector = {feature: count * self.idf[feature] for feature, count in features.items() if feature in self.idf}
+        norm = math.sqrt(sum(weight * weight for weight in vector.values())) or 1.0
+        return {feature: weight / norm for feature, weight in vector.items()}
+
+    def scores(self, message):
+        """답변 키별 최고 유사도 (높은 순)"""
+        query = self._vector(_features(message))
+        best = {}
+        for key, vector in self.index:
+            score = sum(weight * vector.get(feature, 0.0) for feature, weight in query.items())
+            best[key] = max(best.get(key, 0.0), score)
+        return sorted(best.items(), key=lambda item: item[1], reverse=True)
+
+    def route(self, message, answers):
+        """(답변 키, 점수) 또는 None - answers에 검수된 답변이 있는 질문만 매칭"""
+        ranked = self.scores(message)
+        if not ranked:
+            return None
+        (key, score), runner_up = ranked[0], (ranked[1][1] if len(ranked) > 1 else 0.0)
+        if score < self.threshold or score - runner_up < self.margin:
+            return None
+        if not str(answers.get(key) or "").strip():
+            return None
+        return key, score
+
+    def parse_verified_answers(self, context):
+        """portfolio_context의 '[질문: 대표 질문] 답변: ...' 줄 → {답변 키: 답변} (여러 줄 답변 포함)"""
+        answers, key = {}, None
+        for line in (context or "").splitlines():
+            match = VERIFIED_LINE_RE.match(line)
+            if match:
+                key = self.labels.get(match.group(1).strip())
+                if key:
+                    answers[key] = match.group(2)
+                continue
+            if line.startswith("※") or line.startswith("==="):
+                key = None
+            elif key:
+                answers[key] += "\n" + line
+        return {key: answer.strip() for key, answer in answers.items() if answer.strip()}
@@ -0,0 +1,189 @@
+"""
+챗봇 대화 세션 (서버 측)
+- session_id 별로 압축한 포트폴리오 컨텍스트 + 최근 대화 + 이전 대화 요약을 보관
+- 메모리: TTLCache (LRU + TTL, 저장할 때마다 만료 연장)
+- CHAT_SESSION_DB 설정 시 SQLite에도 저장 → 재시작 / 같은 서버의 다른 워커에서도 이어서 대화
+  (서버리스 인스턴스끼리는 공유되지 않으므로 클라이언트는 portfolio_context를 계속 보내는 것이 안전)
+- 대화 기록이 CHAT_HISTORY_TOKEN_BUDGET을 넘으면 최근 CHAT_KEEP_RECENT_MESSAGES개를 제외한 오래된 턴을
+  summarize_fn으로 요약해 접어 넣음 (응답 후 백그라운드), 요약 전이라도 프롬프트에는 예산만큼만 포함
+"""
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+import fast_json
+from cache import TTLCache
+from metrics import logger
+
+CHAT_SESSION_TTL = int(os.getenv("CHAT_SESSION_TTL", "1800"))
+CHAT_SESSION_MAX = int(os.getenv("CHAT_SESSION_MAX", "1000"))
+CHAT_SESSION_DB = os.getenv("CHAT_SESSION_DB", "")
+CHAT_CONTEXT_TOKEN_BUDGET = int(os.getenv("CHAT_CONTEXT_TOKEN_BUDGET", "3000"))
+CHAT_HISTORY_TOKEN_BUDGET = int(os.getenv("CHAT_HISTORY_TOKEN_BUDGET", "1500"))
+CHAT_KEEP_RECENT_MESSAGES = int(os.getenv("CHAT_KEEP_RECENT_MESSAGES", "4"))
+# 요약 자체가 계속 길어지지 않도록 히스토리 예산의 1/3로 제한
+CHAT_SUMMARY_TOKEN_BUDGET = CHAT_HISTORY_TOKEN_BUDGET // 3
+
+SESSION_ID_RE = re.compile(r"^[A-Za-z0-9_-]{8,64}$")
+# lib/portfolioRAG.js 의 검수된 답변 섹션 - 컨텍스트를 줄일 때도 우선 보존
+VERIFIED_SECTION_MARKER = "=== 지원자가 직접 검수하고 승인한 핵심 질문 답변"
+TRUNCATED_NOTE = "\n...(이하 생략)"
+
+
+def estimate_tokens(text):
+    """대략적인 토큰 수 (영문/숫자는 4자, 한글 등은 1.5자당 1토큰)"""
+    if not text:
+        return 0
+    ascii_count = sum(1 for ch in text if ord(ch) < 128)
+    return int(ascii_count / 4 + (len(text) - ascii_count) / 1.5) + 1
+
+
+def truncate_to_tokens(text, budget):
+    if estimate_tokens(text) <= budget:
+        return text
+    low, high = 0, len(text)
+    while low < high:
+        middle = (low + high + 1) // 2
+        if estimate_tokens(text[:middle]) <= budget:
+            low = middle
+        else:
+            high = middle - 1
+    return text[:low].rstrip() + TRUNCATED_NOTE
+
+
+def compact_context(context, budget=CHAT_CONTEXT_TOKEN_BUDGET):
+    """공백/빈 줄 정리 후 예산을 넘으면 검수된 답변 섹션은 살리고 앞부분(프로젝트 상세 등)을 잘라냄"""
+    lines = [re.sub(r"[ \t]+", " ", line).strip() for line in (context or "").splitlines()]
+    text = "\n".join(line for line in lines if line)
+    if estimate_tokens(text) <= budget:
+        return text
+    head, marker, verified = text.partition(VERIFIED_SECTION_MARKER)
+    if not marker:
+        return truncate_to_tokens(text, budget)
+    tail = truncate_to_tokens(marker + verified, budget)
+    return truncate_to_tokens(head, max(0, budget - estimate_tokens(tail))) + "\n" + tail
+
+
+def history_tokens(session):
+    return estimate_tokens(session["summary"]) + sum(estimate_tokens(turn["content"]) for turn in session["turns"])
+
+
+def needs_summary(session):
+    return history_tokens(session) > CHAT_HISTORY_TOKEN_BUDGET and len(session["turns"]) > CHAT_KEEP_RECENT_MESSAGES
+
+
+def prompt_history(session):
+    """프롬프트에 넣을 최근 턴 (최신부터 예산만큼, 시간 순으로 반환)"""
+    budget = CHAT_HISTORY_TOKEN_BUDGET - estimate_tokens(session["summary"])
+    selected = []
+    for turn in reversed(session["turns"]):
+        budget -= estimate_tokens(turn["content"])
+        if budget < 0 and selected:
+            break
+        selected.append(turn)
+    return list(reversed(selected))
+
+
+class ChatSessionStore:
+    def __init__(self, ttl=CHAT_SESSION_TTL, maxsize=CHAT_SESSION_MAX, db_path=CHAT_SESSION_DB or None):
+        self.ttl = ttl
+        self.db_path = db_path
+        self.memory = TTLCache(maxsize, ttl)
+        # 세션별 잠금 (세션 수만큼 만들지 않도록 해시로 나눠 씀)
+        self._locks = [threading.Lock() for _ in range(64)]
+        if db_path:
+            with self._db() as conn:
+                conn.execute("""
+                    CREATE TABLE IF NOT EXISTS chat_sessions (
+                        id TEXT PRIMARY KEY,
+                        data TEXT NOT NULL,
+                        updated_at REAL NOT NULL
+                    )
+                """)
+                conn.execute("DELETE FROM chat_sessions WHERE updated_at < ?", (time.time() - ttl,))
+
+    @contextmanager
+    def _db(self):
+        conn = sqlite3.connect(self.db_path, timeout=10)
+        try:
+            yield conn
+            conn.commit()
+        finally:
+            conn.close()
+
+    def lock(self, key):
+        return self._locks[int(hashlib.md5(key.encode()).hexdigest()[:8], 16) % len(self._locks)]
+
+    def get(self, key):
+        session = self.memory.get(key)
+        if session is not None or not self.db_path:
+            return session
+        with self._db() as conn:
+            row = conn.execute("SELECT data, updated_at FROM chat_sessions WHERE id = ?", (key,)).fetchone()
+        if row is None or row[1] < time.time() - self.ttl:
+            return None
+        session = fast_json.loads(row[0])
+        self.memory.set(key, session)
+        return session
+
+    def save(self, key, session):
+        session["updated_at"] = time.time()
+        self.memory.set(key, session)
+        if self.db_path:
+            with self._db() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO chat_sessions (id, data, updated_at) VALUES (?, ?, ?)",
+                    (key, fast_json.dumps(session), session["updated_at"]),
+                )
+
+    def open(self, key, portfolio_context):
+        """세션 조회/생성 - 새 portfolio_context가 오면 압축해서 교체"""
+        with self.lock(key):
+            session = self.get(key) or {"context": "", "context_hash": "", "summary": "", "turns": [], "next_seq": 0}
+            if portfolio_context:
+                context_hash = hashlib.sha1(portfolio_context.encode()).hexdigest()
+                if context_hash != session["context_hash"]:
+                    session["context"] = compact_context(portfolio_context)
+                    session["context_hash"] = context_hash
+            self.save(key, session)
+            return dict(session, turns=list(session["turns"]))
+
+    def append(self, key, user_message, reply):
+        """턴 추가 → 요약이 필요한지 반환"""
+        with self.lock(key):
+            session = self.get(key)
+            if session is None:
+                return False
+            for role, content in (("user", user_message), ("assistant", reply)):
+                session["turns"].append({"seq": session["next_seq"], "role": role, "content": content})
+                session["next_seq"] += 1
+            self.save(key, session)
+            return needs_summary(session)
+
+    def summarize(self, key, summarize_fn):
+        """오래된 턴을 요약으로 접기 (LLM 호출은 잠금 밖에서, 실패하면 오래된 턴만 버림)"""
+        with self.lock(key):
+            session = self.get(key)
+            if session is None or not needs_summary(session):
+                return
+            old_turns = session["turns"][:-CHAT_KEEP_RECENT_MESSAGES]
+            previous_summary = session["summary"]
+        try:
+            summary = truncate_to_tokens(summarize_fn(previous_summary, old_turns).strip(), CHAT_SUMMARY_TOKEN_BUDGET)
+        except Exception as e:
+            logger.warning("⚠️ 대화 요약 실패 - 오래된 턴만 정리: %s", e)
+            summary = previous_summary
+        last_seq = old_turns[-1]["seq"]
+        with self.lock(key):
+            session = self.get(key)
+            if session is None:
+                return
+            # 그 사이 다른 요청이 이미 요약했으면 이미 빠진 턴만 제외하고 적용
+            session["turns"] = [turn for turn in session["turns"] if turn["seq"] > last_seq]
+            session["summary"] = summary
+            self.save(key, session)
+        logger.info("🗜️ 대화 요약: %d턴 → %d 토큰", len(old_turns), estimate_tokens(summary))
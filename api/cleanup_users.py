@@ -5,6 +5,7 @@ Auth에는 있지만 user_profiles에는 없는 계정들을 삭제합니다.
 import os
 from dotenv import load_dotenv
 from supabase import create_client
+from user_sync import reconcile, apply_cleanup
 
 load_dotenv()
 
@@ -22,30 +23,18 @@ print("=" * 60)
 print("고아 Auth 계정 정리")
 print("=" * 60)
 
-# 1. Auth 사용자 목록 가져오기
-print("\n📋 Fetching Auth users...")
+# 1~2. Auth 사용자 / user_profiles 페이지 단위 조회 및 비교
+print("\n📋 Fetching Auth users and user_profiles (paginated)...")
 try:
-    auth_response = supabase.auth.admin.list_users()
-    auth_users = auth_response
-    auth_user_ids = {user.id for user in auth_users}
-    print(f"✅ Found {len(auth_users)} users in Auth")
+    report = reconcile(supabase)
+    print(f"✅ Found {report['auth_total']} users in Auth")
+    print(f"✅ Found {report['profile_total']} profiles in user_profiles")
 except Exception as e:
-    print(f"❌ Failed to fetch auth users: {e}")
-    exit(1)
-
-# 2. user_profiles 목록 가져오기
-print("\n📋 Fetching user_profiles...")
-try:
-    profiles_response = supabase.table('user_profiles').select('id, email').execute()
-    profiles = profiles_response.data
-    profile_user_ids = {profile['id'] for profile in profiles}
-    print(f"✅ Found {len(profiles)} profiles in user_profiles")
-except Exception as e:
-    print(f"❌ Failed to fetch user profiles: {e}")
+    print(f"❌ Failed to fetch users: {e}")
     exit(1)
 
 # 3. 고아 Auth 계정 찾기
-orphan_auth_users = auth_user_ids - profile_user_ids
+orphan_auth_users = report["orphan_auth_users"]
 
 if not orphan_auth_users:
     print("\n✅ 정리할 고아 계정이 없습니다!")
@@ -53,10 +42,8 @@ if not orphan_auth_users:
 
 print(f"\n⚠️  발견된 고아 Auth 계정: {len(orphan_auth_users)}개")
 print("\n삭제될 계정 목록:")
-for user_id in orphan_auth_users:
-    user = next((u for u in auth_users if u.id == user_id), None)
-    if user:
-        print(f"   - {user.email} ({user_id})")
+for user_id, email in orphan_auth_users.items():
+    print(f"   - {email} ({user_id})")
 
 # 4. 사용자 확인
 print("\n" + "=" * 60)
@@ -66,22 +53,23 @@ if response.lower() != 'yes':
     print("\n❌ 취소되었습니다.")
     exit(0)
 
-# 5. 삭제 실행
+# 5. 삭제 실행 (동시 실행 수 제한 + 일시적 오류 재시도)
 print("\n🗑️  삭제 시작...")
-deleted_count = 0
-failed_count = 0
-failed_users = []
-
-for user_id in orphan_auth_users:
-    user = next((u for u in auth_users if u.id == user_id), None)
-    try:
-        supabase.auth.admin.delete_user(user_id)
-        deleted_count += 1
-        print(f"✅ Deleted: {user.email if user else user_id}")
-    except Exception as e:
-        failed_count += 1
-        failed_users.append((user.email if user else user_id, str(e)))
-        print(f"❌ Failed to delete {user.email if user else user_id}: {e}")
+
+def on_progress(done, total, result):
+    label = orphan_auth_users.get(result["user_id"]) or result["user_id"]
+    if result["status"] == "deleted":
+        print(f"✅ [{done}/{total}] Deleted: {label}")
+    else:
+        print(f"❌ [{done}/{total}] Failed to delete {label}: {result['error']}")
+
+auth_report = apply_cleanup(supabase, report, delete_auth=True, on_progress=on_progress)["auth"]
+deleted_count = auth_report["deleted"]
+failed_count = auth_report["failed"]
+failed_users = [
+    (orphan_auth_users.get(r["user_id"]) or r["user_id"], r["error"])
+    for r in auth_report["results"] if r["status"] == "failed"
+]
 
 # 6. 결과 요약
 print("\n" + "=" * 60)
@@ -96,6 +84,6 @@ if failed_users:
         print(f"   - {email}: {error}")
 
 print("\n최종 상태:")
-print(f"   Auth 사용자: {len(auth_users)} → {len(auth_users) - deleted_count}")
-print(f"   user_profiles: {len(profiles)}")
+print(f"   Auth 사용자: {report['auth_total']} → {report['auth_total'] - deleted_count}")
+print(f"   user_profiles: {report['profile_total']}")
 print(f"   동기화 상태: {'✅ 완료' if deleted_count == len(orphan_auth_users) else '⚠️ 일부 실패'}")
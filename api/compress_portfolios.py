@@ -0,0 +1,107 @@
+"""
+포트폴리오 압축 마이그레이션 스크립트
+비압축으로 저장된 portfolio_sections.data / users.portfolio_data 행을 배치 단위로 압축합니다.
+여러 번 실행해도 안전하며(이미 압축된 행은 건너뜀), 중간에 멈춰도 이어서 실행할 수 있습니다.
+읽은 뒤 사용자가 저장해 값이 바뀐 행은 덮어쓰지 않고 건너뜁니다 (다음 실행 시 다시 처리).
+
+사용법:
+    python compress_portfolios.py --dry-run
+    python compress_portfolios.py --batch-size 200
+    python compress_portfolios.py --train-dict portfolio.dict   # zstd 사전 학습 후 PORTFOLIO_ZSTD_DICT로 지정
+"""
+import argparse
+
+from sqlalchemy import text
+
+from database import engine
+from portfolio_codec import encode_text, is_compressed, train_dictionary
+
+# (테이블, 기본키 컬럼, 데이터 컬럼)
+TARGETS = (
+    ("portfolio_sections", "id", "data"),
+    ("users", "id", "portfolio_data"),
+)
+
+
+def iter_batches(conn, table, pk, column, batch_size):
+    """id 순 keyset 페이지네이션으로 (id, 값) 배치 생성"""
+    last_id = 0
+    while True:
+        rows = conn.execute(
+            text(f"SELECT {pk}, {column} FROM {table} WHERE {pk} > :last_id AND {column} IS NOT NULL ORDER BY {pk} LIMIT :limit"),
+            {"last_id": last_id, "limit": batch_size},
+        ).fetchall()
+        if not rows:
+            return
+        yield rows
+        last_id = rows[-1][0]
+
+
+def compress_table(table, pk, column, batch_size, dry_run):
+    scanned = converted = skipped = before = after = 0
+    with engine.connect() as conn:
+        for rows in iter_batches(conn, table, pk, column, batch_size):
+            updates = []
+            for row_id, value in rows:
+                scanned += 1
+                if is_compressed(value):
+                    continue
+                encoded = encode_text(value, force=True)
+                if encoded is value:
+                    continue
+                updates.append({"id": row_id, "value": encoded, "old": value})
+                before += len(value)
+                after += len(encoded)
+            if updates and not dry_run:
+                # 읽은 값과 같을 때만 교체 - 그 사이 저장된 새 내용을 예전 스냅샷으로 덮어쓰지 않음
+                statement = text(f"UPDATE {table} SET {column} = :value WHERE {pk} = :id AND {column} = :old")
+                with engine.begin() as write_conn:
+                    updated = sum(write_conn.execute(statement, params).rowcount for params in updates)
+                converted += updated
+                skipped += len(updates) - updated
+            else:
+                converted += len(updates)
+            print(f"   {table}: {scanned} scanned, {converted} {'to convert' if dry_run else 'converted'}, {skipped} changed meanwhile (skipped)")
+    ratio = f"{after / before:.1%}" if before else "-"
+    print(f"✅ {table}.{column}: {converted}/{scanned} rows, {skipped} skipped, {before:,} → {after:,} chars ({ratio})")
+
+
+def collect_samples(limit):
+    samples = []
+    with engine.connect() as conn:
+        for table, pk, column in TARGETS:
+            for rows in iter_batches(conn, table, pk, column, 500):
+                samples.extend(value for _, value in rows if not is_compressed(value))
+                if len(samples) >= limit:
+                    return samples[:limit]
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description="portfolio_data 압축 마이그레이션")
+    parser.add_argument("--batch-size", type=int, default=200)
+    parser.add_argument("--dry-run", action="store_true", help="변경 없이 예상 결과만 출력")
+    parser.add_argument("--train-dict", metavar="PATH", help="기존 행으로 zstd 사전을 학습해 PATH에 저장")
+    parser.add_argument("--samples", type=int, default=2000, help="사전 학습에 사용할 최대 행 수")
+    args = parser.parse_args()
+
+    if args.train_dict:
+        samples = collect_samples(args.samples)
+        print(f"📚 Training zstd dictionary from {len(samples)} samples...")
+        with open(args.train_dict, "wb") as f:
+            f.write(train_dictionary(samples))
+        print(f"✅ Saved dictionary to {args.train_dict} (set PORTFOLIO_ZSTD_DICT to use it, keep the previous one in PORTFOLIO_ZSTD_OLD_DICTS)")
+        return
+
+    print("=" * 60)
+    print(f"포트폴리오 압축 {'(dry-run)' if args.dry_run else ''}")
+    print("=" * 60)
+    for table, pk, column in TARGETS:
+        try:
+            compress_table(table, pk, column, args.batch_size, args.dry_run)
+        except Exception as e:
+            print(f"❌ {table} 처리 실패: {e}")
+
+
+if __name__ == "__main__":
+    main()
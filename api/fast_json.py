@@ -0,0 +1,58 @@
+"""
+JSON 직렬화 계층
+orjson이 설치되어 있으면 사용하고, 없으면 표준 json 모듈로 대체합니다.
+포트폴리오 DB 저장과 API 응답(FastJSONResponse)에서 공통으로 사용합니다.
+"""
+import json
+
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # 선택 의존성
+    orjson = None
+
+BACKEND = "orjson" if orjson else "json"
+
+if orjson:
+    _OPTIONS = orjson.OPT_NON_STR_KEYS
+    _CANONICAL_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SORT_KEYS
+
+
+def dumps_bytes(obj):
+    """obj → UTF-8 JSON bytes (공백 없는 compact 형식)"""
+    if orjson:
+        try:
+            return orjson.dumps(obj, option=_OPTIONS)
+        except TypeError:
+            pass  # 64bit 범위를 넘는 정수 등 orjson 미지원 값은 표준 모듈로 처리
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def dumps(obj):
+    """obj → JSON 문자열"""
+    return dumps_bytes(obj).decode("utf-8")
+
+
+def dumps_canonical(obj):
+    """키 정렬된 JSON bytes (내용 해시 계산용)"""
+    if orjson:
+        try:
+            return orjson.dumps(obj, option=_CANONICAL_OPTIONS)
+        except TypeError:
+            pass
+    return json.dumps(obj, ensure_ascii=False, sort_keys=True, separators=(",", ":")).encode("utf-8")
+
+
+def loads(data):
+    """JSON 문자열/bytes → 파이썬 객체"""
+    if orjson:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+class FastJSONResponse(JSONResponse):
+    """fast_json으로 본문을 직렬화하는 응답 클래스 (앱 기본 응답 클래스)"""
+
+    def render(self, content):
+        return dumps_bytes(content)
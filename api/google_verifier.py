@@ -0,0 +1,128 @@
+"""
+구글 ID 토큰 검증기 (공개 인증서 캐싱)
+id_token.verify_oauth2_token은 호출할 때마다 구글 인증서 엔드포인트를 조회하므로,
+인증서를 Cache-Control max-age 동안 메모리에 보관하고 만료 전에 백그라운드에서 갱신합니다.
+로그인 요청 경로에서는 네트워크 왕복 없이 로컬에서 서명만 검증합니다.
+"""
+import os
+import re
+import threading
+import time
+
+from google.auth import jwt
+
+from http_client import get_session, DEFAULT_TIMEOUT
+
+GOOGLE_CERTS_URL = "https://www.googleapis.com/oauth2/v1/certs"
+GOOGLE_ISSUERS = ("accounts.google.com", "https://accounts.google.com")
+
+# Cache-Control 헤더가 없을 때 사용할 기본 유효 시간(초)
+DEFAULT_MAX_AGE = 3600
+# 만료까지 남은 시간이 이 값 이하이면 백그라운드 갱신 시작
+REFRESH_AHEAD = int(os.getenv("GOOGLE_CERTS_REFRESH_AHEAD", "300"))
+# 알 수 없는 kid(키 교체)로 강제 갱신할 때 최소 간격(초)
+MIN_FORCED_REFRESH_INTERVAL = 30
+
+_MAX_AGE_PATTERN = re.compile(r"max-age=(\d+)")
+
+
+def parse_max_age(cache_control):
+    """Cache-Control 헤더에서 max-age(초) 추출"""
+    match = _MAX_AGE_PATTERN.search(cache_control or "")
+    return int(match.group(1)) if match else DEFAULT_MAX_AGE
+
+
+class GoogleCertCache:
+    """구글 공개 인증서 캐시 ({kid: PEM 인증서})"""
+
+    def __init__(self, certs_url=GOOGLE_CERTS_URL, fetch=None, clock=time.monotonic):
+        self.certs_url = certs_url
+        self._fetch = fetch or self._fetch_from_google
+        self._clock = clock
+        self._certs = None
+        self._expires_at = 0.0
+        self._last_fetch = float("-inf")
+        self._lock = threading.Lock()
+        self._refreshing = False
+
+    def _fetch_from_google(self):
+        """(certs, max_age) 반환"""
+        response = get_session().get(self.certs_url, timeout=DEFAULT_TIMEOUT)
+        response.raise_for_status()
+        return response.json(), parse_max_age(response.headers.get("Cache-Control"))
+
+    def refresh(self):
+        """인증서를 다시 받아 캐시 교체"""
+        certs, max_age = self._fetch()
+        now = self._clock()
+        with self._lock:
+            self._certs = certs
+            self._expires_at = now + max_age
+            self._last_fetch = now
+        return certs
+
+    def _refresh_in_background(self):
+        def run():
+            try:
+                self.refresh()
+            except Exception as e:
+                print(f"⚠️ Google cert background refresh failed: {e}")
+            finally:
+                self._refreshing = False
+
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+        threading.Thread(target=run, name="google-cert-refresh", daemon=True).start()
+
+    def get_certs(self):
+        """유효한 인증서 반환 (만료 시에만 동기 조회, 만료 임박 시 백그라운드 갱신)"""
+        now = self._clock()
+        certs = self._certs
+        if certs is None or now >= self._expires_at:
+            with self._lock:
+                stale = self._certs is None or self._clock() >= self._expires_at
+            if stale:
+                return self.refresh()
+            return self._certs
+        if self._expires_at - now <= REFRESH_AHEAD:
+            self._refresh_in_background()
+        return certs
+
+    def get_certs_for(self, key_id):
+        """kid가 캐시에 없으면(구글 키 교체 직후) 한 번 강제 갱신"""
+        certs = self.get_certs()
+        if key_id and key_id not in certs and self._clock() - self._last_fetch >= MIN_FORCED_REFRESH_INTERVAL:
+            certs = self.refresh()
+        return certs
+
+
+class GoogleTokenVerifier:
+    """캐시된 인증서로 구글 ID 토큰을 로컬 검증"""
+
+    def __init__(self, cert_cache=None, audience=None, clock_skew_in_seconds=10):
+        self.cert_cache = cert_cache or GoogleCertCache()
+        self.audience = audience
+        self.clock_skew_in_seconds = clock_skew_in_seconds
+
+    def verify(self, token):
+        """
+        토큰 검증 후 payload 반환
+        서명/만료/issuer가 올바르지 않으면 ValueError 발생 (verify_oauth2_token과 동일)
+        """
+        header = jwt.decode_header(token)
+        certs = self.cert_cache.get_certs_for(header.get("kid"))
+        id_info = jwt.decode(
+            token,
+            certs=certs,
+            audience=self.audience,
+            clock_skew_in_seconds=self.clock_skew_in_seconds,
+        )
+        if id_info.get("iss") not in GOOGLE_ISSUERS:
+            raise ValueError(f"Wrong issuer: {id_info.get('iss')}")
+        return id_info
+
+
+# 프로세스 전역 검증기 (GOOGLE_CLIENT_ID가 설정되어 있으면 audience도 검증)
+google_verifier = GoogleTokenVerifier(audience=os.getenv("GOOGLE_CLIENT_ID") or None)
@@ -0,0 +1,71 @@
+"""
+외부 HTTP 호출용 공유 클라이언트
+소셜 로그인 검증(카카오/네이버/구글)처럼 같은 호스트를 반복 호출하는 경우
+커넥션 풀을 재사용해 매 요청마다 TCP/TLS 연결을 새로 맺지 않도록 합니다.
+외부 HTTP를 호출하는 로그인 엔드포인트는 모두 동기(def, 스레드풀 실행)라 비동기 클라이언트는 두지 않습니다.
+재시도 / 타임아웃 동작은 benchmark_http_client.py(로컬 스텁 서버)로 확인합니다.
+"""
+import os
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from metrics import span
+
+# (connect, read) 타임아웃(초) - 기존에는 타임아웃이 없어 외부 서버 지연 시 워커가 묶였음
+CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", "3.05"))
+READ_TIMEOUT = float(os.getenv("HTTP_READ_TIMEOUT", "10"))
+DEFAULT_TIMEOUT = (CONNECT_TIMEOUT, READ_TIMEOUT)
+
+# 호스트별 유지할 커넥션 수
+POOL_MAXSIZE = int(os.getenv("HTTP_POOL_MAXSIZE", "20"))
+# 연결 실패 / 502·503·504 응답에 대한 재시도 횟수 (GET 등 멱등 요청만)
+MAX_RETRIES = int(os.getenv("HTTP_MAX_RETRIES", "2"))
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def _build_retry():
+    return Retry(
+        total=MAX_RETRIES,
+        connect=MAX_RETRIES,
+        read=MAX_RETRIES,
+        status=MAX_RETRIES,
+        backoff_factor=0.2,
+        status_forcelist=(502, 503, 504),
+        allowed_methods=frozenset(["GET", "HEAD", "OPTIONS"]),
+        raise_on_status=False,
+    )
+
+
+def get_session():
+    """프로세스 전역 requests.Session (커넥션 풀 + 재시도)"""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=10, pool_maxsize=POOL_MAXSIZE, max_retries=_build_retry())
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                _session = session
+    return _session
+
+
+def get_json(url, headers=None, timeout=DEFAULT_TIMEOUT):
+    """공유 세션으로 GET 요청 후 JSON 반환"""
+    with span("http"):
+        response = get_session().get(url, headers=headers, timeout=timeout)
+        return response.json()
+
+
+def close_session():
+    """앱 종료 시 공유 세션 커넥션 정리"""
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+            _session = None
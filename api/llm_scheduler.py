@@ -0,0 +1,284 @@
+"""
+LLM 호출 스케줄러 (Gemini 할당량을 요청 종류 / 사용자별로 나눠 씀)
+- 우선순위: interactive(/chat) > analysis(이력서 분석) > bulk(/submit, 채팅 답변 생성, 일괄 이력서 분석)
+- 같은 우선순위 안에서는 사용자(IP)별 라운드 로빈 → 한 사용자가 몰아서 요청해도 다른 사용자 요청이 사이사이 처리됨
+- 오래 기다린 요청은 aging초마다 한 단계씩 우선순위를 올려 bulk 요청도 계속 밀리지 않게 함
+- 동시 LLM 호출은 max_concurrent개까지, 나머지는 대기열에서 차례를 기다림
+- admit(): 사용자·우선순위별 토큰 버킷 → 초과 시 RateLimited,
+  대기열 길이 × 평균 LLM 처리 시간(EWMA)으로 계산한 예상 대기 시간이 우선순위별 한도를 넘으면 SchedulerBusy
+- 호출마다의 우선순위 / 사용자는 llm_request() 컨텍스트로 전달 (엔드포인트 의존성에서 설정, 작업 스레드로도 복사됨)
+"""
+import contextvars
+import threading
+import time
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+
+from metrics import observe, increment, set_gauge, describe
+
+PRIORITIES = ("interactive", "analysis", "bulk")
+WAIT_METRIC = "moodfolio_llm_queue_wait_seconds"
+DEPTH_METRIC = "moodfolio_llm_queue_depth"
+REJECTED_METRIC = "moodfolio_llm_rejected_total"
+describe(WAIT_METRIC, "Time LLM calls spent waiting for a scheduler slot by priority")
+describe(DEPTH_METRIC, "LLM calls waiting for a scheduler slot by priority")
+describe(REJECTED_METRIC, "Requests rejected before calling the LLM by priority and reason (rate_limit / overload / timeout)")
+
+# 버킷이 이보다 많아지면 가득 찬(한동안 요청 없는) 버킷을 정리
+MAX_BUCKETS = 10000
+
+_current = contextvars.ContextVar("llm_request", default=("analysis", "anonymous"))
+
+
+class RateLimited(Exception):
+    def __init__(self, retry_after):
+        super().__init__(f"rate limited, retry after {retry_after:.1f}s")
+        self.retry_after = retry_after
+
+
+class SchedulerBusy(Exception):
+    def __init__(self, retry_after):
+        super().__init__(f"LLM queue is full, retry after {retry_after:.1f}s")
+        self.retry_after = retry_after
+
+
+def parse_class_config(text):
+    """'interactive=30/60,bulk=5' → {"interactive": "30/60", "bulk": "5"} (알 수 없는 우선순위는 무시)"""
+    config = {}
+    for item in (text or "").split(","):
+        name, _, value = item.partition("=")
+        if name.strip() in PRIORITIES and value.strip():
+            config[name.strip()] = value.strip()
+    return config
+
+
+def set_llm_request(priority, client):
+    """현재 요청의 LLM 호출 우선순위 / 사용자 설정 (되돌리지 않음 - 요청 단위 컨텍스트에서 사용)"""
+    _current.set((priority, client))
+
+
+@contextmanager
+def llm_request(priority, client):
+    token = _current.set((priority, client))
+    try:
+        yield
+    finally:
+        _current.reset(token)
+
+
+def current_request():
+    """(우선순위, 사용자)"""
+    return _current.get()
+
+
+class TokenBucket:
+    __slots__ = ("capacity", "rate", "tokens", "updated")
+
+    def __init__(self, capacity, rate, now):
+        self.capacity = capacity
+        self.rate = rate
+        self.tokens = capacity
+        self.updated = now
+
+    def refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def take(self, now):
+        """토큰 하나 사용 → 0 또는 다음 토큰까지 남은 초"""
+        self.refill(now)
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+
+class _Ticket:
+    __slots__ = ("priority", "client", "enqueued", "granted")
+
+    def __init__(self, priority, client, enqueued):
+        self.priority = priority
+        self.client = client
+        self.enqueued = enqueued
+        self.granted = False
+
+
+class LLMScheduler:
+    def __init__(self, max_concurrent=8, rate_limits=None, max_wait=None, aging=15.0, queue_timeout=120.0,
+                 service_estimate=3.0, policy="fair", clock=time.monotonic):
+        """
+        rate_limits: {우선순위: "요청 수/초"} (예: "30/60" = 분당 30회, 한 번에 30회까지 몰아서 가능)
+        max_wait: {우선순위: 예상 대기 시간 한도(초)}
+        policy: fair (우선순위 + 사용자별 라운드 로빈) / fifo (도착 순서, 비교용)
+        """
+        self.max_concurrent = max(1, max_concurrent)
+        self.rate_limits = {}
+        for priority, limit in (rate_limits or {}).items():
+            count, _, seconds = str(limit).partition("/")
+            self.rate_limits[priority] = (float(count), float(count) / float(seconds or 1))
+        self.max_wait = {priority: float(value) for priority, value in (max_wait or {}).items()}
+        self.aging = aging
+        self.queue_timeout = queue_timeout
+        self.policy = policy
+        self.clock = clock
+        # 최근 LLM 호출 시간의 지수 이동 평균 (예상 대기 시간 계산용)
+        self.service_time = service_estimate
+        self._cond = threading.Condition()
+        self._running = 0
+        self._queues = {priority: OrderedDict() for priority in PRIORITIES}  # 사용자 → deque[_Ticket]
+        self._fifo = deque()
+        self._depth = dict.fromkeys(PRIORITIES, 0)
+        self._buckets = {}  # (우선순위, 사용자) → TokenBucket
+        self._buckets_lock = threading.Lock()
+
+    # --- 요청 제한 ---
+    def check_rate(self, priority, client):
+        limit = self.rate_limits.get(priority)
+        if not limit:
+            return
+        now = self.clock()
+        with self._buckets_lock:
+            bucket = self._buckets.get((priority, client))
+            if bucket is None:
+                if len(self._buckets) >= MAX_BUCKETS:
+                    self._prune_buckets(now)
+                bucket = self._buckets[(priority, client)] = TokenBucket(limit[0], limit[1], now)
+            retry_after = bucket.take(now)
+        if retry_after:
+            increment(REJECTED_METRIC, priority=priority, reason="rate_limit")
+            raise RateLimited(retry_after)
+
+    def _prune_buckets(self, now):
+        for key, bucket in list(self._buckets.items()):
+            bucket.refill(now)
+            if bucket.tokens >= bucket.capacity:
+                del self._buckets[key]
+
+    def estimated_wait(self, priority):
+        """지금 들어온 priority 요청이 슬롯을 얻기까지 예상 대기 시간 (초)"""
+        with self._cond:
+            if self.policy == "fifo":
+                ahead = len(self._fifo)
+            else:
+                ahead = sum(self._depth[p] for p in PRIORITIES[:PRIORITIES.index(priority) + 1])
+            slots_needed = ahead + self._running - self.max_concurrent + 1
+            return max(0, slots_needed) * self.service_time / self.max_concurrent
+
+    def admit(self, priority, client, shed=True):
+        """요청 시작 전 확인 - RateLimited / SchedulerBusy (shed=False면 요청 제한만 확인, 과부하 대응은 엔드포인트 몫)"""
+        self.check_rate(priority, client)
+        limit = self.max_wait.get(priority)
+        if shed and limit is not None:
+            wait = self.estimated_wait(priority)
+            if wait > limit:
+                increment(REJECTED_METRIC, priority=priority, reason="overload")
+                raise SchedulerBusy(wait)
+
+    # --- 슬롯 ---
+    def acquire(self, priority=None, client=None):
+        """
+        슬롯을 얻고 반납 함수 반환 (여러 번 호출해도 한 번만 반납)
+        호출이 다른 스레드에서 끝나는 경우(제한 시간 초과 후에도 계속 실행되는 LLM 호출) 그 완료 콜백에서 반납
+        """
+        current_priority, current_client = current_request()
+        priority = priority or current_priority
+        self._acquire(priority if priority in PRIORITIES else "analysis", client or current_client)
+        started = self.clock()
+        released = threading.Event()
+        lock = threading.Lock()
+
+        def release():
+            with lock:
+                if released.is_set():
+                    return
+                released.set()
+            self._release(self.clock() - started)
+        return release
+
+    @contextmanager
+    def slot(self, priority=None, client=None):
+        """with scheduler.slot(): llm.invoke(...) - 우선순위 / 사용자를 생략하면 llm_request() 컨텍스트 값"""
+        release = self.acquire(priority, client)
+        try:
+            yield
+        finally:
+            release()
+
+    def _acquire(self, priority, client):
+        now = self.clock()
+        with self._cond:
+            if self._running < self.max_concurrent and not self._fifo and not any(self._depth.values()):
+                self._running += 1
+                observe(WAIT_METRIC, 0.0, priority=priority)
+                return
+            ticket = _Ticket(priority, client, now)
+            if self.policy == "fifo":
+                self._fifo.append(ticket)
+            else:
+                self._queues[priority].setdefault(client, deque()).append(ticket)
+            self._set_depth(priority, 1)
+            deadline = now + self.queue_timeout
+            while not ticket.granted:
+                remaining = deadline - self.clock()
+                if remaining <= 0:
+                    self._cancel(ticket)
+                    increment(REJECTED_METRIC, priority=priority, reason="timeout")
+                    raise SchedulerBusy(self.service_time)
+                self._cond.wait(remaining)
+        observe(WAIT_METRIC, self.clock() - ticket.enqueued, priority=priority)
+
+    def _release(self, elapsed):
+        with self._cond:
+            self.service_time = 0.8 * self.service_time + 0.2 * elapsed
+            self._running -= 1
+            self._dispatch()
+
+    def _set_depth(self, priority, delta):
+        self._depth[priority] += delta
+        set_gauge(DEPTH_METRIC, self._depth[priority], priority=priority)
+
+    def _cancel(self, ticket):
+        if self.policy == "fifo":
+            self._fifo.remove(ticket)
+        else:
+            queue = self._queues[ticket.priority]
+            queue[ticket.client].remove(ticket)
+            if not queue[ticket.client]:
+                del queue[ticket.client]
+        self._set_depth(ticket.priority, -1)
+
+    def _next_ticket(self):
+        if self.policy == "fifo":
+            return self._fifo.popleft() if self._fifo else None
+        now = self.clock()
+        best = None
+        for rank, priority in enumerate(PRIORITIES):
+            queue = self._queues[priority]
+            if not queue:
+                continue
+            oldest = min(tickets[0].enqueued for tickets in queue.values())
+            effective = rank - (now - oldest) / self.aging if self.aging else rank
+            if best is None or effective < best[0]:
+                best = (effective, priority)
+        if best is None:
+            return None
+        # 라운드 로빈: 맨 앞 사용자의 요청 하나를 꺼내고 남은 요청이 있으면 맨 뒤로
+        queue = self._queues[best[1]]
+        client, tickets = queue.popitem(last=False)
+        ticket = tickets.popleft()
+        if tickets:
+            queue[client] = tickets
+        return ticket
+
+    def _dispatch(self):
+        granted = False
+        while self._running < self.max_concurrent:
+            ticket = self._next_ticket()
+            if ticket is None:
+                break
+            ticket.granted = True
+            self._running += 1
+            self._set_depth(ticket.priority, -1)
+            granted = True
+        if granted:
+            self._cond.notify_all()
@@ -0,0 +1,238 @@
+"""
+요청 지연 시간 계측 / 로깅
+- MetricsMiddleware: 라우트별 요청 지연 시간 히스토그램
+- span("llm") 등: 요청 내부 구간(DB 쿼리, Supabase, LLM, PDF 파싱, bcrypt) 시간 측정
+- increment("...", result="hit"): 단순 카운터 (예: 챗봇 로컬 라우터 적중률)
+- set_gauge("...", 3, priority="bulk"): 현재 값 (예: LLM 대기열 길이)
+- render_prometheus(): /api/metrics 에서 Prometheus 텍스트 형식으로 노출
+- REQUEST_LOG_JSON=1 이면 요청마다 구조화된 JSON 로그 한 줄 출력
+- submit(executor, fn, ...): 요청 컨텍스트(span, LLM 우선순위, 프로파일링 대상 여부)를 작업 스레드로 전달
+- logger: LOG_LEVEL(기본 INFO) 이하 로그는 포맷팅 없이 버려짐 (반복문 안에서는 logger.debug 사용)
+"""
+import bisect
+import contextvars
+import functools
+import inspect
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+REQUEST_LOG_JSON = os.getenv("REQUEST_LOG_JSON", "").lower() in ("1", "true", "yes", "on")
+
+logger = logging.getLogger("moodfolio")
+if not logger.handlers:
+    _handler = logging.StreamHandler(sys.stdout)
+    _handler.setFormatter(logging.Formatter("%(message)s"))
+    logger.addHandler(_handler)
+    logger.propagate = False
+logger.setLevel(getattr(logging, LOG_LEVEL, logging.INFO))
+
+# 히스토그램 버킷 (초)
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+REQUEST_METRIC = "moodfolio_request_duration_seconds"
+SPAN_METRIC = "moodfolio_span_duration_seconds"
+_HELP = {
+    REQUEST_METRIC: "HTTP request latency by route",
+    SPAN_METRIC: "Latency of instrumented sections (db, supabase, llm, pdf, bcrypt, ...)",
+}
+
+
+def describe(metric, help_text):
+    """카운터 등 다른 모듈에서 추가하는 메트릭의 HELP 문구 등록"""
+    _HELP[metric] = help_text
+
+
+class Histogram:
+    def __init__(self, buckets=BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # 마지막 칸 = +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+_histograms = {}  # (metric, labels) → Histogram
+_counters = {}  # (metric, labels) → int
+_gauges = {}  # (metric, labels) → float
+_lock = threading.Lock()
+# 현재 요청에서 기록된 span 목록 (JSON 로그용)
+_request_spans = contextvars.ContextVar("request_spans", default=None)
+# 프로파일링 중인 요청의 프로파일 ID / 그 요청의 작업을 실행 중인 executor 스레드 (스레드 id → 프로파일 ID)
+profile_id = contextvars.ContextVar("profile_id", default=None)
+profiled_threads = {}
+
+
+def observe(metric, seconds, **labels):
+    key = (metric, tuple(sorted(labels.items())))
+    with _lock:
+        histogram = _histograms.get(key)
+        if histogram is None:
+            histogram = _histograms[key] = Histogram()
+        histogram.observe(seconds)
+
+
+def increment(metric, amount=1, **labels):
+    key = (metric, tuple(sorted(labels.items())))
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + amount
+
+
+def set_gauge(metric, value, **labels):
+    key = (metric, tuple(sorted(labels.items())))
+    with _lock:
+        _gauges[key] = value
+
+
+def record_span(name, seconds):
+    """이미 측정한 구간 시간을 기록"""
+    observe(SPAN_METRIC, seconds, span=name)
+    spans = _request_spans.get()
+    if spans is not None:
+        spans.append((name, seconds))
+
+
+def _run_tagged(fn, *args, **kwargs):
+    current = profile_id.get()
+    if current is None:
+        return fn(*args, **kwargs)
+    thread_id = threading.get_ident()
+    profiled_threads[thread_id] = current
+    try:
+        return fn(*args, **kwargs)
+    finally:
+        profiled_threads.pop(thread_id, None)
+
+
+def submit(executor, fn, *args, **kwargs):
+    """executor.submit - 현재 요청 컨텍스트를 복사해 실행 (프로파일링 중이면 작업 스레드도 샘플링 대상)"""
+    return executor.submit(contextvars.copy_context().run, _run_tagged, fn, *args, **kwargs)
+
+
+@contextmanager
+def span(name):
+    """with span("llm"): ... 구간 시간 측정"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_span(name, time.perf_counter() - started)
+
+
+def timed(name):
+    """함수 전체를 span으로 측정하는 데코레이터 (동기/비동기 모두 지원)"""
+    def decorator(func):
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with span(name):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels, extra=None):
+    items = list(labels) + ([extra] if extra else [])
+    if not items:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in items) + "}"
+
+
+def render_prometheus():
+    """Prometheus 텍스트 노출 형식 (0.0.4)"""
+    with _lock:
+        snapshot = [(metric, labels, list(h.counts), h.sum, h.count) for (metric, labels), h in _histograms.items()]
+        counters = sorted(_counters.items())
+        gauges = sorted(_gauges.items())
+    lines = []
+    for metric in sorted({item[0] for item in snapshot}):
+        lines.append(f"# HELP {metric} {_HELP.get(metric, metric)}")
+        lines.append(f"# TYPE {metric} histogram")
+        for _, labels, counts, total, count in sorted(item for item in snapshot if item[0] == metric):
+            cumulative = 0
+            for bound, bucket_count in zip(BUCKETS + ("+Inf",), counts):
+                cumulative += bucket_count
+                lines.append(f"{metric}_bucket{_format_labels(labels, ('le', bound))} {cumulative}")
+            lines.append(f"{metric}_sum{_format_labels(labels)} {total}")
+            lines.append(f"{metric}_count{_format_labels(labels)} {count}")
+    for metric in sorted({metric for (metric, _), _ in counters}):
+        lines.append(f"# HELP {metric} {_HELP.get(metric, metric)}")
+        lines.append(f"# TYPE {metric} counter")
+        for (_, labels), value in (item for item in counters if item[0][0] == metric):
+            lines.append(f"{metric}{_format_labels(labels)} {value}")
+    for metric in sorted({metric for (metric, _), _ in gauges}):
+        lines.append(f"# HELP {metric} {_HELP.get(metric, metric)}")
+        lines.append(f"# TYPE {metric} gauge")
+        for (_, labels), value in (item for item in gauges if item[0][0] == metric):
+            lines.append(f"{metric}{_format_labels(labels)} {value}")
+    return "\n".join(lines) + "\n"
+
+
+def reset():
+    with _lock:
+        _histograms.clear()
+        _counters.clear()
+        _gauges.clear()
+
+
+class MetricsMiddleware:
+    """라우트(경로 템플릿)별 요청 지연 시간 기록 - 순수 ASGI 미들웨어"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        spans = []
+        token = _request_spans.set(spans)
+        status_code = 500
+        started = time.perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                checkout = sum(seconds for name, seconds in spans if name == "db_checkout")
+                if checkout:
+                    message.setdefault("headers", [])
+                    message["headers"] = list(message["headers"]) + [(b"server-timing", f"db-checkout;dur={checkout * 1000:.2f}".encode())]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            _request_spans.reset(token)
+            # 경로 파라미터가 들어간 실제 URL 대신 라우트 템플릿 사용 (라벨 수 제한)
+            route = getattr(scope.get("route"), "path", None) or "unmatched"
+            observe(REQUEST_METRIC, elapsed, method=scope["method"], route=route, status=status_code)
+            if REQUEST_LOG_JSON:
+                logger.info(json.dumps({
+                    "method": scope["method"],
+                    "route": route,
+                    "status": status_code,
+                    "duration_ms": round(elapsed * 1000, 2),
+                    "spans": [{"name": name, "ms": round(seconds * 1000, 2)} for name, seconds in spans],
+                }, ensure_ascii=False))
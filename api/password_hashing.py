@@ -0,0 +1,70 @@
+"""
+비밀번호 해싱 (bcrypt) 전용 워커 풀
+bcrypt는 의도적으로 느린 연산이므로 요청 스레드 대신 크기가 제한된 풀에서 실행하고,
+대기열이 가득 차면 즉시 거절(503)하여 로그인 폭주 시에도 다른 요청이 밀리지 않게 합니다.
+(bcrypt C 구현은 GIL을 해제하므로 스레드 풀로도 코어 수만큼 병렬 처리됩니다)
+"""
+import asyncio
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from passlib.context import CryptContext
+
+from metrics import span, submit
+
+# bcrypt cost (2^rounds 반복) - 올리면 안전하지만 느려짐, 기존 해시는 로그인 시 자동 업그레이드
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+# 동시에 해싱할 워커 수 (기본: CPU 코어 수, 최대 4)
+HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(min(4, os.cpu_count() or 1))))
+# 실행 중 + 대기 중 작업의 최대 개수 (초과 시 PasswordHashBusy)
+HASH_QUEUE_LIMIT = int(os.getenv("PASSWORD_HASH_QUEUE_LIMIT", "64"))
+
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=BCRYPT_ROUNDS)
+
+_executor = ThreadPoolExecutor(max_workers=HASH_WORKERS, thread_name_prefix="bcrypt")
+_slots = threading.BoundedSemaphore(HASH_QUEUE_LIMIT)
+
+
+class PasswordHashBusy(Exception):
+    """해싱 대기열이 가득 찬 경우 (잠시 후 재시도 필요)"""
+
+
+def _submit(fn, *args):
+    if not _slots.acquire(blocking=False):
+        raise PasswordHashBusy("password hashing queue is full")
+    try:
+        future = submit(_executor, fn, *args)
+    except Exception:
+        _slots.release()
+        raise
+    future.add_done_callback(lambda _: _slots.release())
+    return asyncio.wrap_future(future)
+
+
+def _verify_and_rehash(password, hashed):
+    """(일치 여부, 새 해시 또는 None) - cost가 바뀐 해시는 needs_update로 감지해 재해싱"""
+    try:
+        if not pwd_context.verify(password, hashed):
+            return False, None
+    except (ValueError, TypeError):
+        # 소셜 계정("SOCIAL_GOOGLE" 등)처럼 해시가 아닌 값
+        return False, None
+    if pwd_context.needs_update(hashed):
+        return True, pwd_context.hash(password)
+    return True, None
+
+
+async def hash_password(password):
+    """비밀번호 해시 생성"""
+    with span("bcrypt"):
+        return await _submit(pwd_context.hash, password)
+
+
+async def verify_password(password, hashed):
+    """
+    비밀번호 검증
+    반환값: (일치 여부, 업그레이드된 해시 또는 None)
+    """
+    with span("bcrypt"):
+        return await _submit(_verify_and_rehash, password, hashed)
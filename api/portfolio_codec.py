@@ -0,0 +1,122 @@
+"""
+포트폴리오 JSON 압축 코덱
+DB 텍스트 컬럼에 그대로 저장할 수 있도록 압축 결과를 base64로 감싸고 형식 헤더를 붙입니다.
+
+    ~mf1:z:<base64>          zlib
+    ~mf1:s:<base64>          zstd
+    ~mf1:d<dict_id>:<base64> zstd + 학습된 사전(dictionary)
+
+헤더가 없는 값은 기존(비압축) JSON으로 간주하므로 예전 행도 그대로 읽을 수 있습니다.
+사전을 교체할 때는 이전 사전 파일을 PORTFOLIO_ZSTD_OLD_DICTS에 남겨 두어야 예전 d<id> 행을 읽을 수 있습니다.
+"""
+import base64
+import os
+import zlib
+
+try:
+    import zstandard
+except ImportError:  # 선택 의존성 - 없으면 zlib 사용
+    zstandard = None
+
+PREFIX = "~mf1:"
+# 이보다 짧은 JSON은 압축하지 않음 (헤더/base64 오버헤드가 더 큼)
+MIN_COMPRESS_BYTES = int(os.getenv("PORTFOLIO_COMPRESS_MIN_BYTES", "512"))
+# PORTFOLIO_COMPRESSION=off 이면 쓰기 시 압축 비활성화 (읽기는 항상 지원)
+COMPRESSION_ENABLED = os.getenv("PORTFOLIO_COMPRESSION", "on").lower() not in ("0", "off", "false", "no")
+ZSTD_LEVEL = int(os.getenv("PORTFOLIO_ZSTD_LEVEL", "3"))
+ZLIB_LEVEL = 6
+# compress_portfolios.py --train-dict로 만든 사전 파일 경로
+DICT_PATH = os.getenv("PORTFOLIO_ZSTD_DICT", "")
+# 읽기 전용으로 함께 불러올 이전 사전 파일 경로 (쉼표 구분)
+OLD_DICT_PATHS = [path.strip() for path in os.getenv("PORTFOLIO_ZSTD_OLD_DICTS", "").split(",") if path.strip()]
+
+
+class CodecError(ValueError):
+    """압축 데이터를 해석할 수 없는 경우 (알 수 없는 형식 또는 사전 없음)"""
+
+
+def _load_dictionary(path):
+    if not (zstandard and path):
+        return None
+    if not os.path.exists(path):
+        print(f"⚠️ zstd dictionary not found: {path}")
+        return None
+    with open(path, "rb") as f:
+        return zstandard.ZstdCompressionDict(f.read())
+
+
+# dict_id → 사전 (이전 사전으로 압축된 행도 읽을 수 있도록 여러 개 등록)
+_dictionaries = {}
+
+
+def register_dictionary(dictionary):
+    """읽기용 사전 등록 (사전 교체 후 예전 행 읽기용)"""
+    if dictionary is not None:
+        _dictionaries[dictionary.dict_id()] = dictionary
+    return dictionary
+
+
+for _path in OLD_DICT_PATHS:
+    register_dictionary(_load_dictionary(_path))
+# 새로 쓰는 행은 현재 사전으로만 압축
+_dictionary = register_dictionary(_load_dictionary(DICT_PATH))
+
+
+def is_compressed(text):
+    return isinstance(text, str) and text.startswith(PREFIX)
+
+
+def compress_bytes(raw):
+    """bytes → (형식 코드, 압축 bytes)"""
+    if zstandard:
+        if _dictionary:
+            compressor = zstandard.ZstdCompressor(level=ZSTD_LEVEL, dict_data=_dictionary)
+            return f"d{_dictionary.dict_id()}", compressor.compress(raw)
+        return "s", zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(raw)
+    return "z", zlib.compress(raw, ZLIB_LEVEL)
+
+
+def decompress_bytes(kind, payload):
+    if kind == "z":
+        return zlib.decompress(payload)
+    if kind == "s" or kind.startswith("d"):
+        if not zstandard:
+            raise CodecError("zstandard is required to read this portfolio")
+        if kind == "s":
+            return zstandard.ZstdDecompressor().decompress(payload)
+        dictionary = _dictionaries.get(int(kind[1:]))
+        if dictionary is None:
+            raise CodecError(f"zstd dictionary {kind[1:]} is not loaded")
+        return zstandard.ZstdDecompressor(dict_data=dictionary).decompress(payload)
+    raise CodecError(f"unknown portfolio codec: {kind}")
+
+
+def encode_text(json_text, force=False):
+    """
+    JSON 문자열 → 저장용 문자열
+    압축이 꺼져 있거나, 짧거나, 압축해도 작아지지 않으면 원문 그대로 반환합니다.
+    """
+    if not (COMPRESSION_ENABLED or force) or is_compressed(json_text):
+        return json_text
+    raw = json_text.encode("utf-8")
+    if len(raw) < MIN_COMPRESS_BYTES:
+        return json_text
+    kind, payload = compress_bytes(raw)
+    encoded = f"{PREFIX}{kind}:{base64.b64encode(payload).decode('ascii')}"
+    return encoded if len(encoded) < len(json_text) else json_text
+
+
+def decode_text(stored):
+    """저장된 문자열 → JSON 문자열 (헤더가 없으면 그대로 반환)"""
+    if not is_compressed(stored):
+        return stored
+    kind, _, payload = stored[len(PREFIX):].partition(":")
+    return decompress_bytes(kind, base64.b64decode(payload)).decode("utf-8")
+
+
+def train_dictionary(samples, dict_size=64 * 1024):
+    """샘플 JSON 문자열들로 zstd 사전 학습 (bytes 반환)"""
+    if not zstandard:
+        raise CodecError("zstandard is required to train a dictionary")
+    dictionary = zstandard.train_dictionary(dict_size, [sample.encode("utf-8") for sample in samples])
+    return dictionary.as_bytes()
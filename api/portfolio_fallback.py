@@ -0,0 +1,124 @@
+"""
+/submit LLM 없이 포트폴리오 JSON 생성 (같은 입력이면 항상 같은 결과, 수 ms)
+Gemini 장애 / 과부하 시 대체 응답으로 사용하며 출력 형식은 portfolio_prompt와 같습니다.
+    {"theme": {...}, "hero": {...}, "about": {...}, "projects": [...], "contact": {...}}
+
+- theme: 첫 번째 무드 → MOOD_THEMES (components/templates/moodColorMap.js 의 glowColor, 없으면 #신뢰감있는)
+- hero / about: 직무 · 강점(lib/jobData.js JOB_SPECS) + 경력 요약 / 자기소개로 문장 조립
+- projects: project{i}_* / design_project{i}_* 답변 (최대 6개), 태그는 설명에서 기술 사전 매칭
+"""
+import re
+
+from resume_preparser import URL_RE, match_skills
+
+# 무드 → (테마 색상, 이모지, 폰트) - 색상은 moodColorMap.js glowColor와 동일하게 유지
+MOOD_THEMES = {
+    "#차분한": ("#64748b", "🌿", "sans"),
+    "#열정적인": ("#dc2626", "🔥", "sans"),
+    "#신뢰감있는": ("#2563eb", "🤝", "sans"),
+    "#힙한(Hip)": ("#9333ea", "😎", "sans"),
+    "#창의적인": ("#f59e0b", "💡", "sans"),
+    "#미니멀한": ("#9ca3af", "▫️", "sans"),
+    "#클래식한": ("#b45309", "📜", "serif"),
+}
+DEFAULT_MOOD = "#신뢰감있는"
+
+# lib/jobData.js JOB_SPECS 의 직무 / 강점 문구
+JOB_LABELS = {"developer": "개발자", "designer": "디자이너", "marketer": "마케터", "service": "기획자"}
+STRENGTHS = {
+    "tech": ("기술 탐구", "코드 깊이와 기술적 챌린지"),
+    "impl": ("서비스 구현", "완성된 프로덕트와 스택 시각화"),
+    "problem": ("문제 해결", "논리적인 해결 과정 기술"),
+    "visual": ("비주얼 임팩트", "압도적인 그래픽과 심미성"),
+    "brand": ("브랜드 스토리", "브랜드 철학과 컨셉 에디토리얼"),
+    "ux": ("UX 논리", "사용자 경험 설계의 논리적 흐름"),
+    "data": ("데이터 성과", "수치와 KPI 달성률 시각화"),
+    "creative": ("크리에이티브", "트렌디한 콘텐츠와 캠페인 소재"),
+    "strategy": ("전략 인사이트", "시장 분석과 전략 수립 제안서"),
+    "revenue": ("매출 견인", "비즈니스 목표 달성 스토리"),
+    "ops": ("운영 효율화", "체계적인 프로세스 관리 능력"),
+    "comm": ("소통 협업", "협업 툴 활용과 커뮤니케이션"),
+}
+MAX_PROJECTS = 6
+SUMMARY_CHARS = 80
+
+
+def normalize_job(job):
+    """직무 id 또는 한글 직무명 → developer / designer / marketer / service (lib/jobData.js normalizeJob)"""
+    job = str(job or "")
+    if job in JOB_LABELS:
+        return job
+    if "개발" in job:
+        return "developer"
+    if "디자인" in job:
+        return "designer"
+    if "기획" in job or "마케팅" in job:
+        return "marketer"
+    if "비즈니스" in job or "서비스" in job:
+        return "service"
+    return "developer"
+
+
+def _moods(value):
+    if isinstance(value, str):
+        return [mood.strip() for mood in value.split(",") if mood.strip()]
+    return [str(mood) for mood in value or []]
+
+
+def _summary(text):
+    """첫 문장 (길면 SUMMARY_CHARS에서 자름)"""
+    text = re.sub(r"\s+", " ", str(text or "")).strip()
+    sentence = re.split(r"(?<=[.!?。])\s|\n", text, maxsplit=1)[0]
+    return sentence if len(sentence) <= SUMMARY_CHARS else sentence[:SUMMARY_CHARS].rstrip() + "…"
+
+
+def build_projects(answers, fallback_tags=()):
+    projects = []
+    for i in range(1, MAX_PROJECTS + 1):
+        prefix = f"project{i}_" if answers.get(f"project{i}_title") else f"design_project{i}_"
+        title = str(answers.get(prefix + "title") or "").strip()
+        if not title:
+            continue
+        desc = str(answers.get(prefix + "desc") or "").strip()
+        tags = match_skills(f"{title}\n{desc}")[:5] or list(fallback_tags)
+        project = {"title": title, "desc": _summary(desc) or title, "detail": desc, "tags": tags}
+        if answers.get(prefix + "link"):
+            project["link"] = answers[prefix + "link"]
+        projects.append(project)
+    return projects
+
+
+def _github(answers):
+    links = [answers.get("link")] + [answers.get(f"{p}{i}_link") for i in range(1, MAX_PROJECTS + 1) for p in ("project", "design_project")]
+    links = [str(link) for link in links if link and URL_RE.search(str(link))]
+    return next((link for link in links if "github.com" in link), links[0] if links else "")
+
+
+def generate_portfolio(answers):
+    """UserAnswers.answers → portfolio_prompt와 같은 형식의 dict"""
+    moods = _moods(answers.get("moods"))
+    color, emoji, font = MOOD_THEMES.get(moods[0] if moods else DEFAULT_MOOD, MOOD_THEMES[DEFAULT_MOOD])
+    job_label = JOB_LABELS[normalize_job(answers.get("job"))]
+    strength_label, strength_desc = STRENGTHS.get(answers.get("strength"), STRENGTHS["problem"])
+    name = str(answers.get("name") or "").strip()
+    career = str(answers.get("career_summary") or "").strip()
+    skills = [str(skill) for skill in answers.get("skills") or []] or match_skills(career)
+
+    intro = str(answers.get("intro") or "").strip() or f"{strength_label}에 강한 {job_label}입니다."
+    description = "\n".join(line for line in (
+        career,
+        f"강점: {strength_label} ({strength_desc})",
+        f"주요 기술: {', '.join(skills[:8])}" if skills else "",
+    ) if line)
+
+    return {
+        "theme": {"color": color, "font": font, "mood_emoji": emoji, "layout": "gallery_grid"},
+        "hero": {
+            "title": f"{name}의 포트폴리오" if name else f"{job_label} 포트폴리오",
+            "subtitle": f"{strength_label}에 강한 {job_label}" + (f" · {_summary(career)}" if career else ""),
+            "tags": [mood.lstrip("#") for mood in moods[:3]] + [strength_label],
+        },
+        "about": {"intro": intro, "description": description},
+        "projects": build_projects(answers, fallback_tags=skills[:3] or [strength_label]),
+        "contact": {"email": str(answers.get("email") or ""), "github": _github(answers)},
+    }
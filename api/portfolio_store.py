@@ -0,0 +1,318 @@
+"""
+포트폴리오 저장소 (정규화된 테이블)
+users.portfolio_data 한 컬럼에 전체 JSON을 통째로 저장하던 방식 대신,
+문서(portfolio_documents) 1행 + 최상위 섹션별(portfolio_sections) 행으로 나눠 저장합니다.
+저장 시에는 내용 해시가 바뀐 섹션만 기록하고, 문서 version을 1씩 올립니다.
+version은 낙관적 동시성 제어에 사용되며, JSON Patch(RFC 6902) 기반 부분 저장도 지원합니다.
+
+기존 users.portfolio_data 값은 그대로 읽을 수 있으며, 처음 저장할 때 새 테이블로 옮겨집니다.
+"""
+import hashlib
+import json
+from datetime import datetime
+
+import jsonpatch
+import jsonpointer
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, String, Text, UniqueConstraint
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm.exc import StaleDataError
+
+import fast_json
+from database import Base
+from portfolio_codec import encode_text, decode_text
+
+
+class PortfolioDocument(Base):
+    __tablename__ = "portfolio_documents"
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), unique=True, index=True, nullable=False)
+    version = Column(Integer, nullable=False, default=0)
+    # 섹션 키 순서 (JSON 배열) - 불러올 때 원래 순서대로 복원
+    section_order = Column(Text, nullable=False, default="[]")
+    updated_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    # UPDATE ... WHERE version = <읽은 값> 으로 동시 저장 충돌 감지 (값은 직접 증가)
+    __mapper_args__ = {"version_id_col": version, "version_id_generator": False}
+
+
+class PortfolioSection(Base):
+    __tablename__ = "portfolio_sections"
+    __table_args__ = (UniqueConstraint("document_id", "key", name="uq_portfolio_section_key"),)
+    id = Column(Integer, primary_key=True, index=True)
+    document_id = Column(Integer, ForeignKey("portfolio_documents.id", ondelete="CASCADE"), index=True, nullable=False)
+    key = Column(String, nullable=False)
+    data = Column(Text, nullable=False)
+    content_hash = Column(String(64), nullable=False)
+    # 이 섹션이 마지막으로 바뀐 문서 version
+    version = Column(Integer, nullable=False)
+
+
+class PortfolioVersionConflict(Exception):
+    """클라이언트가 기준으로 삼은 version이 최신이 아닌 경우 (다른 탭/기기에서 먼저 저장됨)"""
+
+    def __init__(self, current_version):
+        super().__init__(f"portfolio version conflict (current: {current_version})")
+        self.current_version = current_version
+
+
+class PortfolioPatchError(ValueError):
+    """JSON Patch 형식 오류 또는 적용 실패"""
+
+
+def serialize_section(value):
+    """섹션 값 → 저장용 문자열 (큰 섹션은 압축)"""
+    return encode_text(fast_json.dumps(value))
+
+
+def deserialize(stored):
+    """저장된 문자열(압축 또는 기존 JSON) → 파이썬 객체"""
+    return fast_json.loads(decode_text(stored))
+
+
+def section_hash(value):
+    """키 순서와 무관한 섹션 내용 해시"""
+    return hashlib.sha256(fast_json.dumps_canonical(value)).hexdigest()
+
+
+def document_hash(order, section_hashes):
+    """섹션 순서 + 섹션 해시({키: 해시})로 계산한 문서 전체 내용 해시 (섹션 데이터를 다시 직렬화하지 않음)"""
+    digest = hashlib.sha256()
+    for key in order:
+        if key in section_hashes:
+            digest.update(key.encode("utf-8"))
+            digest.update(section_hashes[key].encode("ascii"))
+    return digest.hexdigest()
+
+
+def _section_hashes(sections):
+    return {key: section.content_hash for key, section in sections.items()}
+
+
+def get_document(db, user_id):
+    return db.query(PortfolioDocument).filter(PortfolioDocument.user_id == user_id).first()
+
+
+def _load_sections(db, document):
+    sections = db.query(PortfolioSection).filter(PortfolioSection.document_id == document.id).all()
+    return {section.key: section for section in sections}
+
+
+def _ordered_keys(document, sections):
+    order = json.loads(document.section_order or "[]")
+    return order + [key for key in sections if key not in order]
+
+
+def _assemble(document, sections):
+    return {key: deserialize(sections[key].data) for key in _ordered_keys(document, sections) if key in sections}
+
+
+def has_portfolio(db, user):
+    """포트폴리오 존재 여부 (섹션을 읽지 않음)"""
+    return bool(user.portfolio_data) or get_document(db, user.id) is not None
+
+
+def load_portfolio(db, user):
+    """사용자 포트폴리오 전체를 dict로 반환 (없으면 None)"""
+    document = get_document(db, user.id)
+    if document is None:
+        # 아직 이전되지 않은 기존 데이터
+        return deserialize(user.portfolio_data) if user.portfolio_data else None
+    return _assemble(document, _load_sections(db, document))
+
+
+def load_portfolio_state(db, user):
+    """
+    포트폴리오 + version + 내용 해시 반환 (없으면 None)
+    version은 다음 저장/패치 요청의 base_version으로 사용합니다.
+    """
+    document = get_document(db, user.id)
+    if document is None:
+        if not user.portfolio_data:
+            return None
+        legacy = deserialize(user.portfolio_data)
+        hashes = {key: section_hash(value) for key, value in legacy.items()}
+        return {"portfolio_data": legacy, "version": 0, "content_hash": document_hash(list(legacy), hashes)}
+    sections = _load_sections(db, document)
+    order = _ordered_keys(document, sections)
+    return {
+        "portfolio_data": _assemble(document, sections),
+        "version": document.version,
+        "content_hash": document_hash(order, _section_hashes(sections)),
+    }
+
+
+def _check_version(document, base_version):
+    current = document.version if document is not None else 0
+    if base_version is not None and base_version != current:
+        raise PortfolioVersionConflict(current)
+
+
+def _open_document(db, user, base_version=None):
+    """
+    (문서, 섹션 dict, 기존 JSON 컬럼 데이터) 반환
+    base_version이 현재 version과 다르면 PortfolioVersionConflict.
+    문서가 없으면 새로 만들고, 기존 users.portfolio_data는 이전 대상으로 돌려줍니다.
+    """
+    document = get_document(db, user.id)
+    _check_version(document, base_version)
+    if document is not None:
+        return document, _load_sections(db, document), None
+    document = PortfolioDocument(user_id=user.id, version=0, section_order="[]")
+    db.add(document)
+    try:
+        db.flush()
+    except IntegrityError:
+        # 같은 사용자의 첫 저장이 동시에 들어와 다른 요청이 먼저 문서를 만든 경우
+        db.rollback()
+        raise PortfolioVersionConflict(current_version=None)
+    legacy = deserialize(user.portfolio_data) if user.portfolio_data else None
+    if legacy is not None:
+        user.portfolio_data = None
+    return document, {}, legacy
+
+
+def _write_sections(db, document, sections, updates, removals, new_order):
+    """
+    변경된 섹션만 기록하고 commit (변경이 없으면 rollback 후 쓰기 생략)
+    version 컬럼은 낙관적 잠금(version_id_col)으로 사용되므로
+    동시에 같은 version에서 저장하면 나중 요청은 StaleDataError → 충돌로 처리됩니다.
+    """
+    next_version = document.version + 1
+    changed, removed = [], []
+
+    for key, value in updates.items():
+        digest = section_hash(value)
+        section = sections.get(key)
+        if section is None:
+            section = PortfolioSection(
+                document_id=document.id, key=key, data=serialize_section(value),
+                content_hash=digest, version=next_version,
+            )
+            db.add(section)
+            sections[key] = section
+            changed.append(key)
+        elif section.content_hash != digest:
+            section.data = serialize_section(value)
+            section.content_hash = digest
+            section.version = next_version
+            changed.append(key)
+
+    for key in removals:
+        if key in sections:
+            db.delete(sections.pop(key))
+            removed.append(key)
+
+    order = json.loads(document.section_order or "[]")
+    if changed or removed or new_order != order:
+        document.version = next_version
+        document.section_order = json.dumps(new_order, ensure_ascii=False)
+        document.updated_at = datetime.utcnow()
+        try:
+            db.commit()
+        except (StaleDataError, IntegrityError):
+            db.rollback()
+            raise PortfolioVersionConflict(current_version=None)
+        version = next_version
+    else:
+        version = document.version
+        db.rollback()
+
+    return {
+        "version": version,
+        "content_hash": document_hash(new_order, _section_hashes(sections)),
+        "changed_sections": changed,
+        "removed_sections": removed,
+    }
+
+
+def save_portfolio_data(db, user, portfolio_data, merge=False, base_version=None):
+    """
+    포트폴리오 저장
+    - merge=False: 전달된 데이터가 전체 포트폴리오 (빠진 섹션은 삭제)
+    - merge=True : 전달된 최상위 섹션만 갱신하고 나머지는 유지
+    - base_version: 지정 시 현재 version과 다르면 PortfolioVersionConflict
+    내용이 바뀐 섹션만 기록하며, 변경이 없으면 DB에 쓰지 않습니다.
+    반환값: {"version", "content_hash", "changed_sections", "removed_sections"}
+    """
+    document, sections, legacy = _open_document(db, user, base_version)
+    if legacy is not None:
+        # 기존 JSON 컬럼 데이터를 새 테이블로 이전
+        if merge:
+            portfolio_data = {**legacy, **portfolio_data}
+        merge = False
+
+    order = _ordered_keys(document, sections)
+    if merge:
+        new_order = order + [key for key in portfolio_data if key not in order]
+        removals = []
+    else:
+        new_order = list(portfolio_data.keys())
+        removals = [key for key in sections if key not in portfolio_data]
+
+    return _write_sections(db, document, sections, portfolio_data, removals, new_order)
+
+
+PATCH_OPERATIONS = ("add", "remove", "replace", "move", "copy", "test")
+
+
+def _validate_patch(patch):
+    """연산 형식 검사 (op 종류, path / from 이 JSON Pointer 문자열인지) - 문서를 열기 전에 400으로 거름"""
+    if not isinstance(patch, list) or not all(isinstance(op, dict) for op in patch):
+        raise PortfolioPatchError("patch must be a list of operations")
+    for index, operation in enumerate(patch):
+        if operation.get("op") not in PATCH_OPERATIONS:
+            raise PortfolioPatchError(f"operation {index}: unknown op {operation.get('op')!r}")
+        for field in ("path", "from") if operation["op"] in ("move", "copy") else ("path",):
+            pointer = operation.get(field)
+            if not isinstance(pointer, str) or (pointer and not pointer.startswith("/")):
+                raise PortfolioPatchError(f"operation {index}: '{field}' must be a JSON Pointer string")
+
+
+def _touched_sections(patch):
+    """패치가 건드리는 최상위 섹션 키 집합 (루트 경로를 건드리면 None = 전체)"""
+    touched = set()
+    for operation in patch:
+        for field in ("path", "from"):
+            pointer = operation.get(field)
+            if pointer is None:
+                continue
+            parts = jsonpointer.JsonPointer(pointer).parts
+            if not parts:
+                return None
+            touched.add(parts[0])
+    return touched
+
+
+def apply_portfolio_patch(db, user, patch, base_version):
+    """
+    RFC 6902 JSON Patch를 base_version 기준으로 적용
+    패치가 건드린 최상위 섹션만 다시 해시/기록합니다.
+    """
+    _validate_patch(patch)
+
+    document, sections, legacy = _open_document(db, user, base_version)
+    if legacy is not None:
+        current = legacy
+    else:
+        current = _assemble(document, sections)
+    try:
+        touched = _touched_sections(patch)
+        patched = jsonpatch.apply_patch(current, patch)
+    except (jsonpatch.JsonPatchException, jsonpointer.JsonPointerException, KeyError, TypeError, AttributeError) as e:
+        raise PortfolioPatchError(str(e))
+    if not isinstance(patched, dict):
+        raise PortfolioPatchError("portfolio root must remain an object")
+
+    if legacy is not None:
+        # 기존 데이터 이전 시에는 모든 섹션을 기록
+        touched = None
+
+    if touched is None:
+        updates = patched
+        removals = [key for key in sections if key not in patched]
+    else:
+        updates = {key: patched[key] for key in touched if key in patched}
+        removals = [key for key in touched if key not in patched]
+
+    new_order = list(patched.keys())
+    return _write_sections(db, document, sections, updates, removals, new_order)
@@ -0,0 +1,190 @@
+"""
+요청 단위 프로파일링 (관리자 전용, opt-in)
+X-Profile: 1 헤더 또는 ?__profile=1 쿼리를 붙이고 관리자 Authorization으로 요청하면
+해당 요청을 샘플링 프로파일러로 측정합니다.
+
+- 별도 스레드가 PROFILE_SAMPLE_INTERVAL_MS 간격으로 sys._current_frames()를 읽어
+  엔드포인트 함수 프레임이 포함된 스택만 집계 (collapsed stack → flamegraph.pl / speedscope)
+- LLM / Supabase / 이력서 조각 분석처럼 executor 스레드에서 실행되는 작업은 metrics.submit()이
+  프로파일 ID를 전달하므로, 그 스레드의 스택도 "thread:<스레드 이름>" 아래에 함께 집계
+- 응답 헤더 X-Profile-Id 로 결과 ID 반환, GET /api/admin/profiles/{id} 로 조회
+- 동시에 프로파일링되는 요청 수는 PROFILE_MAX_CONCURRENT로 제한 (초과 시 그냥 실행)
+- 같은 엔드포인트로 동시에 들어온 다른 요청의 샘플이 섞일 수 있습니다.
+"""
+import os
+import sys
+import threading
+import time
+import uuid
+from collections import Counter, OrderedDict
+from urllib.parse import parse_qs
+
+from fastapi import HTTPException
+from starlette.concurrency import run_in_threadpool
+
+from admin_auth import verify_admin
+from metrics import logger, profile_id as current_profile_id, profiled_threads
+
+PROFILE_SAMPLE_INTERVAL_MS = float(os.getenv("PROFILE_SAMPLE_INTERVAL_MS", "5"))
+PROFILE_MAX_CONCURRENT = int(os.getenv("PROFILE_MAX_CONCURRENT", "2"))
+PROFILE_KEEP = int(os.getenv("PROFILE_KEEP", "20"))
+# 요청별 샘플링 간격 허용 범위 (ms)
+MIN_INTERVAL_MS, MAX_INTERVAL_MS = 1.0, 100.0
+
+_slots = threading.BoundedSemaphore(PROFILE_MAX_CONCURRENT)
+_profiles = OrderedDict()  # profile_id → 결과 (최근 PROFILE_KEEP개)
+_profiles_lock = threading.Lock()
+
+
+def _frame_label(code):
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class StackSampler(threading.Thread):
+    """target_code 프레임 아래의 스택 + profile_id로 표시된 executor 스레드의 스택을 주기적으로 수집"""
+
+    def __init__(self, get_target_code, interval, profile_id=None):
+        super().__init__(daemon=True)
+        self.get_target_code = get_target_code
+        self.profile_id = profile_id
+        self.interval = interval
+        self.stacks = Counter()
+        self.samples = 0
+        self._stop_event = threading.Event()
+
+    def run(self):
+        own_id = threading.get_ident()
+        while not self._stop_event.wait(self.interval):
+            target = self.get_target_code()
+            names = None
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                tagged = self.profile_id is not None and profiled_threads.get(thread_id) == self.profile_id
+                if target is None and not tagged:
+                    continue  # 아직 라우팅 전
+                stack = []
+                while frame is not None:
+                    stack.append(frame.f_code)
+                    if frame.f_code is target:
+                        break
+                    frame = frame.f_back
+                else:
+                    if not tagged:
+                        continue  # 엔드포인트와 무관한 스레드
+                    # 이 요청의 작업을 실행 중인 executor 스레드 - 스레드 시작부터 전체 스택
+                    if names is None:
+                        names = {thread.ident: thread.name for thread in threading.enumerate()}
+                    labels = [f"thread:{names.get(thread_id, thread_id)}"] + [_frame_label(code) for code in reversed(stack)]
+                    self.stacks[";".join(labels)] += 1
+                    self.samples += 1
+                    continue
+                self.stacks[";".join(_frame_label(code) for code in reversed(stack))] += 1
+                self.samples += 1
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+
+def _requested(scope):
+    """(프로파일링 요청 여부, 요청 샘플링 간격 ms)"""
+    headers = dict(scope.get("headers") or [])
+    query = parse_qs(scope.get("query_string", b"").decode("latin-1"))
+    flag = headers.get(b"x-profile", b"").decode("latin-1") or (query.get("__profile") or [""])[0]
+    if flag.lower() not in ("1", "true", "yes"):
+        return False, None
+    interval = headers.get(b"x-profile-interval-ms", b"").decode("latin-1") or (query.get("__profile_interval_ms") or [""])[0]
+    try:
+        interval_ms = min(max(float(interval), MIN_INTERVAL_MS), MAX_INTERVAL_MS)
+    except ValueError:
+        interval_ms = PROFILE_SAMPLE_INTERVAL_MS
+    return True, interval_ms
+
+
+def _is_admin(scope):
+    authorization = dict(scope.get("headers") or []).get(b"authorization")
+    try:
+        verify_admin(authorization.decode("latin-1") if authorization else None)
+        return True
+    except HTTPException:
+        return False
+
+
+def _store(profile):
+    with _profiles_lock:
+        _profiles[profile["id"]] = profile
+        while len(_profiles) > PROFILE_KEEP:
+            _profiles.popitem(last=False)
+
+
+def list_profiles():
+    """저장된 프로파일 요약 (최신순)"""
+    with _profiles_lock:
+        profiles = list(_profiles.values())
+    return [{k: v for k, v in p.items() if k != "stacks"} for p in reversed(profiles)]
+
+
+def get_profile(profile_id):
+    with _profiles_lock:
+        return _profiles.get(profile_id)
+
+
+def collapsed(profile):
+    """collapsed stack 텍스트 (한 줄에 '프레임;프레임;... 샘플수')"""
+    return "\n".join(f"{stack} {count}" for stack, count in profile["stacks"].most_common()) + "\n"
+
+
+class ProfilingMiddleware:
+    """관리자 요청에 X-Profile 플래그가 있으면 샘플링 프로파일러를 붙여 실행"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        requested, interval_ms = _requested(scope)
+        if not requested or not _is_admin(scope):
+            await self.app(scope, receive, send)
+            return
+        if not _slots.acquire(blocking=False):
+            logger.info("⏭️ Profiling skipped (PROFILE_MAX_CONCURRENT reached): %s", scope["path"])
+            await self.app(scope, receive, self._with_header(send, b"x-profile-skipped", b"busy"))
+            return
+
+        profile_id = uuid.uuid4().hex[:12]
+        sampler = StackSampler(lambda: getattr(scope.get("endpoint"), "__code__", None), interval_ms / 1000, profile_id)
+        started_at = time.time()
+        started = time.perf_counter()
+        sampler.start()
+        # 엔드포인트에서 metrics.submit()으로 넘긴 작업까지 이 프로파일에 포함
+        token = current_profile_id.set(profile_id)
+        try:
+            await self.app(scope, receive, self._with_header(send, b"x-profile-id", profile_id.encode()))
+        finally:
+            current_profile_id.reset(token)
+            # join()이 샘플링 간격만큼 걸릴 수 있으므로 이벤트 루프 밖에서 대기
+            await run_in_threadpool(sampler.stop)
+            _slots.release()
+            route = getattr(scope.get("route"), "path", scope["path"])
+            _store({
+                "id": profile_id,
+                "method": scope["method"],
+                "route": route,
+                "started_at": started_at,
+                "duration_ms": round((time.perf_counter() - started) * 1000, 2),
+                "interval_ms": interval_ms,
+                "samples": sampler.samples,
+                "stacks": sampler.stacks,
+            })
+            logger.info("🔬 Profiled %s %s → %s (%d samples)", scope["method"], route, profile_id, sampler.samples)
+
+    @staticmethod
+    def _with_header(send, name, value):
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", [])) + [(name, value)]
+            await send(message)
+        return send_wrapper
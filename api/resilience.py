@@ -0,0 +1,224 @@
+"""
+외부 호출(Gemini / Supabase) 보호
+- call_with_timeout: 호출마다 제한 시간 (넘으면 DeadlineExceeded, 원래 호출은 별도 스레드에서 끝날 때까지 둠)
+  업스트림(gemini / supabase ...)마다 스레드 풀을 따로 두어, 한쪽이 느려져 스레드를 붙잡아도 다른 쪽 호출에 영향 없음
+- retry_call: 일시적 오류만 지수 백오프 + full jitter로 재시도 (멱등 호출에만 사용), 전체 deadline 안에서만
+- hedged: 첫 시도가 hedge_after초 안에 끝나지 않으면 같은 호출을 하나 더 보내 먼저 성공한 결과 사용 (꼬리 지연 단축)
+- CircuitBreaker: 연속 실패가 쌓이면 open → reset_timeout 동안 호출 없이 바로 CircuitOpen (캐시/대체 응답으로 처리)
+  → 이후 한 번만 시험 호출(half-open)해 성공하면 closed
+"""
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, TimeoutError as FutureTimeout, wait
+
+from metrics import logger, increment, set_gauge, describe, submit
+
+CIRCUIT_STATE_METRIC = "moodfolio_circuit_state"
+CIRCUIT_REJECTED_METRIC = "moodfolio_circuit_rejected_total"
+RETRY_METRIC = "moodfolio_upstream_retries_total"
+HEDGE_METRIC = "moodfolio_hedged_requests_total"
+describe(CIRCUIT_STATE_METRIC, "Circuit breaker state by upstream (0 closed, 1 half-open, 2 open)")
+describe(CIRCUIT_REJECTED_METRIC, "Calls rejected without contacting the upstream because its circuit was open")
+describe(RETRY_METRIC, "Retried upstream calls by upstream")
+describe(HEDGE_METRIC, "Hedged second attempts by upstream and winner (first / hedge)")
+
+# 제한 시간 / hedge 호출을 실행하는 업스트림별 스레드 수 (제한 시간을 넘긴 호출은 끝날 때까지 스레드를 점유)
+# 기본 UPSTREAM_MAX_THREADS, 업스트림별로 <NAME>_MAX_THREADS (예: GEMINI_MAX_THREADS)
+UPSTREAM_MAX_THREADS = int(os.getenv("UPSTREAM_MAX_THREADS", "16"))
+_executors = {}
+_executors_lock = threading.Lock()
+
+TRANSIENT_STATUS = (408, 429, 500, 502, 503, 504)
+TRANSIENT_MARKERS = ("timeout", "timed out", "unavailable", "resource_exhausted", "overloaded", "connection", "429", "503", "504")
+
+
+class DeadlineExceeded(TimeoutError):
+    pass
+
+
+class CircuitOpen(Exception):
+    def __init__(self, name, retry_after):
+        super().__init__(f"{name} circuit open, retry after {retry_after:.1f}s")
+        self.name = name
+        self.retry_after = retry_after
+
+
+def executor_for(upstream):
+    """업스트림 전용 스레드 풀 (처음 사용할 때 생성)"""
+    executor = _executors.get(upstream)
+    if executor is None:
+        with _executors_lock:
+            executor = _executors.get(upstream)
+            if executor is None:
+                workers = int(os.getenv(f"{upstream.upper()}_MAX_THREADS", str(UPSTREAM_MAX_THREADS)))
+                executor = _executors[upstream] = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f"upstream-{upstream}")
+    return executor
+
+
+def _submit(upstream, fn, *args, **kwargs):
+    # 요청 컨텍스트(span 기록, LLM 우선순위 등)를 작업 스레드로 전달
+    return submit(executor_for(upstream), fn, *args, **kwargs)
+
+
+def call_with_timeout(fn, timeout, *args, upstream="upstream", on_done=None, **kwargs):
+    """
+    fn(*args, **kwargs) - timeout초(None/0이면 제한 없음)를 넘기면 DeadlineExceeded
+    upstream 전용 풀에서 실행하며, 제한 시간 안에 스레드를 얻지 못해 시작도 못 한 호출은 취소
+    on_done: fn이 실제로 끝났을 때(제한 시간 초과 후 포함) / 취소되었을 때 호출 (동시 호출 수 제한 슬롯 반납 등)
+    """
+    if not timeout:
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            if on_done:
+                on_done()
+    try:
+        future = _submit(upstream, fn, *args, **kwargs)
+    except Exception:
+        if on_done:
+            on_done()
+        raise
+    if on_done:
+        future.add_done_callback(lambda _: on_done())
+    try:
+        return future.result(timeout)
+    except FutureTimeout:
+        future.cancel()
+        raise DeadlineExceeded(f"{getattr(fn, '__name__', 'call')} exceeded {timeout}s") from None
+
+
+def is_transient(error):
+    """재시도해볼 만한 오류인지 (제한 시간 초과, 연결 오류, 429 / 5xx)"""
+    if isinstance(error, CircuitOpen):
+        return False
+    if isinstance(error, (TimeoutError, ConnectionError)):
+        return True
+    status = getattr(error, "code", None) or getattr(error, "status_code", None)
+    if isinstance(status, int):
+        return status in TRANSIENT_STATUS
+    message = str(error).lower()
+    return any(marker in message for marker in TRANSIENT_MARKERS)
+
+
+def retry_call(fn, attempts=3, base_delay=0.2, max_delay=2.0, deadline=None, retry_if=is_transient, name="upstream",
+               sleep=time.sleep, clock=time.monotonic):
+    """
+    fn() 재시도 - 시도 사이 random(0, min(max_delay, base_delay * 2^n))초 대기 (full jitter)
+    deadline: 첫 시도부터 전체 허용 시간(초), 다음 대기 후 시도할 시간이 없으면 마지막 오류를 그대로 발생
+    """
+    started = clock()
+    for attempt in range(attempts):
+        try:
+            return fn()
+        except Exception as e:
+            if attempt + 1 >= attempts or not retry_if(e):
+                raise
+            delay = random.uniform(0, min(max_delay, base_delay * 2 ** attempt))
+            if deadline is not None and clock() - started + delay >= deadline:
+                raise
+            logger.warning("🔁 %s 재시도 %d/%d (%.2fs 후): %s", name, attempt + 1, attempts - 1, delay, e)
+            increment(RETRY_METRIC, upstream=name)
+            sleep(delay)
+
+
+def hedged(fn, hedge_after, name="upstream"):
+    """
+    fn()을 실행하고 hedge_after초 안에 끝나지 않으면 한 번 더 실행 → 먼저 성공한 결과 반환
+    (둘 다 실패하면 마지막 오류, 첫 시도가 hedge 전에 실패하면 그 오류를 그대로 발생 - 재시도는 retry_call 몫)
+    fn 안에서 다시 call_with_timeout(upstream=name)을 쓸 수 있으므로, 같은 풀에서 기다리다 막히지 않도록 별도 풀에서 실행
+    """
+    pool = f"{name}_hedge"
+    first = _submit(pool, fn)
+    try:
+        return first.result(hedge_after)
+    except FutureTimeout:
+        pass
+    second = _submit(pool, fn)
+    pending, error = {first: "first", second: "hedge"}, None
+    while pending:
+        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            winner = pending.pop(future)
+            try:
+                result = future.result()
+            except Exception as e:
+                error = e
+                continue
+            increment(HEDGE_METRIC, upstream=name, winner=winner)
+            return result
+    raise error
+
+
+class CircuitBreaker:
+    CLOSED, HALF_OPEN, OPEN = 0, 1, 2
+
+    def __init__(self, name, failure_threshold=5, reset_timeout=30.0, ignore=(), clock=time.monotonic):
+        """
+        failure_threshold: 연속 실패 몇 번에 open 할지
+        ignore: 성공으로도 실패로도 세지 않을 예외 (요청 자체가 잘못된 경우, 호출 전 대기열에서 포기한 경우 등)
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.ignore = ignore
+        self.clock = clock
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+        set_gauge(CIRCUIT_STATE_METRIC, self.state, upstream=name)
+
+    def _set_state(self, state):
+        if state != self.state:
+            logger.warning("⚡ %s circuit: %s → %s", self.name, ("closed", "half-open", "open")[self.state], ("closed", "half-open", "open")[state])
+            self.state = state
+            set_gauge(CIRCUIT_STATE_METRIC, state, upstream=self.name)
+
+    def is_open(self):
+        with self._lock:
+            return self.state == self.OPEN and self.clock() - self.opened_at < self.reset_timeout
+
+    def _before_call(self):
+        with self._lock:
+            if self.state == self.CLOSED:
+                return
+            remaining = self.reset_timeout - (self.clock() - self.opened_at)
+            if self.state == self.OPEN and remaining <= 0:
+                self._set_state(self.HALF_OPEN)
+            # half-open에서는 시험 호출 하나만 통과
+            if self.state == self.HALF_OPEN and not self._probing:
+                self._probing = True
+                return
+        increment(CIRCUIT_REJECTED_METRIC, upstream=self.name)
+        raise CircuitOpen(self.name, max(remaining, 1.0))
+
+    def _on_success(self):
+        with self._lock:
+            self.failures = 0
+            self._probing = False
+            self._set_state(self.CLOSED)
+
+    def _on_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                self.opened_at = self.clock()
+                self._set_state(self.OPEN)
+            self._probing = False
+
+    def call(self, fn, *args, **kwargs):
+        self._before_call()
+        try:
+            result = fn(*args, **kwargs)
+        except Exception as e:
+            if isinstance(e, self.ignore):
+                with self._lock:
+                    self._probing = False
+            else:
+                self._on_failure()
+            raise
+        self._on_success()
+        return result
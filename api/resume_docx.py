@@ -0,0 +1,159 @@
+"""
+DOCX 이력서 추출 (한 번만 열어서 텍스트 + 이미지 처리)
+- 텍스트: 본문 문단과 표(셀)를 문서 순서대로 추출 (표는 행마다 ' | '로 셀 연결)
+- 이미지: 내용 해시로 중복 제거, 작은 아이콘 제외, 큰 이미지는 축소 후 JPEG 재압축
+  전체 크기가 DOCX_IMAGE_BUDGET_BYTES를 넘으면 이후 이미지는 제외 (응답 크기 / LLM 비전 토큰 절약)
+"""
+import base64
+import hashlib
+import io
+import os
+
+from metrics import logger, timed
+
+# 이보다 작은 이미지는 아이콘/장식으로 보고 제외
+MIN_IMAGE_BYTES = int(os.getenv("DOCX_MIN_IMAGE_BYTES", "2048"))
+MIN_IMAGE_SIDE = int(os.getenv("DOCX_MIN_IMAGE_SIDE", "64"))
+# 긴 변 기준 최대 픽셀 (넘으면 1/2씩 축소)
+MAX_IMAGE_SIDE = int(os.getenv("DOCX_MAX_IMAGE_SIDE", "1600"))
+JPEG_QUALITY = int(os.getenv("DOCX_JPEG_QUALITY", "80"))
+IMAGE_BUDGET_BYTES = int(os.getenv("DOCX_IMAGE_BUDGET_BYTES", str(3 * 1024 * 1024)))
+MAX_IMAGES = int(os.getenv("DOCX_MAX_IMAGES", "10"))
+# 디코딩 실패 시 원본을 그대로 보낼 수 있는 형식 (EMF/WMF 등은 LLM이 읽지 못하므로 제외)
+PASSTHROUGH_TYPES = ("image/png", "image/jpeg", "image/gif", "image/webp")
+
+_W_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+_A_NS = "{http://schemas.openxmlformats.org/drawingml/2006/main}"
+_R_EMBED = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}embed"
+
+
+def _cell_text(cell):
+    from docx.table import Table
+    from docx.text.paragraph import Paragraph
+
+    parts = []
+    for child in cell._tc.iterchildren():
+        if child.tag == _W_NS + "p":
+            text = Paragraph(child, cell).text.strip()
+            if text:
+                parts.append(text)
+        elif child.tag == _W_NS + "tbl":
+            parts.extend(_table_lines(Table(child, cell), separator=", "))
+    return " ".join(parts)
+
+
+def _table_lines(table, separator=" | "):
+    """표 → 행 단위 텍스트 (병합 셀은 한 번만, 셀 안의 중첩 표는 ', '로 연결)"""
+    lines = []
+    for row in table.rows:
+        seen, cells = set(), []
+        for cell in row.cells:
+            if id(cell._tc) in seen:
+                continue
+            seen.add(id(cell._tc))
+            text = _cell_text(cell)
+            if text:
+                cells.append(text)
+        if cells:
+            lines.append(separator.join(cells))
+    return lines
+
+
+def _body_text(document):
+    """본문 문단 + 표를 문서 순서대로"""
+    from docx.table import Table
+    from docx.text.paragraph import Paragraph
+
+    lines = []
+    for child in document.element.body.iterchildren():
+        if child.tag == _W_NS + "p":
+            text = Paragraph(child, document).text
+            if text.strip():
+                lines.append(text)
+        elif child.tag == _W_NS + "tbl":
+            lines.extend(_table_lines(Table(child, document)))
+    return lines
+
+
+def normalize_image(blob, content_type):
+    """
+    (bytes, content_type) 또는 None(제외) 반환
+    작은 아이콘은 제외하고, 긴 변이 MAX_IMAGE_SIDE를 넘으면 축소 후 JPEG로 재압축합니다.
+    """
+    if len(blob) < MIN_IMAGE_BYTES:
+        return None
+    try:
+        import fitz  # PyMuPDF
+
+        pix = fitz.Pixmap(blob)
+    except Exception:
+        return (blob, content_type) if content_type in PASSTHROUGH_TYPES else None
+
+    if min(pix.width, pix.height) < MIN_IMAGE_SIDE:
+        return None
+    shrink = 0
+    while max(pix.width, pix.height) >> shrink > MAX_IMAGE_SIDE:
+        shrink += 1
+    if shrink == 0 and content_type in ("image/jpeg", "image/png") and len(blob) <= IMAGE_BUDGET_BYTES // 4:
+        return blob, content_type  # 이미 충분히 작은 일반 형식은 그대로
+
+    if pix.colorspace is not None and pix.colorspace.n not in (1, 3):
+        pix = fitz.Pixmap(fitz.csRGB, pix)  # CMYK 등
+    if pix.alpha:
+        pix = fitz.Pixmap(pix, 0)
+    if shrink:
+        pix.shrink(shrink)
+    encoded = pix.tobytes("jpeg", jpg_quality=JPEG_QUALITY)
+    if len(encoded) >= len(blob) and content_type in PASSTHROUGH_TYPES and shrink == 0:
+        return blob, content_type
+    return encoded, "image/jpeg"
+
+
+def _image_parts(document):
+    """이미지 파트를 본문 등장 순서대로 (본문에서 참조되지 않은 이미지는 뒤에)"""
+    rels = document.part.rels
+    embedded = [blip.get(_R_EMBED) for blip in document.element.body.iter(_A_NS + "blip")]
+    for r_id in embedded + list(rels):
+        rel = rels.get(r_id)
+        if rel is not None and "image" in rel.reltype and not rel.is_external:
+            yield rel.target_part
+
+
+def _images(document):
+    """문서 이미지 → data URL 리스트 (중복/아이콘 제외, 크기 예산 적용)"""
+    images, seen = [], set()
+    used = 0
+    for part in _image_parts(document):
+        digest = hashlib.sha1(part.blob).digest()
+        if digest in seen:
+            continue
+        seen.add(digest)
+        try:
+            normalized = normalize_image(part.blob, part.content_type)
+        except Exception as e:
+            logger.warning("  ⚠️ 이미지 처리 실패: %s", e)
+            continue
+        if normalized is None:
+            logger.debug("  ⏭️ 작은 이미지 제외: %s, %d bytes", part.content_type, len(part.blob))
+            continue
+        data, content_type = normalized
+        if used + len(data) > IMAGE_BUDGET_BYTES or len(images) >= MAX_IMAGES:
+            logger.info("⚠️ DOCX 이미지 예산 초과 - 이후 이미지 제외")
+            break
+        used += len(data)
+        images.append(f"data:{content_type};base64,{base64.b64encode(data).decode('ascii')}")
+        logger.debug("  📷 이미지: %s %d → %d bytes", part.content_type, len(part.blob), len(data))
+    return images
+
+
+@timed("docx_parse")
+def extract_docx(file_bytes):
+    """DOCX → (텍스트, 이미지 data URL 리스트) - 파일은 한 번만 엽니다"""
+    import docx
+
+    document = docx.Document(io.BytesIO(file_bytes))
+    lines = _body_text(document)
+    text = "\n".join(lines).strip()
+    images = _images(document)
+    logger.info("✅ DOCX 파싱 성공: %d 줄, %d 글자, 이미지 %d개", len(lines), len(text), len(images))
+    return text, images
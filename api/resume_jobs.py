@@ -0,0 +1,334 @@
+"""
+이력서 일괄 처리 작업 큐 (SQLite 기반)
+업로드된 파일(또는 zip 안의 파일)을 resume_items 테이블에 넣고,
+파싱(parse) → 분석(analyze) 단계별로 별도의 워커 스레드가 정해진 동시성만큼 처리합니다.
+
+- 단계: queued → parsing → parsed → analyzing → done / failed
+- 진행 상태는 SQLite에 저장되므로, 프로세스가 재시작되면 처리 중이던 항목(parsing/analyzing)을
+  이전 단계로 되돌려 이어서 처리합니다. (RESUME_JOB_MAX_ATTEMPTS번 실패하면 failed)
+- 파싱/분석 함수는 main.py에서 주입합니다 (parse_fn(filename, bytes) → dict, analyze_fn(text, images) → dict).
+
+서버리스 환경에서는 응답 후 백그라운드 스레드가 멈출 수 있으므로, 상시 실행 서버에서 사용하는 것을 권장합니다.
+"""
+import io
+import os
+import sqlite3
+import threading
+import time
+import uuid
+import zipfile
+from contextlib import contextmanager
+
+import fast_json
+from metrics import logger
+
+IS_SERVERLESS = bool(os.environ.get("VERCEL") or os.environ.get("AWS_LAMBDA_FUNCTION_NAME"))
+RESUME_JOBS_DB = os.getenv("RESUME_JOBS_DB", "/tmp/resume_jobs.db" if IS_SERVERLESS else "resume_jobs.db")
+PARSE_WORKERS = int(os.getenv("RESUME_PARSE_WORKERS", "2"))
+ANALYZE_WORKERS = int(os.getenv("RESUME_ANALYZE_WORKERS", "2"))
+MAX_ATTEMPTS = int(os.getenv("RESUME_JOB_MAX_ATTEMPTS", "2"))
+RETENTION_HOURS = float(os.getenv("RESUME_JOB_RETENTION_HOURS", "24"))
+
+# 업로드 제한
+SUPPORTED_EXTENSIONS = (".pdf", ".docx", ".txt")
+MAX_BATCH_FILES = int(os.getenv("RESUME_BATCH_MAX_FILES", "500"))
+MAX_FILE_BYTES = int(os.getenv("RESUME_BATCH_MAX_FILE_BYTES", str(10 * 1024 * 1024)))
+MAX_BATCH_BYTES = int(os.getenv("RESUME_BATCH_MAX_BYTES", str(200 * 1024 * 1024)))
+
+FINISHED_STAGES = ("done", "failed")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS resume_batches (
+    id TEXT PRIMARY KEY,
+    analyze INTEGER NOT NULL,
+    total INTEGER NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS resume_items (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    batch_id TEXT NOT NULL REFERENCES resume_batches(id) ON DELETE CASCADE,
+    seq INTEGER NOT NULL,
+    filename TEXT NOT NULL,
+    content BLOB,
+    stage TEXT NOT NULL,
+    parsed TEXT,
+    result TEXT,
+    error TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_resume_items_stage ON resume_items(stage, id);
+CREATE INDEX IF NOT EXISTS idx_resume_items_batch ON resume_items(batch_id, seq);
+"""
+
+
+class BatchUploadError(ValueError):
+    """업로드 제한 초과 / 처리할 파일 없음"""
+
+
+def expand_uploads(uploads):
+    """
+    [(파일명, bytes)] → ([(파일명, bytes)], [건너뛴 파일 설명])
+    zip 파일은 풀어서 지원 형식(PDF/DOCX/TXT)만 포함합니다.
+    """
+    accepted, skipped = [], []
+    total_bytes = 0
+
+    def add(name, data):
+        nonlocal total_bytes
+        if not name.lower().endswith(SUPPORTED_EXTENSIONS):
+            skipped.append(f"{name}: 지원하지 않는 형식")
+            return
+        if len(data) > MAX_FILE_BYTES:
+            skipped.append(f"{name}: 파일이 너무 큽니다")
+            return
+        if len(accepted) >= MAX_BATCH_FILES:
+            raise BatchUploadError(f"한 번에 최대 {MAX_BATCH_FILES}개 파일까지 처리할 수 있습니다")
+        total_bytes += len(data)
+        if total_bytes > MAX_BATCH_BYTES:
+            raise BatchUploadError("업로드 전체 크기가 너무 큽니다")
+        accepted.append((name, data))
+
+    for filename, data in uploads:
+        if not filename.lower().endswith(".zip"):
+            add(filename, data)
+            continue
+        try:
+            archive = zipfile.ZipFile(io.BytesIO(data))
+        except zipfile.BadZipFile:
+            skipped.append(f"{filename}: 올바른 zip 파일이 아닙니다")
+            continue
+        with archive:
+            for info in archive.infolist():
+                base = os.path.basename(info.filename)
+                if info.is_dir() or not base or base.startswith(".") or info.filename.startswith("__MACOSX/"):
+                    continue
+                # 압축 해제 전에 선언된 크기로 먼저 확인 (zip bomb 방지)
+                if info.file_size > MAX_FILE_BYTES:
+                    skipped.append(f"{info.filename}: 파일이 너무 큽니다")
+                    continue
+                add(info.filename, archive.read(info))
+
+    if not accepted:
+        raise BatchUploadError("처리할 수 있는 이력서 파일이 없습니다 (PDF, DOCX, TXT 지원)")
+    return accepted, skipped
+
+
+class ResumeJobQueue:
+    def __init__(self, db_path, parse_fn, analyze_fn, parse_workers=PARSE_WORKERS, analyze_workers=ANALYZE_WORKERS):
+        self.db_path = db_path
+        self.parse_fn = parse_fn
+        self.analyze_fn = analyze_fn
+        self.parse_workers = parse_workers
+        self.analyze_workers = analyze_workers
+        self._claim_lock = threading.Lock()
+        self._wakeup = threading.Condition()
+        self._stopping = threading.Event()
+        self._threads = []
+        self._started = False
+        self._start_lock = threading.Lock()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=15)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA foreign_keys=ON")
+        return conn
+
+    @contextmanager
+    def _db(self):
+        """트랜잭션 단위 커넥션 (commit 후 닫음)"""
+        conn = self._connect()
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    # --- 시작 / 종료 ---
+
+    def start(self):
+        """스키마 생성, 중단된 항목 복구, 단계별 워커 시작 (여러 번 호출해도 한 번만 실행)"""
+        with self._start_lock:
+            if self._started:
+                return
+            with self._db() as conn:
+                conn.executescript(_SCHEMA)
+                # 재시작 전 처리 중이던 항목: 중단된 시도도 attempts에 포함되어 있음 (_claim에서 증가)
+                # → 한도에 도달한 항목(처리하다 프로세스를 죽이는 파일 등)은 failed, 나머지는 이전 단계로 되돌림
+                now = time.time()
+                crashed = conn.execute(
+                    "UPDATE resume_items SET stage = 'failed', error = ?, content = NULL, parsed = NULL, updated_at = ? "
+                    "WHERE stage IN ('parsing', 'analyzing') AND attempts >= ?",
+                    ("처리 중 서버가 중단되었습니다", now, MAX_ATTEMPTS),
+                ).rowcount
+                recovered = conn.execute("UPDATE resume_items SET stage = 'queued', updated_at = ? WHERE stage = 'parsing'", (now,)).rowcount
+                recovered += conn.execute("UPDATE resume_items SET stage = 'parsed', updated_at = ? WHERE stage = 'analyzing'", (now,)).rowcount
+            if recovered or crashed:
+                logger.info("🔁 Resume jobs: %d interrupted item(s) requeued, %d failed after %d attempts", recovered, crashed, MAX_ATTEMPTS)
+            self.purge_expired()
+            self._stopping.clear()
+            for stage, count in (("parse", self.parse_workers), ("analyze", self.analyze_workers)):
+                for n in range(count):
+                    thread = threading.Thread(target=self._worker, args=(stage,), name=f"resume-{stage}-{n}", daemon=True)
+                    thread.start()
+                    self._threads.append(thread)
+            self._started = True
+
+    def stop(self, timeout=5):
+        self._stopping.set()
+        with self._wakeup:
+            self._wakeup.notify_all()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+        self._started = False
+
+    def purge_expired(self):
+        cutoff = time.time() - RETENTION_HOURS * 3600
+        with self._db() as conn:
+            conn.execute("DELETE FROM resume_batches WHERE created_at < ?", (cutoff,))
+
+    # --- 등록 / 조회 ---
+
+    def enqueue(self, files, analyze=True):
+        """[(파일명, bytes)] 등록 → batch_id"""
+        self.start()
+        batch_id = uuid.uuid4().hex
+        now = time.time()
+        with self._db() as conn:
+            conn.execute("INSERT INTO resume_batches (id, analyze, total, created_at) VALUES (?, ?, ?, ?)", (batch_id, int(analyze), len(files), now))
+            conn.executemany(
+                "INSERT INTO resume_items (batch_id, seq, filename, content, stage, updated_at) VALUES (?, ?, ?, ?, 'queued', ?)",
+                [(batch_id, seq, name, data, now) for seq, (name, data) in enumerate(files)],
+            )
+        with self._wakeup:
+            self._wakeup.notify_all()
+        return batch_id
+
+    @staticmethod
+    def _item_view(row, include_result):
+        item = {"seq": row["seq"], "filename": row["filename"], "stage": row["stage"], "attempts": row["attempts"]}
+        if row["error"]:
+            item["error"] = row["error"]
+        if include_result and row["result"]:
+            item["result"] = fast_json.loads(row["result"])
+        return item
+
+    def get_batch(self, batch_id, include_results=False):
+        """배치 진행 상황 (없으면 None)"""
+        with self._db() as conn:
+            batch = conn.execute("SELECT * FROM resume_batches WHERE id = ?", (batch_id,)).fetchone()
+            if batch is None:
+                return None
+            columns = "seq, filename, stage, attempts, error" + (", result" if include_results else ", NULL AS result")
+            rows = conn.execute(f"SELECT {columns} FROM resume_items WHERE batch_id = ? ORDER BY seq", (batch_id,)).fetchall()
+        counts = {}
+        for row in rows:
+            counts[row["stage"]] = counts.get(row["stage"], 0) + 1
+        finished = sum(counts.get(stage, 0) for stage in FINISHED_STAGES)
+        return {
+            "batch_id": batch_id,
+            "analyze": bool(batch["analyze"]),
+            "total": batch["total"],
+            "finished": finished,
+            "complete": finished == batch["total"],
+            "counts": counts,
+            "items": [self._item_view(row, include_results) for row in rows],
+        }
+
+    def finished_items(self, batch_id, exclude_seqs):
+        """완료(done/failed)된 항목 중 아직 보내지 않은 것 (NDJSON 스트리밍용, 배치가 없으면 None)"""
+        with self._db() as conn:
+            if conn.execute("SELECT 1 FROM resume_batches WHERE id = ?", (batch_id,)).fetchone() is None:
+                return None
+            rows = conn.execute(
+                "SELECT seq, filename, stage, attempts, error, result FROM resume_items "
+                "WHERE batch_id = ? AND stage IN ('done', 'failed') ORDER BY seq",
+                (batch_id,),
+            ).fetchall()
+        return [self._item_view(row, True) for row in rows if row["seq"] not in exclude_seqs]
+
+    # --- 워커 ---
+
+    def _claim(self, from_stage, to_stage):
+        with self._claim_lock, self._db() as conn:
+            row = conn.execute(
+                "SELECT i.*, b.analyze FROM resume_items i JOIN resume_batches b ON b.id = i.batch_id "
+                "WHERE i.stage = ? ORDER BY i.id LIMIT 1",
+                (from_stage,),
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute(
+                "UPDATE resume_items SET stage = ?, attempts = attempts + 1, updated_at = ? WHERE id = ?",
+                (to_stage, time.time(), row["id"]),
+            )
+            return row
+
+    def _update(self, item_id, **fields):
+        fields["updated_at"] = time.time()
+        assignments = ", ".join(f"{key} = ?" for key in fields)
+        with self._db() as conn:
+            conn.execute(f"UPDATE resume_items SET {assignments} WHERE id = ?", (*fields.values(), item_id))
+
+    def _fail_or_retry(self, row, retry_stage, error):
+        if row["attempts"] + 1 >= MAX_ATTEMPTS:
+            logger.warning("❌ Resume job %s/%s failed: %s", row["batch_id"][:8], row["filename"], error)
+            self._update(row["id"], stage="failed", error=str(error), content=None, parsed=None)
+        else:
+            self._update(row["id"], stage=retry_stage, error=str(error))
+
+    def _process_parse(self, row):
+        if row["content"] is None:
+            self._update(row["id"], stage="failed", error="원본 파일이 남아있지 않습니다")
+            return
+        try:
+            parsed = self.parse_fn(row["filename"], row["content"])
+        except Exception as e:
+            self._fail_or_retry(row, "queued", e)
+            return
+        if row["analyze"]:
+            # 재시도 횟수는 단계별로 계산
+            self._update(row["id"], stage="parsed", parsed=fast_json.dumps(parsed), content=None, error=None, attempts=0)
+            with self._wakeup:
+                self._wakeup.notify_all()
+        else:
+            self._update(row["id"], stage="done", result=fast_json.dumps(parsed), content=None, error=None)
+
+    def _process_analyze(self, row):
+        parsed = fast_json.loads(row["parsed"])
+        try:
+            analysis = self.analyze_fn(parsed["text"], parsed.get("images") or [])
+        except Exception as e:
+            self._fail_or_retry(row, "parsed", e)
+            return
+        result = {"analysis": analysis, "text_length": len(parsed["text"]), "image_count": len(parsed.get("images") or [])}
+        self._update(row["id"], stage="done", result=fast_json.dumps(result), parsed=None, error=None)
+
+    def _worker(self, stage):
+        from_stage, to_stage, process = (
+            ("queued", "parsing", self._process_parse) if stage == "parse" else ("parsed", "analyzing", self._process_analyze)
+        )
+        retry_stage = from_stage
+        while not self._stopping.is_set():
+            try:
+                row = self._claim(from_stage, to_stage)
+            except sqlite3.Error as e:
+                logger.warning("⚠️ Resume job queue error: %s", e)
+                row = None
+            if row is None:
+                with self._wakeup:
+                    self._wakeup.wait(timeout=1.0)
+                continue
+            # 항목 하나의 오류(결과 기록 실패 등)로 워커 스레드가 죽지 않도록 항목 단위로 처리
+            try:
+                process(row)
+            except Exception as e:
+                logger.warning("⚠️ Resume job %s/%s error: %s", row["batch_id"][:8], row["filename"], e)
+                try:
+                    self._fail_or_retry(row, retry_stage, e)
+                except sqlite3.Error as db_error:
+                    # 기록하지 못한 항목은 재시작 시 복구 단계에서 다시 처리됨
+                    logger.warning("⚠️ Resume job queue error: %s", db_error)
+                    self._stopping.wait(1.0)
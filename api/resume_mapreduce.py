@@ -0,0 +1,146 @@
+"""
+긴 이력서 분할 분석 (map-reduce)
+- split_chunks: 섹션 제목 경계로 묶어 chunk_chars 이하로 나눔 (한 섹션이 너무 길면 줄 단위로 나누고 제목을 반복)
+- map_chunks: 조각별 LLM 추출을 최대 max_workers개까지 동시에 실행
+- merge_analyses: 조각 결과를 로컬에서 합침
+  기본 정보는 앞 조각 우선, 기술은 대소문자 무시 중복 제거, 프로젝트는 제목 유사도(difflib)로 중복 제거
+"""
+import difflib
+import re
+from concurrent.futures import ThreadPoolExecutor
+
+from metrics import logger, submit
+from resume_preparser import section_heading
+
+SCALAR_FIELDS = ("name", "phone", "email", "link", "intro")
+# 같은 프로젝트로 볼 제목 유사도
+PROJECT_TITLE_SIMILARITY = 0.85
+
+
+def _blocks(text):
+    """섹션 제목 줄마다 새 블록 [[줄, ...], ...]"""
+    blocks = [[]]
+    for line in text.splitlines():
+        if section_heading(line) and blocks[-1]:
+            blocks.append([])
+        if line.strip():
+            blocks[-1].append(line)
+    return [block for block in blocks if block]
+
+
+def _split_block(block, chunk_chars):
+    """chunk_chars보다 긴 섹션 → 줄 단위 조각 (이어지는 조각에는 섹션 제목을 다시 붙임)"""
+    heading = block[0] if section_heading(block[0]) else None
+    pieces, current, size = [], [], 0
+    for line in block:
+        while len(line) > chunk_chars:  # 줄 하나가 한도를 넘는 경우
+            if current:
+                pieces.append(current)
+                current, size = [], 0
+            pieces.append([line[:chunk_chars]])
+            line = line[chunk_chars:]
+        if current and size + len(line) + 1 > chunk_chars:
+            pieces.append(current)
+            current, size = ([heading], len(heading) + 1) if heading else ([], 0)
+        current.append(line)
+        size += len(line) + 1
+    if current:
+        pieces.append(current)
+    return pieces
+
+
+def split_chunks(text, chunk_chars, max_chunks=None):
+    """이력서 텍스트 → 조각 문자열 리스트 (max_chunks를 넘으면 조각 크기를 키움)"""
+    if max_chunks and len(text) > chunk_chars * max_chunks:
+        chunk_chars = -(-len(text) // max_chunks) + 1
+    chunks, current, size = [], [], 0
+    for block in _blocks(text):
+        block_size = sum(len(line) + 1 for line in block)
+        pieces = _split_block(block, chunk_chars) if block_size > chunk_chars else [block]
+        for piece in pieces:
+            piece_size = sum(len(line) + 1 for line in piece)
+            if current and size + piece_size > chunk_chars:
+                chunks.append("\n".join(current))
+                current, size = [], 0
+            current.extend(piece)
+            size += piece_size
+    if current:
+        chunks.append("\n".join(current))
+    return chunks
+
+
+def map_chunks(chunks, extract_fn, max_workers):
+    """
+    extract_fn(index, chunk) 를 병렬 실행 → 성공한 결과를 조각 순서대로 반환
+    일부 조각만 실패하면 경고 후 나머지로 진행, 전부 실패하면 첫 예외를 다시 발생
+    """
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(chunks)))) as executor:
+        # 요청 컨텍스트(span 기록 등)를 작업 스레드로 전달
+        futures = [submit(executor, extract_fn, index, chunk) for index, chunk in enumerate(chunks)]
+        results, errors = [], []
+        for index, future in enumerate(futures):
+            try:
+                results.append(future.result())
+            except Exception as e:
+                logger.warning("⚠️ 이력서 조각 %d/%d 분석 실패: %s", index + 1, len(chunks), e)
+                errors.append(e)
+    if errors and not results:
+        raise errors[0]
+    return results
+
+
+def _title_key(title):
+    """비교용 제목 - 괄호 안 부연 설명, 공백, 기호 제거"""
+    return re.sub(r"[\s\W_]+", "", re.sub(r"\(.*?\)|\[.*?\]", "", str(title))).lower()
+
+
+def _same_project(a, b):
+    key_a, key_b = _title_key(a.get("title", "")), _title_key(b.get("title", ""))
+    if not key_a or not key_b:
+        return False
+    # '리뉴얼 1차' / '리뉴얼 2차'처럼 숫자만 다른 제목은 다른 프로젝트
+    if re.findall(r"\d+", key_a) != re.findall(r"\d+", key_b):
+        return False
+    shorter, longer = sorted((key_a, key_b), key=len)
+    if len(shorter) >= 4 and shorter in longer:
+        return True
+    return key_a == key_b or difflib.SequenceMatcher(None, key_a, key_b).ratio() >= PROJECT_TITLE_SIMILARITY
+
+
+def merge_projects(project_lists):
+    merged = []
+    for projects in project_lists:
+        for project in projects or []:
+            if not isinstance(project, dict):
+                continue
+            existing = next((p for p in merged if _same_project(p, project)), None)
+            if existing is None:
+                merged.append(dict(project))
+                continue
+            # 겹치는 프로젝트는 더 긴 설명 / 비어있는 기간을 채움
+            if len(str(project.get("desc") or "")) > len(str(existing.get("desc") or "")):
+                existing["desc"] = project["desc"]
+            if not existing.get("duration") and project.get("duration"):
+                existing["duration"] = project["duration"]
+    return merged
+
+
+def merge_skills(skill_lists):
+    merged, seen = [], set()
+    for skills in skill_lists:
+        for skill in skills or []:
+            key = str(skill).strip().lower()
+            if key and key not in seen:
+                seen.add(key)
+                merged.append(str(skill).strip())
+    return merged
+
+
+def merge_analyses(partials):
+    """조각별 분석 dict 리스트 → 하나의 analyze_resume 결과"""
+    merged = {field: next((p[field] for p in partials if p.get(field)), "") for field in SCALAR_FIELDS}
+    # 경력 요약은 조각마다 일부만 보일 수 있어 가장 긴 것을 사용
+    merged["career_summary"] = max((str(p.get("career_summary") or "") for p in partials), key=len, default="")
+    merged["skills"] = merge_skills(p.get("skills") for p in partials)
+    merged["projects"] = merge_projects(p.get("projects") for p in partials)
+    return merged
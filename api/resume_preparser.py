@@ -0,0 +1,338 @@
+"""
+이력서 로컬 사전 분석 (LLM 호출 없이 규칙 기반으로 스키마 채우기)
+- 연락처: 이메일 / 휴대폰 / 링크(GitHub·블로그 우선)는 정규식
+- 기술: SKILL_ALIASES 사전 매칭 (한글 표기 포함, 등장 순서 유지)
+- 섹션: '경력' / '프로젝트' / '기술' / '자기소개' 등 제목 줄 기준으로 분리
+  프로젝트는 제목 줄 + 기간 + 글머리표(-, •) 설명으로, 경력은 기간 합산으로 요약
+- 사전 분석으로 채우지 못한 항목(missing_fields)만 LLM에 요청 (main.analyze_resume_content)
+"""
+import re
+from datetime import date
+
+from metrics import timed
+
+# 정식 표기 → 별칭 (대소문자 무시, 영문/숫자와 붙어있지 않을 때만 매칭 - 'React로' 같은 조사는 허용)
+SKILL_ALIASES = {
+    "JavaScript": ["javascript", "js", "자바스크립트"],
+    "TypeScript": ["typescript", "ts", "타입스크립트"],
+    "Python": ["python", "파이썬"],
+    "Java": ["java", "자바"],
+    "Kotlin": ["kotlin", "코틀린"],
+    "Swift": ["swift", "스위프트"],
+    "Go": ["golang"],
+    "Rust": ["rust"],
+    "C++": ["c++", "cpp"],
+    "C#": ["c#"],
+    "PHP": ["php"],
+    "Ruby": ["ruby"],
+    "Dart": ["dart"],
+    "SQL": ["sql"],
+    "HTML": ["html", "html5"],
+    "CSS": ["css", "css3"],
+    "Sass": ["sass", "scss"],
+    "Tailwind CSS": ["tailwind", "tailwindcss", "tailwind css"],
+    "styled-components": ["styled-components", "styled components"],
+    "React": ["react", "react.js", "reactjs", "리액트"],
+    "React Native": ["react native", "react-native", "리액트 네이티브"],
+    "Next.js": ["next.js", "nextjs", "넥스트"],
+    "Vue.js": ["vue", "vue.js", "vuejs", "뷰"],
+    "Nuxt.js": ["nuxt", "nuxt.js"],
+    "Angular": ["angular"],
+    "Svelte": ["svelte"],
+    "jQuery": ["jquery", "제이쿼리"],
+    "Redux": ["redux"],
+    "Recoil": ["recoil"],
+    "Zustand": ["zustand"],
+    "React Query": ["react query", "react-query", "tanstack query"],
+    "Webpack": ["webpack"],
+    "Vite": ["vite"],
+    "Node.js": ["node", "node.js", "nodejs", "노드"],
+    "Express": ["express", "express.js"],
+    "NestJS": ["nestjs", "nest.js"],
+    "Spring": ["spring", "spring framework", "스프링"],
+    "Spring Boot": ["spring boot", "springboot", "스프링 부트", "스프링부트"],
+    "JPA": ["jpa"],
+    "MyBatis": ["mybatis"],
+    "Django": ["django", "장고"],
+    "Flask": ["flask"],
+    "FastAPI": ["fastapi"],
+    "Flutter": ["flutter", "플러터"],
+    "Android": ["android", "안드로이드"],
+    "iOS": ["ios"],
+    "SwiftUI": ["swiftui"],
+    "GraphQL": ["graphql"],
+    "REST API": ["rest api", "restful", "restful api"],
+    "MySQL": ["mysql"],
+    "PostgreSQL": ["postgresql", "postgres"],
+    "Oracle": ["oracle", "오라클"],
+    "MongoDB": ["mongodb", "mongo"],
+    "Redis": ["redis"],
+    "Elasticsearch": ["elasticsearch", "elastic search"],
+    "Kafka": ["kafka"],
+    "RabbitMQ": ["rabbitmq"],
+    "Firebase": ["firebase", "파이어베이스"],
+    "Supabase": ["supabase"],
+    "AWS": ["aws", "amazon web services"],
+    "GCP": ["gcp", "google cloud"],
+    "Azure": ["azure"],
+    "Docker": ["docker", "도커"],
+    "Kubernetes": ["kubernetes", "k8s", "쿠버네티스"],
+    "Terraform": ["terraform"],
+    "Jenkins": ["jenkins", "젠킨스"],
+    "GitHub Actions": ["github actions"],
+    "Git": ["git"],
+    "Linux": ["linux", "리눅스"],
+    "Nginx": ["nginx"],
+    "Vercel": ["vercel"],
+    "TensorFlow": ["tensorflow", "텐서플로"],
+    "PyTorch": ["pytorch", "파이토치"],
+    "scikit-learn": ["scikit-learn", "sklearn"],
+    "Pandas": ["pandas", "판다스"],
+    "NumPy": ["numpy"],
+    "LangChain": ["langchain"],
+    "OpenCV": ["opencv"],
+    "Figma": ["figma", "피그마"],
+    "Photoshop": ["photoshop", "포토샵"],
+    "Illustrator": ["illustrator", "일러스트레이터"],
+    "After Effects": ["after effects", "애프터이펙트", "애프터 이펙트"],
+    "Premiere Pro": ["premiere", "premiere pro", "프리미어"],
+    "Sketch": ["sketch"],
+    "Zeplin": ["zeplin"],
+    "Notion": ["notion", "노션"],
+    "Jira": ["jira", "지라"],
+    "Slack": ["slack"],
+    "Excel": ["excel", "엑셀"],
+    "Tableau": ["tableau", "태블로"],
+    "Google Analytics": ["google analytics", "ga4", "구글 애널리틱스"],
+    "Unity": ["unity", "유니티"],
+    "Unreal Engine": ["unreal", "unreal engine", "언리얼"],
+    "Blender": ["blender", "블렌더"],
+}
+
+# 한 글자짜리/일반 명사와 겹치는 별칭은 '기술' 섹션 안에서만 매칭
+SECTION_ONLY_ALIASES = {"js", "ts", "뷰", "노드", "자바", "swift", "rust", "ruby", "dart", "spring", "express",
+                        "sketch", "unity", "git", "oracle", "notion", "slack", "excel", "node", "go"}
+
+# 섹션 제목 (공백/기호 제거 + 소문자 비교)
+SECTION_HEADINGS = {
+    "career": ["경력", "경력사항", "경력기술서", "업무경력", "직무경험", "근무경력", "회사경력", "experience", "workexperience", "career", "employment"],
+    "projects": ["프로젝트", "프로젝트경험", "주요프로젝트", "수행프로젝트", "프로젝트경력", "포트폴리오", "projects", "project", "personalprojects"],
+    "skills": ["기술", "기술스택", "보유기술", "보유스킬", "스킬", "사용기술", "활용기술", "techstack", "skills", "skill", "technicalskills"],
+    "intro": ["자기소개", "소개", "자기소개서", "한줄소개", "about", "aboutme", "summary", "profile", "introduction"],
+    "education": ["학력", "학력사항", "교육", "교육이수", "education"],
+    "other": ["자격증", "자격사항", "수상", "수상경력", "대외활동", "활동", "어학", "certifications", "awards", "activities"],
+}
+_HEADING_LOOKUP = {key: section for section, keys in SECTION_HEADINGS.items() for key in keys}
+
+# 로컬 분석 결과 스키마 (analyze_resume 응답과 동일)
+FIELDS = ("name", "phone", "email", "link", "intro", "career_summary", "skills", "projects")
+
+EMAIL_RE = re.compile(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}")
+PHONE_RE = re.compile(r"(?<!\d)(?:\+82[\s.-]?1[016789]|01[016789])[\s.-]?\d{3,4}[\s.-]?\d{4}(?!\d)")
+URL_RE = re.compile(r"(?:https?://|www\.)[^\s<>()\"',]+|(?<![\w@.])(?:github\.com|gitlab\.com|velog\.io|[\w-]+\.tistory\.com|brunch\.co\.kr|behance\.net|linkedin\.com)/[^\s<>()\"',]*", re.I)
+# 링크 우선순위 (앞쪽일수록 우선)
+LINK_PRIORITY = ("github.com", "gitlab.com", "velog.io", "tistory.com", "notion.site", "behance.net", "brunch.co.kr", "linkedin.com")
+NAME_LABEL_RE = re.compile(r"^\s*(?:이름|성명|name)\s*[:：]?\s*([가-힣]{2,4}|[A-Za-z]+(?: [A-Za-z]+){1,2})\s*$", re.I)
+KOREAN_NAME_RE = re.compile(r"^[가-힣](?:\s?[가-힣]){1,3}$")
+# 상단에 자주 오는 제목 (이름으로 오인 방지)
+NAME_STOPWORDS = {"이력서", "자기소개서", "경력기술서", "포트폴리오", "지원서", "입사지원서"}
+# '안녕하세요, 개발자 홍길동입니다.' 형태의 첫 줄
+NAME_SENTENCE_RE = re.compile(r"(?:^|\s)([가-힣]{2,4})입니다")
+# 2021.03 ~ 2023.02 / 2021년 3월 - 현재 / 2021/03-2021/12 / 2022.05 ~ (진행 중)
+_YM = r"(\d{4})\s*(?:[./-]|년)\s*(\d{1,2})?\s*월?"
+DURATION_RE = re.compile(_YM + r"\s*[~\-–—]\s*(?:" + _YM + r"|(현재|재직\s*중|진행\s*중|present|now))?", re.I)
+BULLET_RE = re.compile(r"^\s*[-–•·▪◦*●○■□▶►✓✔]\s*")
+# '1. 프로젝트명' - 번호 목록은 제목 줄로 취급하고 번호만 제거
+NUMBERING_RE = re.compile(r"^\s*\d{1,2}[.)]\s+")
+_HEADING_STRIP_RE = re.compile(r"[\s\[\]()<>【】「」『』■□▶►●○◆◇#*:：|/_\-–—.·•\d]+")
+# 제목 줄로 보기에는 너무 긴 줄 / 설명 문장으로 끝나는 줄
+MAX_TITLE_LENGTH = 60
+SENTENCE_END_RE = re.compile(r"(?:[.!?]|[다요음함됨임])\s*$")
+
+
+def _compile_skill_pattern(aliases):
+    alternation = "|".join(re.escape(alias) for alias in sorted(aliases, key=len, reverse=True))
+    # 한글 조사는 허용하고 영문/숫자/일부 기호와 붙어 있으면 다른 단어로 봄 (예: 'java' in 'javascript')
+    return re.compile(r"(?<![A-Za-z0-9+#.])(" + alternation + r")(?![A-Za-z0-9+#])", re.I)
+
+
+_ALIAS_TO_SKILL = {alias.lower(): skill for skill, aliases in SKILL_ALIASES.items() for alias in aliases + [skill]}
+_SKILL_RE = _compile_skill_pattern([a for a in _ALIAS_TO_SKILL if a not in SECTION_ONLY_ALIASES])
+_SKILL_SECTION_RE = _compile_skill_pattern(list(_ALIAS_TO_SKILL))
+
+
+def section_heading(line):
+    """제목 줄이면 섹션 이름, 아니면 None (예: '■ 경력 사항', '[ 프로젝트 ]', '3. Skills')"""
+    stripped = line.strip()
+    if not stripped or len(stripped) > 30:
+        return None
+    key = _HEADING_STRIP_RE.sub("", re.sub(r"\(.*?\)", "", stripped)).lower()
+    return _HEADING_LOOKUP.get(key)
+
+
+def split_sections(text):
+    """{섹션 이름: [줄, ...]} - 첫 제목 이전 내용은 'header'"""
+    sections = {"header": []}
+    current = "header"
+    for line in text.splitlines():
+        section = section_heading(line)
+        if section:
+            current = section
+            sections.setdefault(current, [])
+            continue
+        if line.strip():
+            sections[current].append(line.strip())
+    return sections
+
+
+def extract_contacts(text):
+    emails = EMAIL_RE.findall(text)
+    phones = PHONE_RE.findall(text)
+    links = []
+    for url in URL_RE.findall(text):
+        url = url.rstrip(".;")
+        if url in links:
+            continue
+        links.append(url)
+    links.sort(key=lambda url: next((i for i, domain in enumerate(LINK_PRIORITY) if domain in url.lower()), len(LINK_PRIORITY)))
+    return {
+        "email": emails[0] if emails else "",
+        "phone": _format_phone(phones[0]) if phones else "",
+        "link": links[0] if links else "",
+    }
+
+
+def _format_phone(raw):
+    digits = re.sub(r"\D", "", raw)
+    if digits.startswith("82"):
+        digits = "0" + digits[2:]
+    return f"{digits[:3]}-{digits[3:-4]}-{digits[-4:]}"
+
+
+def extract_name(sections):
+    """'이름: 홍길동' 라벨 또는 상단의 2~4글자 한글 이름 줄"""
+    header = sections.get("header", [])
+    for line in header[:15]:
+        match = NAME_LABEL_RE.match(line)
+        if match:
+            return match.group(1)
+    for line in header[:5]:
+        candidate = re.split(r"[|/,·]", line)[0].strip()
+        if KOREAN_NAME_RE.match(candidate) and candidate.replace(" ", "") not in NAME_STOPWORDS and section_heading(candidate) is None:
+            return candidate.replace(" ", "")
+    for line in header[:3]:
+        match = NAME_SENTENCE_RE.search(line)
+        if match:
+            return match.group(1)
+    return ""
+
+
+def match_skills(text, skill_lines=()):
+    """본문 + 기술 섹션에서 기술 사전 매칭 (기술 섹션 → 본문 순서, 중복 제거)"""
+    found = []
+    for pattern, source in ((_SKILL_SECTION_RE, "\n".join(skill_lines)), (_SKILL_RE, text)):
+        for match in pattern.finditer(source):
+            skill = _ALIAS_TO_SKILL[match.group(1).lower()]
+            if skill not in found:
+                found.append(skill)
+    return found
+
+
+def _months(match, today):
+    start_year, start_month, end_year, end_month, ongoing = match.groups()
+    start = int(start_year) * 12 + int(start_month or 1) - 1
+    if end_year:
+        end = int(end_year) * 12 + int(end_month or 12) - 1
+    elif ongoing or match.group(0).rstrip().endswith(("~", "-", "–", "—")):
+        end = today.year * 12 + today.month - 1
+    else:
+        return 0
+    return max(0, end - start + 1)
+
+
+def _is_title(line):
+    return not BULLET_RE.match(line) and len(line) <= MAX_TITLE_LENGTH and not SENTENCE_END_RE.search(DURATION_RE.sub("", line))
+
+
+def _strip_duration(line):
+    return re.sub(r"\s*[|/,]?\s*$", "", re.sub(r"[\s(\[]*" + DURATION_RE.pattern + r"[\s)\]]*", " ", line, flags=re.I)).strip(" |-,")
+
+
+def _entries(lines):
+    """제목 줄 + 기간 + 설명 줄 묶음 리스트 [{title, duration, desc_lines}]"""
+    entries = []
+    current = None
+    for line in lines:
+        line = NUMBERING_RE.sub("", line)
+        duration = DURATION_RE.search(line)
+        title = _is_title(line)
+        if title and (current is None or current["desc"] or (duration and current["duration"])):
+            current = {"title": _strip_duration(line), "duration": duration.group(0).strip() if duration else "", "match": duration, "desc": []}
+            entries.append(current)
+        elif current is not None and duration and not current["duration"]:
+            current["duration"] = duration.group(0).strip()
+            current["match"] = duration
+            rest = _strip_duration(line)
+            if rest and not current["title"]:
+                current["title"] = rest
+            elif rest:
+                current["desc"].append(rest)
+        elif current is not None:
+            current["desc"].append(BULLET_RE.sub("", line))
+    return [entry for entry in entries if entry["title"]]
+
+
+def extract_projects(lines):
+    return [
+        {"title": entry["title"], "desc": " ".join(entry["desc"]), "duration": entry["duration"]}
+        for entry in _entries(lines)
+    ]
+
+
+def summarize_career(lines, today=None):
+    """경력 섹션 → '총 N년차, 주요 경력: A, B' (기간이 하나도 없으면 빈 문자열)"""
+    today = today or date.today()
+    entries = [entry for entry in _entries(lines) if entry["match"]]
+    if not entries:
+        return ""
+    months = sum(_months(entry["match"], today) for entry in entries)
+    companies = [re.split(r"\s*[|/·,]\s*|\s{2,}", entry["title"])[0] for entry in entries]
+    years = max(1, round(months / 12))
+    return f"총 {years}년차, 주요 경력: {', '.join(dict.fromkeys(companies))}"
+
+
+def extract_intro(lines, max_length=120):
+    """자기소개 섹션의 첫 문장"""
+    text = " ".join(lines).strip()
+    if not text:
+        return ""
+    sentence = re.split(r"(?<=[.!?])\s+|(?<=다\.)|(?<=니다)\s", text, maxsplit=1)[0].strip()
+    return sentence[:max_length]
+
+
+@timed("resume_preparse")
+def preparse(text):
+    """이력서 텍스트 → analyze_resume 스키마 dict (찾지 못한 항목은 빈 값)"""
+    sections = split_sections(text)
+    return {
+        "name": extract_name(sections),
+        **extract_contacts(text),
+        "intro": extract_intro(sections.get("intro", [])),
+        "career_summary": summarize_career(sections.get("career", [])),
+        "skills": match_skills(text, sections.get("skills", [])),
+        "projects": extract_projects(sections.get("projects", [])),
+    }
+
+
+def missing_fields(result):
+    return [field for field in FIELDS if not result.get(field)]
+
+
+def section_text(text, names):
+    """지정한 섹션만 이어붙인 텍스트 (LLM에 미해결 항목만 물어볼 때 입력 축소용)"""
+    sections = split_sections(text)
+    parts = []
+    for name in names:
+        if sections.get(name):
+            parts.append(f"[{name}]\n" + "\n".join(sections[name]))
+    return "\n\n".join(parts)
@@ -4,6 +4,7 @@ Supabase Auth와 user_profiles 테이블 동기화 스크립트
 import os
 from dotenv import load_dotenv
 from supabase import create_client
+from user_sync import reconcile
 
 load_dotenv()
 
@@ -21,60 +22,36 @@ print("=" * 60)
 print("Supabase Auth vs user_profiles 동기화 분석")
 print("=" * 60)
 
-# 1. Auth 사용자 목록 가져오기
-print("\n📋 Step 1: Fetching Auth users...")
+# 1~2. Auth 사용자 / user_profiles 페이지 단위 조회 및 비교
+print("\n📋 Step 1: Fetching Auth users and user_profiles (paginated)...")
 try:
-    auth_response = supabase.auth.admin.list_users()
-    auth_users = auth_response
-    auth_user_ids = {user.id for user in auth_users}
-    print(f"✅ Found {len(auth_users)} users in Auth")
-    for user in auth_users[:5]:  # 처음 5개만 표시
-        print(f"   - {user.email} ({user.id})")
-    if len(auth_users) > 5:
-        print(f"   ... and {len(auth_users) - 5} more")
+    report = reconcile(supabase)
+    print(f"✅ Found {report['auth_total']} users in Auth")
+    print(f"✅ Found {report['profile_total']} profiles in user_profiles")
 except Exception as e:
-    print(f"❌ Failed to fetch auth users: {e}")
-    exit(1)
-
-# 2. user_profiles 목록 가져오기
-print("\n📋 Step 2: Fetching user_profiles...")
-try:
-    profiles_response = supabase.table('user_profiles').select('id, email, name').execute()
-    profiles = profiles_response.data
-    profile_user_ids = {profile['id'] for profile in profiles}
-    print(f"✅ Found {len(profiles)} profiles in user_profiles")
-    for profile in profiles[:5]:  # 처음 5개만 표시
-        print(f"   - {profile['email']} ({profile['id']})")
-    if len(profiles) > 5:
-        print(f"   ... and {len(profiles) - 5} more")
-except Exception as e:
-    print(f"❌ Failed to fetch user profiles: {e}")
+    print(f"❌ Failed to fetch users: {e}")
     exit(1)
 
 # 3. 차이점 분석
 print("\n🔍 Step 3: Analyzing differences...")
 
 # Auth에는 있지만 user_profiles에는 없는 사용자 (고아 Auth 계정)
-orphan_auth_users = auth_user_ids - profile_user_ids
+orphan_auth_users = report["orphan_auth_users"]
 if orphan_auth_users:
     print(f"\n⚠️  Auth에만 있는 사용자 ({len(orphan_auth_users)}개):")
-    for user_id in list(orphan_auth_users)[:10]:
-        user = next((u for u in auth_users if u.id == user_id), None)
-        if user:
-            print(f"   - {user.email} ({user_id})")
+    for user_id, email in list(orphan_auth_users.items())[:10]:
+        print(f"   - {email} ({user_id})")
     if len(orphan_auth_users) > 10:
         print(f"   ... and {len(orphan_auth_users) - 10} more")
 else:
     print("\n✅ Auth에만 있는 사용자 없음")
 
 # user_profiles에는 있지만 Auth에는 없는 사용자 (고아 프로필)
-orphan_profiles = profile_user_ids - auth_user_ids
+orphan_profiles = report["orphan_profiles"]
 if orphan_profiles:
     print(f"\n⚠️  user_profiles에만 있는 사용자 ({len(orphan_profiles)}개):")
-    for user_id in list(orphan_profiles)[:10]:
-        profile = next((p for p in profiles if p['id'] == user_id), None)
-        if profile:
-            print(f"   - {profile['email']} ({user_id})")
+    for user_id, email in list(orphan_profiles.items())[:10]:
+        print(f"   - {email} ({user_id})")
     if len(orphan_profiles) > 10:
         print(f"   ... and {len(orphan_profiles) - 10} more")
 else:
@@ -0,0 +1,141 @@
+"""
+Supabase Auth ↔ user_profiles 정합성 검사(Reconciliation)
+두 소스를 페이지 단위로 스트리밍하고 id 순으로 정렬된 두 목록을 병합 비교합니다 (메모리 사용량은 페이지 크기 수준).
+- Auth Admin API는 id 순 정렬을 지원하지 않으므로 임시 SQLite 파일에 적재한 뒤 id 순으로 다시 읽음
+- user_profiles는 id 순 keyset 페이지네이션 (uuid 문자열 순서 = Postgres uuid 순서)
+sync_users.py(분석)와 cleanup_users.py(정리)에서 공통으로 사용합니다.
+"""
+import os
+import sqlite3
+import tempfile
+
+from bulk_delete import delete_auth_users, delete_profile_rows
+
+# GoTrue Admin API의 per_page 최대값
+AUTH_PAGE_SIZE = 1000
+# PostgREST 기본 max-rows와 동일
+PROFILE_PAGE_SIZE = 1000
+
+
+def iter_auth_users(client, per_page=AUTH_PAGE_SIZE):
+    """Auth 사용자를 페이지 단위로 조회하며 (id, email) 생성"""
+    page = 1
+    while True:
+        users = client.auth.admin.list_users(page=page, per_page=per_page)
+        if not users:
+            return
+        for user in users:
+            yield user.id, user.email
+        if len(users) < per_page:
+            return
+        page += 1
+
+
+def iter_profiles(client, page_size=PROFILE_PAGE_SIZE):
+    """
+    user_profiles를 id 순 keyset 페이지네이션으로 조회하며 (id, email) 생성
+    offset 방식과 달리 정리 작업 중 행이 삭제되어도 누락/중복이 없습니다.
+    """
+    last_id = None
+    while True:
+        query = client.table('user_profiles').select('id, email').order('id').limit(page_size)
+        if last_id is not None:
+            query = query.gt('id', last_id)
+        rows = query.execute().data or []
+        for row in rows:
+            yield row['id'], row.get('email')
+        if len(rows) < page_size:
+            return
+        last_id = rows[-1]['id']
+
+
+def _spill_auth_users(client, per_page, path):
+    """Auth 사용자를 임시 SQLite 파일에 페이지 단위로 적재 → 전체 수"""
+    db = sqlite3.connect(path)
+    db.execute("CREATE TABLE auth_users (id TEXT PRIMARY KEY, email TEXT)")
+    total, page = 0, []
+    for user_id, email in iter_auth_users(client, per_page):
+        page.append((str(user_id), email))
+        if len(page) >= per_page:
+            total += _insert_page(db, page)
+            page = []
+    total += _insert_page(db, page)
+    db.commit()
+    db.close()
+    return total
+
+
+def _insert_page(db, rows):
+    # 페이지 경계에서 같은 사용자가 중복 조회되어도 한 번만 집계
+    before = db.total_changes
+    db.executemany("INSERT OR IGNORE INTO auth_users (id, email) VALUES (?, ?)", rows)
+    return db.total_changes - before
+
+
+def reconcile(client, auth_page_size=AUTH_PAGE_SIZE, profile_page_size=PROFILE_PAGE_SIZE):
+    """
+    Auth와 user_profiles 비교 (Dry-run, 아무것도 삭제하지 않음)
+    양쪽을 id 순으로 읽으며 병합 비교하므로 메모리에는 현재 페이지와 고아 목록만 유지합니다.
+
+    반환값:
+        {
+            "auth_total": int,
+            "profile_total": int,
+            "orphan_auth_users": {id: email},  # Auth에만 있는 계정
+            "orphan_profiles": {id: email},    # user_profiles에만 있는 프로필
+        }
+    """
+    with tempfile.TemporaryDirectory(prefix="user_sync_") as tmp:
+        path = os.path.join(tmp, "auth_users.db")
+        auth_total = _spill_auth_users(client, auth_page_size, path)
+        db = sqlite3.connect(path)
+        try:
+            auth_rows = db.execute("SELECT id, email FROM auth_users ORDER BY id")
+            profiles = ((str(profile_id), email) for profile_id, email in iter_profiles(client, profile_page_size))
+            orphan_auth, orphan_profiles, profile_total = _merge(auth_rows, profiles)
+        finally:
+            db.close()
+
+    return {
+        "auth_total": auth_total,
+        "profile_total": profile_total,
+        "orphan_auth_users": orphan_auth,
+        "orphan_profiles": orphan_profiles,
+    }
+
+
+_END = object()
+
+
+def _merge(auth_rows, profiles):
+    """id 순으로 정렬된 (id, email) 두 스트림 병합 → (Auth에만 있는 것, 프로필에만 있는 것, 프로필 수)"""
+    orphan_auth, orphan_profiles, profile_total = {}, {}, 0
+    auth = next(auth_rows, _END)
+    for profile_id, email in profiles:
+        profile_total += 1
+        while auth is not _END and auth[0] < profile_id:
+            orphan_auth[auth[0]] = auth[1]
+            auth = next(auth_rows, _END)
+        if auth is not _END and auth[0] == profile_id:
+            auth = next(auth_rows, _END)
+        else:
+            orphan_profiles[profile_id] = email
+    while auth is not _END:
+        orphan_auth[auth[0]] = auth[1]
+        auth = next(auth_rows, _END)
+    return orphan_auth, orphan_profiles, profile_total
+
+
+def apply_cleanup(client, report, delete_auth=True, delete_profiles=False, on_progress=None):
+    """
+    reconcile() 결과를 실제로 반영
+    - delete_auth: Auth에만 있는 계정 삭제 (관리자 일괄 삭제와 같은 병렬 실행기 사용)
+    - delete_profiles: user_profiles에만 있는 프로필(+포트폴리오) 삭제
+    """
+    result = {"auth": None, "profiles": None}
+    if delete_auth and report["orphan_auth_users"]:
+        result["auth"] = delete_auth_users(client, report["orphan_auth_users"].keys(), on_progress=on_progress)
+    if delete_profiles and report["orphan_profiles"]:
+        portfolios_deleted, profiles_deleted = delete_profile_rows(client, list(report["orphan_profiles"].keys()))
+        result["profiles"] = {"deleted_portfolios": portfolios_deleted, "deleted_profiles": profiles_deleted}
+    return result
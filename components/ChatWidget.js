@@ -127,6 +127,12 @@ export default function ChatWidget({ customMessage, isSharedView = false, portfo
 
   const [isLoading, setIsLoading] = useState(false);
   const scrollRef = useRef(null);
+  // 서버 측 대화 세션 id (위젯이 열려 있는 동안 이전 대화를 이어서 답변)
+  const sessionIdRef = useRef(
+    typeof crypto !== "undefined" && crypto.randomUUID
+      ? crypto.randomUUID()
+      : `${Date.now().toString(36)}-${Math.random().toString(36).slice(2, 10)}`
+  );
 
   // Helper function to safely convert any value to string
   const safeStringify = (value) => {
@@ -263,7 +269,8 @@ export default function ChatWidget({ customMessage, isSharedView = false, portfo
         body: JSON.stringify({
           message: msgText,
           portfolio_context: contextStr,
-          is_shared: isSharedView
+          is_shared: isSharedView,
+          session_id: sessionIdRef.current
         }),
       });
 
@@ -122,7 +122,7 @@ export default function Login() {
       const token = window.location.hash.split('=')[1].split('&')[0];
 
       // 백엔드로 전송
-      fetch(`${apiUrl}/naver-login`, {
+      fetch(`${apiUrl}/naver-login?include_portfolio=true`, {
         method: "POST",
         headers: { "Content-Type": "application/json" },
         body: JSON.stringify({ token: token })